@@ -0,0 +1,325 @@
+"""
+Event-driven alert rules for budget thresholds.
+
+A module registers a *ledger* (the rows that count towards a spending
+total, e.g. a student's expenses) and *providers* that turn an owner's
+settings (parent alert settings, reminders, wallet budgets) into rules.
+When a ledger row is written, the owner's compiled rules are evaluated
+against running per-period totals kept in ``AlertCounter``. The work per
+transaction is proportional to the owner's number of rules, not their
+history, and each rule fires at most once per period.
+
+Compiled rules are cached per (ledger, owner) under the owner's
+``alert_rules`` data version; providers' apps call ``rules.invalidate``
+when the settings behind them change.
+
+Usage (in ``<app>/alert_rules.py``, imported from the app's ``ready()``):
+
+    @rules.ledger('individual.expenses', date_field='expense_date', category_field='category')
+    def individual_expenses(owner_id):
+        return IndividualExpense.objects.filter(user_id=owner_id)
+
+    @rules.provider('individual.expenses')
+    def budget_rules(owner_id):
+        yield Rule('budget_80', limit * Decimal('0.8'), notify, period='month')
+
+and from the ledger's ``post_save`` receiver:
+
+    rules.record('individual.expenses', expense.user_id, expense.amount, expense.expense_date, expense.category)
+"""
+import contextlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .data_version import DataVersionService
+from .timeseries import bucket_start, filter_range, shift
+
+logger = logging.getLogger(__name__)
+
+PERIODS = ('day', 'week', 'month', 'all')
+# Period start of counters that never reset
+EPOCH = date(2000, 1, 1)
+# Counters whose period ended longer ago than this are dropped on resync
+RETENTION_DAYS = 400
+ANY_CATEGORY = object()
+
+
+class Rule:
+    """
+    One alert threshold for a ledger owner.
+
+    Args:
+        key: Identifies the rule among the owner's rules; fired keys are
+            remembered per period
+        threshold: Period total at which the rule fires (with
+            ``measure='balance'``: balance at or below which it fires)
+        action: ``(rule, total) -> result`` run once when the rule fires,
+            e.g. creating a notification
+        period: One of PERIODS; ignored when ``window`` is given
+        window: Fixed (start, end) dates instead of a repeating period
+        category: Only count ledger rows in this category
+        measure: 'total' (running period total) or 'balance' (the balance
+            reported with the event)
+        data: Extra values for the action (limits, recipients, ...)
+    """
+
+    def __init__(self, key: str, threshold, action: Callable, period: str = 'month',
+                 window: Optional[Tuple[date, date]] = None, category=None, measure: str = 'total',
+                 data: Optional[Dict] = None):
+        if period not in PERIODS:
+            raise ValueError(f"Unknown alert period '{period}'")
+        self.key = key
+        self.threshold = Decimal(str(threshold)).quantize(Decimal('0.01'))
+        self.action = action
+        self.period = period
+        self.window = window
+        self.category = category
+        self.measure = measure
+        self.data = data or {}
+
+    @property
+    def counter(self) -> str:
+        """Name of the running total this rule reads; rules with the same name share it."""
+        span = f"{self.window[0].isoformat()}..{self.window[1].isoformat()}" if self.window else self.period
+        return span if self.category is None else f"{span}:{self.category}"
+
+    def bounds(self, day: date) -> Optional[Tuple[date, Optional[date]]]:
+        """(start, end) of the period containing ``day``; None outside a fixed window."""
+        if self.window:
+            start, end = self.window
+            return (start, end) if start <= day <= end else None
+        if self.period == 'all':
+            return EPOCH, None
+        start = bucket_start(day, self.period)
+        return start, shift(start, self.period) - timedelta(days=1)
+
+    def __repr__(self):
+        return f"<Rule {self.key} {self.measure}>={self.threshold} per {self.counter}>"
+
+
+class Ledger:
+    def __init__(self, name: str, queryset: Callable, date_field: str, value: str = 'amount',
+                 category_field: Optional[str] = None):
+        self.name = name
+        self.queryset = queryset
+        self.date_field = date_field
+        self.value = value
+        self.category_field = category_field
+
+
+class CompiledRules:
+    """An owner's rules grouped by counter, lowest threshold first."""
+
+    def __init__(self, rules: Iterable[Rule]):
+        groups = OrderedDict()
+        for rule in rules:
+            groups.setdefault(rule.counter, []).append(rule)
+        self.counters = [
+            (counter, sorted(group, key=lambda rule: rule.threshold)) for counter, group in groups.items()
+        ]
+
+    def __len__(self):
+        return sum(len(group) for _, group in self.counters)
+
+
+_capture = threading.local()
+
+
+@contextlib.contextmanager
+def capture():
+    """
+    Collect the results of every rule fired inside the block.
+
+    Usage:
+        with capture() as fired:
+            IndividualExpense.objects.create(...)
+        return expense, fired
+    """
+    stack = _capture.__dict__.setdefault('stack', [])
+    results = []
+    stack.append(results)
+    try:
+        yield results
+    finally:
+        stack.pop()
+
+
+def _collect(results: List) -> None:
+    for collected in getattr(_capture, 'stack', ()):
+        collected.extend(results)
+
+
+class AlertRuleEngine:
+    # Compiled rule sets kept in this process
+    CACHE_SIZE = 1024
+
+    def __init__(self):
+        self.ledgers = {}
+        self.providers = {}
+        self._compiled = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ledger(self, name: str, date_field: str, value: str = 'amount', category_field: Optional[str] = None):
+        """Register a function ``(owner_id) -> QuerySet`` as the rows behind ledger ``name``."""
+        def decorator(queryset):
+            self.ledgers[name] = Ledger(name, queryset, date_field, value, category_field)
+            return queryset
+        return decorator
+
+    def provider(self, ledger: str):
+        """Register a function ``(owner_id) -> Iterable[Rule]`` supplying rules for ``ledger``."""
+        def decorator(func):
+            self.providers.setdefault(ledger, []).append(func)
+            return func
+        return decorator
+
+    @staticmethod
+    def _scope_id(ledger: str, owner_id) -> str:
+        return f"{ledger}:{owner_id}"
+
+    def invalidate(self, ledger: str, owner_id) -> None:
+        """Recompile the owner's rules on their next event (call when their settings change)."""
+        if owner_id:
+            DataVersionService.bump('alert_rules', self._scope_id(ledger, owner_id))
+
+    def rules_for(self, ledger: str, owner_id) -> CompiledRules:
+        key = (ledger, owner_id)
+        version = DataVersionService.get('alert_rules', self._scope_id(ledger, owner_id))
+        with self._lock:
+            cached = self._compiled.get(key)
+            if cached is not None and cached[0] == version:
+                self._compiled.move_to_end(key)
+                return cached[1]
+
+        compiled = CompiledRules(
+            rule for provider in self.providers.get(ledger, ()) for rule in provider(owner_id) or ()
+        )
+        with self._lock:
+            self._compiled[key] = (version, compiled)
+            self._compiled.move_to_end(key)
+            while len(self._compiled) > self.CACHE_SIZE:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def _seed(self, ledger_name: str, owner_id, rule: Rule, start: date, end: Optional[date]) -> Decimal:
+        """Period total from the ledger rows (once per counter and period)."""
+        ledger = self.ledgers[ledger_name]
+        queryset = ledger.queryset(owner_id)
+        if end is not None:
+            queryset = filter_range(queryset, ledger.date_field, start, end)
+        if rule.category is not None:
+            queryset = queryset.filter(**{ledger.category_field: rule.category})
+        return queryset.aggregate(total=Sum(ledger.value))['total'] or Decimal('0.00')
+
+    def _fire(self, rules: List[Rule], counter, balance) -> List:
+        results = []
+        for rule in rules:
+            if rule.key in counter.fired:
+                continue
+            if rule.measure == 'balance':
+                hit = balance is not None and Decimal(str(balance)) <= rule.threshold
+            else:
+                hit = counter.total >= rule.threshold
+            if not hit:
+                continue
+            try:
+                with transaction.atomic():
+                    results.append(rule.action(rule, counter.total))
+            except Exception:
+                logger.exception(f"Alert rule {rule.key} for {counter.ledger}:{counter.owner_id} failed")
+                continue
+            counter.fired = counter.fired + [rule.key]
+        return results
+
+    def _evaluate(self, ledger: str, owner_id, day: Optional[date], amount, category, balance) -> List:
+        from .models import AlertCounter
+
+        if not owner_id:
+            return []
+        compiled = self.rules_for(ledger, owner_id)
+        if not compiled:
+            return []
+        day = day or timezone.localdate()
+        amount = Decimal(str(amount or 0))
+
+        results = []
+        with transaction.atomic():
+            for counter_name, rules in compiled.counters:
+                first = rules[0]
+                if category is not ANY_CATEGORY and first.category is not None and first.category != category:
+                    continue
+                bounds = first.bounds(day)
+                if bounds is None:
+                    continue
+                counter, created = AlertCounter.objects.select_for_update().get_or_create(
+                    ledger=ledger, owner_id=owner_id, counter=counter_name, period_start=bounds[0],
+                    # Seeded counters already include the row that triggered this event
+                    defaults={'total': lambda: self._seed(ledger, owner_id, first, *bounds)},
+                )
+                fired_before = len(counter.fired)
+                if not created and amount:
+                    counter.total += amount
+                fired = self._fire(rules, counter, balance)
+                if (amount and not created) or len(counter.fired) != fired_before:
+                    counter.save(update_fields=['total', 'fired', 'updated_at'])
+                results.extend(fired)
+        _collect(results)
+        return results
+
+    def record(self, ledger: str, owner_id, amount, day: Optional[date] = None, category=None, balance=None) -> List:
+        """
+        Add a new ledger row to the owner's running totals and fire any rule it crosses.
+
+        Args:
+            ledger: Registered ledger name
+            owner_id: Owner the rules belong to (user or wallet id)
+            amount: Amount of the new row
+            day: Local date of the row; defaults to today
+            category: The row's category, matched against category rules
+            balance: Balance after the row, for ``measure='balance'`` rules
+
+        Returns:
+            Results of the actions of the rules that fired
+        """
+        return self._evaluate(ledger, owner_id, day, amount, category, balance)
+
+    def check(self, ledger: str, owner_id, day: Optional[date] = None) -> List:
+        """Fire any of the owner's rules already crossed in the current periods, without adding a row."""
+        return self._evaluate(ledger, owner_id, day, 0, ANY_CATEGORY, None)
+
+    def resync(self, ledger: str, owner_id) -> None:
+        """
+        Recompute the owner's current running totals from the ledger.
+
+        Call after a ledger row is edited or deleted; rules that already
+        fired in a period stay fired.
+        """
+        from .models import AlertCounter
+
+        if not owner_id:
+            return
+        today = timezone.localdate()
+        rules_by_counter = {counter: rules[0] for counter, rules in self.rules_for(ledger, owner_id).counters}
+        for counter in AlertCounter.objects.filter(ledger=ledger, owner_id=owner_id):
+            rule = rules_by_counter.get(counter.counter)
+            bounds = rule.bounds(counter.period_start) if rule else None
+            if bounds is None or (bounds[1] is not None and bounds[1] < today - timedelta(days=RETENTION_DAYS)):
+                counter.delete()
+                continue
+            if bounds[1] is not None and bounds[1] < today:
+                continue
+            total = self._seed(ledger, owner_id, rule, *bounds)
+            if total != counter.total:
+                counter.total = total
+                counter.save(update_fields=['total', 'updated_at'])
+
+
+rules = AlertRuleEngine()
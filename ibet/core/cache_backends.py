@@ -0,0 +1,360 @@
+"""
+Cache backends.
+
+``SQLiteCache`` is a cross-process cache in a local SQLite file in WAL mode.
+It needs no external service, so OTPs, throttles and security counters are
+shared by every worker on the host.
+
+``TwoTierCache`` puts a small per-process LRU in front of a shared cache
+alias. Hot keys read many times per request (token lookups, relationship
+checks, memoized aggregates) are answered from process memory; the shared
+tier is only consulted when the local copy is older than ``LOCAL_TIMEOUT``.
+
+Each value is written to the shared tier together with a short random
+stamp under a sibling key. Revalidating an aged local copy only fetches
+that stamp, and a changed or missing stamp means another worker rewrote or
+deleted the key. Integers are stored unstamped and never held locally, so
+``incr``/``decr`` counters (throttles, data versions) are always read from
+the shared tier.
+
+Local copies are kept pickled and unpickled on every read, like LocMemCache
+does, so a caller mutating what ``get`` returned cannot change what the
+next caller in the process sees.
+
+Example:
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache_backends.TwoTierCache',
+            'OPTIONS': {'SHARED': 'shared', 'LOCAL_MAX_ENTRIES': 1024, 'LOCAL_TIMEOUT': 5},
+        },
+        'shared': {...},
+    }
+"""
+import logging
+import os
+import pickle
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+Stamped = namedtuple('Stamped', ('stamp', 'value'))
+# pickled: the value as pickled bytes; expires: absolute wall-clock expiry
+# when known; checked: monotonic time of the last confirmation against the
+# shared tier
+_LocalEntry = namedtuple('_LocalEntry', ('stamp', 'pickled', 'expires', 'checked'))
+
+_MISSING = object()
+
+
+class TwoTierCache(BaseCache):
+    """
+    Bounded in-process LRU over a shared cache alias.
+
+    OPTIONS:
+        SHARED: Alias of the shared cache in ``CACHES`` (defaults to LOCATION)
+        LOCAL_MAX_ENTRIES: Maximum number of locally held keys
+        LOCAL_TIMEOUT: Seconds a local copy is served before revalidation
+        LOCAL_EXCLUDE_PREFIXES: Keys that are never held locally
+    """
+
+    STAMP_SUFFIX = ':stamp'
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = options.get('SHARED', location)
+        self._local_max_entries = int(options.get('LOCAL_MAX_ENTRIES', 1024))
+        self._local_timeout = float(options.get('LOCAL_TIMEOUT', 5))
+        self._exclude_prefixes = tuple(options.get('LOCAL_EXCLUDE_PREFIXES', ()))
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self._shared_alias]
+
+    def _stamp_key(self, key):
+        return f"{key}{self.STAMP_SUFFIX}"
+
+    def _cacheable(self, key, value) -> bool:
+        if isinstance(value, int):
+            return False
+        return not (self._exclude_prefixes and str(key).startswith(self._exclude_prefixes))
+
+    # Local tier
+
+    def _local_get(self, local_key):
+        with self._lock:
+            entry = self._local.get(local_key)
+            if entry is not None:
+                self._local.move_to_end(local_key)
+            return entry
+
+    def _local_set(self, local_key, stamp, pickled, expires):
+        with self._lock:
+            self._local[local_key] = _LocalEntry(stamp, pickled, expires, time.monotonic())
+            self._local.move_to_end(local_key)
+            while len(self._local) > self._local_max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, local_key):
+        with self._lock:
+            self._local.pop(local_key, None)
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        local_key = (key, version)
+        entry = self._local_get(local_key)
+        if entry is not None:
+            if entry.expires is not None and entry.expires <= time.time():
+                self._local_delete(local_key)
+            elif time.monotonic() - entry.checked < self._local_timeout:
+                return pickle.loads(entry.pickled)
+            elif self.shared.get(self._stamp_key(key), version=version) == entry.stamp:
+                self._local_set(local_key, entry.stamp, entry.pickled, entry.expires)
+                return pickle.loads(entry.pickled)
+            else:
+                self._local_delete(local_key)
+
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        if isinstance(value, Stamped):
+            if self._cacheable(key, value.value):
+                self._local_set(local_key, value.stamp, pickle.dumps(value.value, pickle.HIGHEST_PROTOCOL), None)
+            return value.value
+        return value
+
+    def _write(self, method, key, value, timeout, version):
+        local_key = (key, version)
+        self._local_delete(local_key)
+        if not self._cacheable(key, value):
+            return getattr(self.shared, method)(key, value, timeout, version=version)
+
+        stamp = secrets.token_hex(6)
+        written = getattr(self.shared, method)(key, Stamped(stamp, value), timeout, version=version)
+        if written is False:
+            return False
+        self.shared.set(self._stamp_key(key), stamp, timeout, version=version)
+        self._local_set(
+            local_key, stamp, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), self.shared.get_backend_timeout(timeout)
+        )
+        return written
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._write('set', key, value, timeout, version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._write('add', key, value, timeout, version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self._local_delete((key, version))
+        touched = self.shared.touch(key, timeout, version=version)
+        self.shared.touch(self._stamp_key(key), timeout, version=version)
+        return touched
+
+    def delete(self, key, version=None):
+        self._local_delete((key, version))
+        deleted = self.shared.delete(key, version=version)
+        self.shared.delete(self._stamp_key(key), version=version)
+        return deleted
+
+    def incr(self, key, delta=1, version=None):
+        self._local_delete((key, version))
+        return self.shared.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self._local_delete((key, version))
+        return self.shared.decr(key, delta, version=version)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+class SQLiteCache(BaseCache):
+    """
+    Cache stored in a SQLite database file shared by all local processes.
+
+    WAL journaling lets readers proceed while one process writes. Read-modify-
+    write operations (``add``, ``incr``) run inside ``BEGIN IMMEDIATE`` so they
+    are atomic across processes. Expired rows are ignored on read and swept
+    at most every ``SWEEP_INTERVAL`` seconds per process; the table is culled
+    when it grows past ``MAX_ENTRIES`` (``OPTIONS``).
+
+    LOCATION is the database path.
+    """
+
+    SWEEP_INTERVAL = 60
+    BUSY_TIMEOUT_MS = 5000
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = str(location)
+        self._sweep_interval = float(params.get('OPTIONS', {}).get('SWEEP_INTERVAL', self.SWEEP_INTERVAL))
+        self._local = threading.local()
+        self._last_sweep = 0.0
+        self._schema_ready = False
+
+    # Connection handling
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit; transactions are opened explicitly where needed
+            conn = sqlite3.connect(self._path, timeout=self.BUSY_TIMEOUT_MS / 1000, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}')
+            if not self._schema_ready:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS cache_entries '
+                    '(cache_key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)'
+                )
+                conn.execute('CREATE INDEX IF NOT EXISTS cache_entries_expires ON cache_entries (expires)')
+                self._schema_ready = True
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _immediate(self):
+        return _ImmediateTransaction(self._connection())
+
+    @staticmethod
+    def _dumps(value) -> bytes:
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _loads(blob):
+        return pickle.loads(blob)
+
+    def _expiry(self, timeout):
+        # get_backend_timeout gives an absolute time.time() or None for no expiry
+        return self.get_backend_timeout(timeout)
+
+    def _maybe_sweep(self, conn):
+        now = time.time()
+        if now - self._last_sweep < self._sweep_interval:
+            return
+        self._last_sweep = now
+        try:
+            conn.execute('DELETE FROM cache_entries WHERE expires IS NOT NULL AND expires <= ?', (now,))
+            count = conn.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+            if count > self._max_entries:
+                # Drop the entries closest to expiry first, like the file cache's cull
+                cull = max(1, count // self._cull_frequency) if self._cull_frequency else count
+                conn.execute(
+                    'DELETE FROM cache_entries WHERE cache_key IN '
+                    '(SELECT cache_key FROM cache_entries ORDER BY expires IS NULL, expires LIMIT ?)', (cull,)
+                )
+        except sqlite3.OperationalError as e:
+            # Another process holds the write lock; sweep next time
+            logger.debug(f"SQLite cache sweep skipped: {e}")
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT value FROM cache_entries WHERE cache_key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone()
+        return default if row is None else self._loads(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache_entries (cache_key, value, expires) VALUES (?, ?, ?)',
+            (key, self._dumps(value), self._expiry(timeout)),
+        )
+        self._maybe_sweep(conn)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._immediate() as conn:
+            conn.execute('DELETE FROM cache_entries WHERE cache_key = ? AND expires IS NOT NULL AND expires <= ?', (key, time.time()))
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO cache_entries (cache_key, value, expires) VALUES (?, ?, ?)',
+                (key, self._dumps(value), self._expiry(timeout)),
+            )
+            return cursor.rowcount == 1
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            'UPDATE cache_entries SET expires = ? WHERE cache_key = ? AND (expires IS NULL OR expires > ?)',
+            (self._expiry(timeout), key, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute('DELETE FROM cache_entries WHERE cache_key = ?', (key,))
+        return cursor.rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._immediate() as conn:
+            row = conn.execute(
+                'SELECT value FROM cache_entries WHERE cache_key = ? AND (expires IS NULL OR expires > ?)',
+                (key, time.time()),
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            new_value = self._loads(row[0]) + delta
+            conn.execute('UPDATE cache_entries SET value = ? WHERE cache_key = ?', (self._dumps(new_value), key))
+            return new_value
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT 1 FROM cache_entries WHERE cache_key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entries')
+
+    def close(self, **kwargs):
+        # Django calls this when a request finishes; release the calling
+        # thread's connection so threads that go away do not keep it open
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None and getattr(self._local, 'pid', None) == os.getpid():
+            conn.close()
+
+
+class _ImmediateTransaction:
+    """Take SQLite's write lock up front so read-modify-write is atomic."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
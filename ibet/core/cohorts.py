@@ -0,0 +1,229 @@
+"""
+Cohort spending percentiles.
+
+"Your child spends more on FOOD than 80% of students at this institute"
+needs the distribution of every other student's monthly total, which a
+request should neither compute nor be able to read. A batch job
+(``manage.py build_cohort_sketches``) groups each persona's ledger by
+(user, category) for a month with one query and stores a KLL sketch per
+cohort (persona x institute x month x category) in ``CohortSketch``. A
+percentile lookup reads only the requested user's own total and ranks it
+against the stored sketch.
+
+Cohorts contain the users with spending in the month. Apps register the
+ledger behind each persona in ``<app>/cohorts.py`` (imported from the
+app's ``ready()``):
+
+    @cohorts.register('INDIVIDUAL', date_field='expense_date', category_field='category')
+    def individual_expenses():
+        return IndividualExpense.objects.all()
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F, Sum
+
+from .sketches import KLLSketch
+from .timeseries import filter_range, shift
+
+ALL_CATEGORIES = ''
+ALL_INSTITUTES = 0
+# Smaller cohorts are not answered, so a percentile never singles out a few users
+MIN_COHORT_SIZE = 5
+# Institute cohorts are small and their members know each other
+MIN_INSTITUTE_COHORT_SIZE = 10
+
+
+class UnknownCohortError(LookupError):
+    """Raised for a persona without a registered cohort ledger."""
+
+
+class CohortUnavailableError(LookupError):
+    """Raised when no sketch (or too small a cohort) exists for a request."""
+
+
+def normalize_category(value) -> str:
+    return str(value or '').strip().upper()
+
+
+def month_bounds(month: date) -> Tuple[date, date]:
+    start = month.replace(day=1)
+    return start, shift(start, 'month') - timedelta(days=1)
+
+
+class CohortSource:
+    def __init__(self, persona: str, queryset: Callable, date_field: str, category_field: str,
+                 value: str = 'amount', user_field: str = 'user_id'):
+        self.persona = persona
+        self.queryset = queryset
+        self.date_field = date_field
+        self.category_field = category_field
+        self.value = value
+        self.user_field = user_field
+
+    def monthly_totals(self, month: date, user_id=None) -> Dict[int, Dict[str, Decimal]]:
+        """
+        Per-user totals for a month by normalized category, plus ALL_CATEGORIES.
+
+        One grouped query; with ``user_id`` only that user's rows are read.
+        """
+        start, end = month_bounds(month)
+        queryset = filter_range(self.queryset(), self.date_field, start, end)
+        if user_id is not None:
+            queryset = queryset.filter(**{self.user_field: user_id})
+        rows = queryset.values(
+            cohort_user=F(self.user_field), cohort_category=F(self.category_field)
+        ).annotate(total=Sum(self.value)).order_by()
+
+        totals = defaultdict(lambda: defaultdict(Decimal))
+        for row in rows:
+            amount = row['total'] or Decimal('0')
+            user_totals = totals[row['cohort_user']]
+            category = normalize_category(row['cohort_category'])
+            # Uncategorised rows count towards the overall total only
+            if category != ALL_CATEGORIES:
+                user_totals[category] += amount
+            user_totals[ALL_CATEGORIES] += amount
+        return totals
+
+
+class CohortRegistry:
+    def __init__(self):
+        self.sources = {}
+        self.aliases = {}
+
+    def register(self, persona: str, date_field: str, category_field: str, value: str = 'amount',
+                 user_field: str = 'user_id', aliases: Iterable[str] = ()):
+        """
+        Register a function ``() -> QuerySet`` as the spending rows of users with ``persona``.
+
+        Users whose persona is one of ``aliases`` are ranked in the same cohorts.
+        """
+        def decorator(queryset):
+            self.sources[persona] = CohortSource(persona, queryset, date_field, category_field, value, user_field)
+            for alias in aliases:
+                self.aliases[alias] = persona
+            return queryset
+        return decorator
+
+    def get(self, persona: str) -> CohortSource:
+        try:
+            return self.sources[self.aliases.get(persona, persona)]
+        except KeyError:
+            raise UnknownCohortError(persona)
+
+
+cohorts = CohortRegistry()
+
+
+def institute_memberships(user_ids: Optional[Iterable[int]] = None) -> Dict[int, List[int]]:
+    """user_id -> ids of the institutes the user is an active student of."""
+    profiles = apps.get_model('institute_module', 'InstituteStudentProfile').objects.filter(is_active=True)
+    if user_ids is not None:
+        profiles = profiles.filter(user_id__in=list(user_ids))
+    memberships = defaultdict(list)
+    for user_id, institute_id in profiles.values_list('user_id', 'institute_id').distinct():
+        memberships[user_id].append(institute_id)
+    return memberships
+
+
+class CohortSketchService:
+    """
+    Build and query the stored cohort sketches.
+
+    Usage:
+        CohortSketchService.build(date(2025, 6, 1))           # batch job
+        CohortSketchService.percentile(student, date(2025, 6, 1), 'FOOD', [institute.pk])
+    """
+
+    @classmethod
+    def build(cls, month: date, personas: Optional[Iterable[str]] = None) -> int:
+        """
+        Rebuild every cohort sketch of ``month`` from the registered ledgers.
+
+        Returns:
+            Number of sketches stored
+        """
+        from .models import CohortSketch
+
+        month = month.replace(day=1)
+        memberships = institute_memberships()
+        built = 0
+        for persona in personas or list(cohorts.sources):
+            sketches = defaultdict(KLLSketch)
+            for user_id, categories in cohorts.get(persona).monthly_totals(month).items():
+                cohort_ids = [ALL_INSTITUTES] + memberships.get(user_id, [])
+                for category, total in categories.items():
+                    for institute_id in cohort_ids:
+                        sketches[(institute_id, category)].update(float(total))
+            with transaction.atomic():
+                CohortSketch.objects.filter(persona=persona, month=month).delete()
+                CohortSketch.objects.bulk_create(
+                    CohortSketch(
+                        persona=persona, institute_id=institute_id, month=month, category=category,
+                        count=len(sketch), sketch=sketch.to_dict(),
+                    )
+                    for (institute_id, category), sketch in sketches.items()
+                )
+            built += len(sketches)
+        return built
+
+    @classmethod
+    def sketch(cls, persona: str, month: date, category: str = ALL_CATEGORIES,
+               institute_ids: Iterable[int] = (ALL_INSTITUTES,)) -> Tuple[Optional[KLLSketch], Optional[object]]:
+        """
+        The stored sketch of a cohort, merged across ``institute_ids``.
+
+        Returns:
+            (sketch or None, when it was last built)
+        """
+        from .models import CohortSketch
+
+        rows = CohortSketch.objects.filter(
+            persona=persona, month=month.replace(day=1), category=normalize_category(category),
+            institute_id__in=list(institute_ids),
+        )
+        merged, updated_at = None, None
+        for row in rows:
+            sketch = KLLSketch.from_dict(row.sketch)
+            merged = sketch if merged is None else merged.merge(sketch)
+            updated_at = max(updated_at, row.updated_at) if updated_at else row.updated_at
+        return merged, updated_at
+
+    @classmethod
+    def percentile(cls, user, month: date, category: str = ALL_CATEGORIES,
+                   institute_ids: Iterable[int] = (ALL_INSTITUTES,)) -> Dict:
+        """
+        Where ``user``'s spending in ``month`` ranks in their cohort.
+
+        Raises:
+            UnknownCohortError: If the user's persona has no cohort ledger
+            CohortUnavailableError: If the cohort has no sketch or fewer
+                than MIN_COHORT_SIZE users (MIN_INSTITUTE_COHORT_SIZE when
+                narrowed to institutes)
+        """
+        source = cohorts.get((user.persona or '').upper())
+        persona = source.persona
+        category = normalize_category(category)
+        institute_ids = sorted(set(institute_ids))
+        sketch, updated_at = cls.sketch(persona, month, category, institute_ids)
+        min_size = MIN_COHORT_SIZE if institute_ids == [ALL_INSTITUTES] else MIN_INSTITUTE_COHORT_SIZE
+        if sketch is None or len(sketch) < min_size:
+            raise CohortUnavailableError(f"No cohort statistics for {persona} {month:%Y-%m} {category or 'ALL'}")
+
+        amount = source.monthly_totals(month, user_id=user.pk).get(user.pk, {}).get(category, Decimal('0'))
+        return {
+            'persona': persona,
+            'month': month.strftime('%Y-%m'),
+            'category': category or None,
+            'institutes': [pk for pk in institute_ids if pk != ALL_INSTITUTES],
+            'amount': float(amount),
+            # Share of the cohort spending less than the user
+            'percentile': round(sketch.rank(float(amount)) * 100, 1),
+            'cohort_size': len(sketch),
+            'computed_at': updated_at.isoformat() if updated_at else None,
+        }
@@ -0,0 +1,128 @@
+"""
+Run independent read-only queries concurrently.
+
+Dashboard views issue several aggregates that do not depend on each other.
+``run_concurrently`` executes them on a small, bounded thread pool so the
+view's latency approaches that of the slowest query instead of their sum.
+Each task runs with the caller's active language on its pool thread's own
+database connection. Pool threads keep that connection from task to task
+(one that a failed task left unusable is replaced); ``shutdown`` closes them
+when the process exits.
+
+Queries inside an open transaction (``atomic`` blocks, test cases) must see
+uncommitted rows on the caller's connection, so they run sequentially.
+"""
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from django.conf import settings
+from django.db import connection, connections
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+# Connection wrappers opened by pool threads, closed by shutdown()
+_worker_connections = set()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'DASHBOARD_QUERY_WORKERS', DEFAULT_MAX_WORKERS),
+                    thread_name_prefix='dashboard-query',
+                )
+    return _executor
+
+
+def _can_run_concurrently() -> bool:
+    if getattr(settings, 'DASHBOARD_QUERY_WORKERS', DEFAULT_MAX_WORKERS) <= 1:
+        return False
+    # Nested calls from a pool thread could exhaust the pool and deadlock
+    if getattr(_worker_state, 'active', False):
+        return False
+    if connection.in_atomic_block:
+        return False
+    # In-memory SQLite databases are private to their connection
+    if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+        return False
+    return True
+
+
+def _discard_broken_connections():
+    for conn in connections.all(initialized_only=True):
+        if conn.connection is not None and conn.errors_occurred:
+            if conn.is_usable():
+                conn.errors_occurred = False
+            else:
+                conn.close()
+
+
+def _run_task(func: Callable, language):
+    _discard_broken_connections()
+    _worker_state.active = True
+    try:
+        with translation.override(language):
+            return func()
+    finally:
+        _worker_state.active = False
+        with _executor_lock:
+            _worker_connections.update(connections.all(initialized_only=True))
+
+
+def shutdown():
+    """Stop the pool and close the database connections of its threads."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is None:
+        return
+    executor.shutdown(wait=True)
+    with _executor_lock:
+        opened = list(_worker_connections)
+        _worker_connections.clear()
+    for conn in opened:
+        # The owning thread has exited
+        conn.inc_thread_sharing()
+        try:
+            conn.close()
+        finally:
+            conn.dec_thread_sharing()
+
+
+atexit.register(shutdown)
+
+
+def run_concurrently(tasks: Dict[str, Callable]) -> Dict:
+    """
+    Evaluate independent zero-argument callables, concurrently when safe.
+
+    Callables must fully evaluate their querysets (``list()``, ``.count()``,
+    ``.aggregate()``, serializer ``.data``) and must not write.
+
+    Args:
+        tasks: Mapping of result name to callable
+
+    Returns:
+        Mapping of result name to the callable's return value
+
+    Raises:
+        The first exception raised by any task
+    """
+    if len(tasks) < 2 or not _can_run_concurrently():
+        return {name: func() for name, func in tasks.items()}
+
+    language = translation.get_language()
+    executor = _get_executor()
+    futures = {name: executor.submit(_run_task, func, language) for name, func in tasks.items()}
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,102 @@
+"""
+Conditional GET support for polled read endpoints.
+
+Dashboards and statements are polled every 30 seconds. Their content only
+changes when the requesting user's data version changes (see
+``core.data_version``), so a weak ETag derived from that version is computed
+before the view body runs; a matching ``If-None-Match`` is answered with
+``304 Not Modified`` without touching the expensive aggregates.
+"""
+import functools
+import hashlib
+from typing import Callable, Iterable, Optional
+
+from django.utils import timezone, translation
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .data_version import DataVersionService
+
+
+def compute_etag(request, extra: Iterable = ()) -> str:
+    """
+    Build a weak ETag for a user-scoped GET.
+
+    The validator covers the user's data version, the local date (payloads
+    roll over at midnight), the active language and the full path including
+    the query string.
+
+    Args:
+        request: DRF request with an authenticated user
+        extra: Additional tokens from the view (e.g. institute versions)
+
+    Returns:
+        Weak ETag string, quoted
+    """
+    tokens = [
+        str(DataVersionService.get('user', request.user.pk)),
+        timezone.localdate().isoformat(),
+        translation.get_language() or '',
+        request.get_full_path(),
+    ]
+    tokens.extend(str(token) for token in extra)
+    digest = hashlib.md5('|'.join(tokens).encode('utf-8')).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _etag_matches(etag: str, header: Optional[str]) -> bool:
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    if '*' in candidates:
+        return True
+    # Weak comparison: ignore the W/ prefix on both sides
+    bare = etag[2:] if etag.startswith('W/') else etag
+    return any((c[2:] if c.startswith('W/') else c) == bare for c in candidates)
+
+
+def _mark_revalidate(response, etag: str):
+    response['ETag'] = etag
+    # Let browsers keep the body but revalidate on every poll
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Authorization', 'Accept-Language'))
+    return response
+
+
+def conditional_get(extra: Optional[Callable] = None):
+    """
+    Decorator for APIView/ViewSet GET handlers answering 304 on a matching ETag.
+
+    Args:
+        extra: Optional callable ``(request, *args, **kwargs) -> iterable``
+            contributing extra validator tokens for data outside the user's
+            own version scope
+
+    Usage:
+        @conditional_get()
+        def get(self, request):
+            ...
+    """
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or not request.user.is_authenticated:
+                return view_method(self, request, *args, **kwargs)
+
+            etag = compute_etag(request, extra(request, *args, **kwargs) if extra else ())
+            if _etag_matches(etag, request.META.get('HTTP_IF_NONE_MATCH')):
+                return _mark_revalidate(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                _mark_revalidate(response, etag)
+            return response
+        return wrapper
+    return decorator
+
+
+def minute_bucket(request, *args, **kwargs):
+    """Extra validator for payloads carrying minute-resolution clock fields."""
+    return [timezone.now().strftime('%Y-%m-%dT%H:%M')]
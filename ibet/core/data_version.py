@@ -0,0 +1,155 @@
+"""
+Per-scope data versions for memoizing money aggregates.
+
+Every ledger write bumps a monotonically increasing version for the scope
+it touches (a user, a couple wallet or an institute; ``content`` versions
+named reference data such as investment suggestions; ``alert_rules``
+versions a ledger owner's alert configuration). Aggregates computed
+from that scope are cached under a key that embeds the current version, so
+a write makes every older entry unreachable: cached results are never
+stale and need no TTL tuning. Fills go through ``core.singleflight`` so a
+burst of misses on the same key computes it once.
+"""
+import functools
+import hashlib
+import time
+import logging
+from datetime import date, datetime
+from typing import Callable, Iterable, Optional
+
+from django.core.cache import cache
+from django.db import models, transaction
+
+from .singleflight import single_flight
+
+logger = logging.getLogger(__name__)
+
+
+class DataVersionService:
+    """
+    Monotonic per-scope data versions stored in the shared cache.
+    """
+
+    SCOPES = ('user', 'couple', 'institute', 'content', 'alert_rules')
+    KEY_PREFIX = 'data_version'
+    MEMO_PREFIX = 'memo'
+    MEMO_TIMEOUT = 60 * 60 * 24
+
+    @classmethod
+    def _key(cls, scope: str, scope_id) -> str:
+        if scope not in cls.SCOPES:
+            raise ValueError(f"Unknown data version scope: {scope}")
+        return f"{cls.KEY_PREFIX}:{scope}:{scope_id}"
+
+    @staticmethod
+    def _seed() -> int:
+        # Seeding from the clock keeps versions increasing even if the
+        # counter was evicted, so an old memo key can never be reused.
+        return time.time_ns() // 1000
+
+    @classmethod
+    def get(cls, scope: str, scope_id) -> int:
+        """
+        Get the current version of a scope, initialising it if needed.
+
+        Args:
+            scope: One of SCOPES
+            scope_id: Primary key of the user, couple wallet or institute,
+                or the name of a content set
+
+        Returns:
+            Current version number
+        """
+        key = cls._key(scope, scope_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, cls._seed(), None)
+            version = cache.get(key)
+        return version
+
+    @classmethod
+    def bump(cls, scope: str, scope_id) -> Optional[int]:
+        """
+        Advance the version of a scope after a write.
+
+        The bump is repeated once the surrounding transaction commits so
+        readers that cached results from uncommitted state are discarded.
+
+        Args:
+            scope: One of SCOPES
+            scope_id: Primary key of the user, couple wallet or institute,
+                or the name of a content set
+
+        Returns:
+            New version number, or None when scope_id is empty
+        """
+        if not scope_id:
+            return None
+        version = cls._incr(scope, scope_id)
+        transaction.on_commit(lambda: cls._incr(scope, scope_id))
+        return version
+
+    @classmethod
+    def bump_many(cls, scope: str, scope_ids: Iterable) -> None:
+        for scope_id in set(scope_ids):
+            cls.bump(scope, scope_id)
+
+    @classmethod
+    def _incr(cls, scope: str, scope_id) -> int:
+        key = cls._key(scope, scope_id)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Missing or evicted counter
+            version = cls._seed()
+            cache.set(key, version, None)
+            return version
+
+
+def _arg_token(value) -> str:
+    if isinstance(value, models.Model):
+        return f"{value._meta.label}:{value.pk}"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return repr(value)
+
+
+def versioned_memoize(scope: str, key: Callable, timeout: Optional[int] = None):
+    """
+    Cache a helper's result under (function, args, data version).
+
+    Args:
+        scope: Data version scope the result depends on
+        key: Callable receiving the helper's arguments and returning the
+            scope id, e.g. ``lambda user, *a, **kw: user.pk``, or a list of
+            ids when the result spans several scopes (e.g. institutes)
+        timeout: Cache timeout; defaults to DataVersionService.MEMO_TIMEOUT
+
+    Usage:
+        @versioned_memoize('user', key=lambda user: user.pk)
+        def yearly_totals(user):
+            ...
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            scope_id = key(*args, **kwargs)
+            if isinstance(scope_id, (list, tuple, set, frozenset)):
+                ids = sorted(set(scope_id))
+                scope_id = ','.join(str(i) for i in ids)
+                version = '.'.join(str(DataVersionService.get(scope, i)) for i in ids)
+            else:
+                version = DataVersionService.get(scope, scope_id)
+            tokens = [scope, str(scope_id), str(version)]
+            tokens += [_arg_token(a) for a in args]
+            tokens += [f"{k}={_arg_token(v)}" for k, v in sorted(kwargs.items())]
+            digest = hashlib.md5('|'.join(tokens).encode('utf-8')).hexdigest()
+            cache_key = f"{DataVersionService.MEMO_PREFIX}:{name}:{digest}"
+
+            return single_flight(cache_key, lambda: func(*args, **kwargs), timeout or DataVersionService.MEMO_TIMEOUT)
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
@@ -0,0 +1,95 @@
+"""
+Server-side downsampling of chart series.
+
+Long ranges can produce thousands of points that a line chart draws into a
+few hundred pixels. Chart endpoints accept ``?max_points=N`` and reduce the
+series with Largest-Triangle-Three-Buckets: the first and last points are
+kept and from each bucket in between the point forming the largest triangle
+with its neighbours is chosen, so peaks and dips survive.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+MIN_POINTS = 3
+MAX_POINTS = 5000
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], threshold: int) -> np.ndarray:
+    """
+    Indices of the points LTTB keeps, in order.
+
+    Args:
+        x: Monotonic x values
+        y: y values
+        threshold: Number of points to keep
+
+    Returns:
+        Integer array of ``min(threshold, len(x))`` indices
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < MIN_POINTS:
+        return np.arange(n)
+
+    # threshold - 2 buckets between the fixed first and last points
+    every = (n - 2) / (threshold - 2)
+    edges = (np.floor(np.arange(threshold - 1) * every) + 1).astype(int)
+    edges[-1] = n - 1
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(points: List[Dict], max_points: Optional[int], y_key: str, x_key: Optional[str] = None) -> List[Dict]:
+    """
+    Reduce a list of chart points to at most ``max_points`` with LTTB.
+
+    Args:
+        points: Chart points in x order
+        max_points: Target size; None leaves the series untouched
+        y_key: Key of the plotted value
+        x_key: Key of a numeric x value; defaults to the point's position
+
+    Returns:
+        The kept points (the original dicts), in order
+    """
+    if not max_points or len(points) <= max_points:
+        return points
+    y = [float(point[y_key] or 0) for point in points]
+    x = [float(point[x_key]) for point in points] if x_key else np.arange(len(points))
+    return [points[i] for i in lttb_indices(x, y, max_points)]
+
+
+def max_points_param(query_params) -> Optional[int]:
+    """
+    Read ``?max_points=`` from a request.
+
+    Raises:
+        ValueError: If it is not an integer between MIN_POINTS and MAX_POINTS
+    """
+    value = query_params.get('max_points')
+    if value in (None, ''):
+        return None
+    try:
+        max_points = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("max_points must be an integer")
+    if not MIN_POINTS <= max_points <= MAX_POINTS:
+        raise ValueError(f"max_points must be between {MIN_POINTS} and {MAX_POINTS}")
+    return max_points
@@ -0,0 +1,199 @@
+"""
+Per-user event channel backing the Server-Sent Events stream.
+
+Signal receivers publish small "something changed" events (balance, lock,
+notification, OTP request, spending request) for the users who should
+refetch. The SSE view in ``core.views_events`` reads them with a cursor, so
+clients only hit the dashboard endpoints when their data actually changed.
+
+The backend is pluggable through ``settings.EVENT_BUS_BACKEND``:
+
+- ``core.events.CacheEventBackend`` (default): events stored in the shared
+  Django cache and picked up by polling, so every worker sees every event.
+- ``core.events.InProcessEventBackend``: per-process ring buffers that wake
+  waiting streams immediately. Suitable for a single worker.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class EventTypes:
+    BALANCE = 'balance'
+    LOCK = 'lock'
+    NOTIFICATION = 'notification'
+    OTP_REQUEST = 'otp_request'
+    SPENDING_REQUEST = 'spending_request'
+
+
+class BaseEventBackend:
+    """
+    Interface for event backends.
+
+    Events are dicts ``{'id': int, 'type': str, 'data': dict, 'ts': float}``
+    with ids increasing per user; streams resume from the last id they saw.
+    """
+
+    BUFFER_SIZE = 50
+    POLL_INTERVAL = 1.0
+
+    def publish(self, user_id, event_type: str, data: Optional[dict] = None) -> dict:
+        raise NotImplementedError
+
+    def events_since(self, user_id, last_id: int) -> List[dict]:
+        raise NotImplementedError
+
+    def latest_id(self, user_id) -> int:
+        raise NotImplementedError
+
+    async def wait(self, user_id, last_id: int, timeout: float) -> None:
+        """Return when new events may be available or after timeout."""
+        await asyncio.sleep(min(timeout, self.POLL_INTERVAL))
+
+
+class InProcessEventBackend(BaseEventBackend):
+    """
+    In-memory pub/sub. Publishing from a request thread wakes the waiting
+    streams on their event loops without polling.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffers = {}
+        # Seeded from the clock so ids keep increasing across restarts and
+        # a reconnecting client's Last-Event-ID never hides new events.
+        self._counter = itertools.count(int(time.time() * 1000))
+        self._waiters = {}
+
+    def publish(self, user_id, event_type, data=None):
+        event = {'id': next(self._counter), 'type': event_type, 'data': data or {}, 'ts': time.time()}
+        with self._lock:
+            self._buffers.setdefault(user_id, deque(maxlen=self.BUFFER_SIZE)).append(event)
+            waiters = list(self._waiters.get(user_id, ()))
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                # Stream's event loop already closed
+                pass
+        return event
+
+    def events_since(self, user_id, last_id):
+        with self._lock:
+            return [e for e in self._buffers.get(user_id, ()) if e['id'] > last_id]
+
+    def latest_id(self, user_id):
+        with self._lock:
+            buffer = self._buffers.get(user_id)
+            return buffer[-1]['id'] if buffer else 0
+
+    async def wait(self, user_id, last_id, timeout):
+        entry = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.setdefault(user_id, set()).add(entry)
+        try:
+            # Registered before checking, so a publish in between still wakes us
+            if not self.events_since(user_id, last_id):
+                await asyncio.wait_for(entry[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(user_id)
+                if waiters is not None:
+                    waiters.discard(entry)
+                    if not waiters:
+                        del self._waiters[user_id]
+
+
+class CacheEventBackend(BaseEventBackend):
+    """
+    Events kept in the shared cache so all workers can serve any stream.
+
+    Ids come from an atomic ``incr`` and each event is stored under its own
+    key, so concurrent publishers never overwrite each other's events.
+    Readers fetch the last BUFFER_SIZE ids and stop at the first missing
+    one (not written yet, or expired).
+    """
+
+    KEY_PREFIX = 'events'
+    TIMEOUT = 60 * 10
+
+    def _seq_key(self, user_id):
+        return f"{self.KEY_PREFIX}:{user_id}:seq"
+
+    def _event_key(self, user_id, event_id):
+        return f"{self.KEY_PREFIX}:{user_id}:{event_id}"
+
+    def publish(self, user_id, event_type, data=None):
+        seq_key = self._seq_key(user_id)
+        cache.add(seq_key, 0, None)
+        event_id = cache.incr(seq_key)
+        event = {'id': event_id, 'type': event_type, 'data': data or {}, 'ts': time.time()}
+        cache.set(self._event_key(user_id, event_id), event, self.TIMEOUT)
+        return event
+
+    def events_since(self, user_id, last_id):
+        latest = self.latest_id(user_id)
+        ids = range(max(last_id + 1, latest - self.BUFFER_SIZE + 1), latest + 1)
+        found = cache.get_many([self._event_key(user_id, event_id) for event_id in ids])
+        events = []
+        for event_id in ids:
+            event = found.get(self._event_key(user_id, event_id))
+            if event is None:
+                break
+            events.append(event)
+        return events
+
+    def latest_id(self, user_id):
+        return cache.get(self._seq_key(user_id)) or 0
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_event_backend() -> BaseEventBackend:
+    """Return the configured event backend (a process-wide singleton)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, 'EVENT_BUS_BACKEND', 'core.events.CacheEventBackend')
+                _backend = import_string(path)()
+    return _backend
+
+
+def publish(user_ids: Iterable, event_type: str, data: Optional[dict] = None) -> None:
+    """
+    Publish an event to each user once the current transaction commits.
+
+    Args:
+        user_ids: Recipients; empty ids are ignored
+        event_type: One of EventTypes
+        data: Small JSON-serialisable payload (ids only, never balances)
+    """
+    recipients = {uid for uid in user_ids if uid}
+    if not recipients:
+        return
+
+    def send():
+        backend = get_event_backend()
+        for user_id in recipients:
+            try:
+                backend.publish(user_id, event_type, data)
+            except Exception as e:
+                logger.error(f"Failed to publish {event_type} event for user {user_id}: {e}")
+
+    transaction.on_commit(send)
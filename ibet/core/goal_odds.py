@@ -0,0 +1,131 @@
+"""
+Probability of reaching a savings goal by its deadline.
+
+A goal's future contributions are modelled on the owner's own history:
+monthly net savings (money in minus money out) over the last complete
+months are resampled with replacement into ``paths`` x ``months`` draws,
+shared equally by the owner's open goals. One ``cumsum`` over the month
+axis gives every path's running savings, so thousands of paths cost a few
+array operations and no per-path Python.
+
+Apps provide the history and cache the results per goal and data version
+(``individual_module/goal_odds.py``, ``couple_module/goal_odds.py``).
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .timeseries import rollup, shift
+
+DEFAULT_PATHS = 5000
+HISTORY_MONTHS = 12
+MIN_HISTORY_MONTHS = 3
+# Horizon for goals without a deadline
+OPEN_ENDED_MONTHS = 120
+ON_TRACK_PROBABILITY = 0.8
+AT_RISK_PROBABILITY = 0.5
+
+
+def history_range(today: date, months: int = HISTORY_MONTHS):
+    """First and last day of the ``months`` complete months before ``today``."""
+    this_month = today.replace(day=1)
+    return shift(this_month, 'month', -months), this_month - timedelta(days=1)
+
+
+def monthly_net(inflows, outflows, today: date) -> List[float]:
+    """
+    Net savings of each of the last complete months.
+
+    Args:
+        inflows: ``(queryset, date_field)`` of the money coming in
+        outflows: ``(queryset, date_field)`` of the money going out
+
+    Returns:
+        Monthly in minus out, oldest first, from the first month with any activity
+    """
+    start, end = history_range(today)
+    money_in = rollup(inflows[0], inflows[1], 'month', start, end)
+    money_out = rollup(outflows[0], outflows[1], 'month', start, end)
+    active = [bool(i['count'] or o['count']) for i, o in zip(money_in, money_out)]
+    if not any(active):
+        return []
+    first = active.index(True)
+    return [float(i['total'] - o['total']) for i, o in zip(money_in[first:], money_out[first:])]
+
+
+def months_until(today: date, deadline: date) -> int:
+    """Monthly contributions still possible before ``deadline`` (this month included)."""
+    return max((deadline.year - today.year) * 12 + deadline.month - today.month + 1, 0) if deadline >= today else 0
+
+
+def simulate(history: Sequence[float], needed: float, months: int, paths: int = DEFAULT_PATHS,
+             seed: Optional[int] = None) -> Dict:
+    """
+    Bootstrap ``paths`` savings paths of ``months`` months from ``history``.
+
+    Returns:
+        ``probability`` that savings reach ``needed``, ``median_months`` to
+        get there (among the paths that do) and the p10/p50/p90 of the
+        amount saved by the last month
+    """
+    rng = np.random.default_rng(seed)
+    draws = rng.choice(np.asarray(history, dtype=float), size=(paths, months))
+    saved = np.cumsum(draws, axis=1)
+    reached = saved >= needed
+    hit = reached.any(axis=1)
+    months_to_reach = reached.argmax(axis=1)[hit] + 1
+    p10, p50, p90 = np.percentile(saved[:, -1], [10, 50, 90])
+    return {
+        'probability': float(hit.mean()),
+        'median_months': int(np.median(months_to_reach)) if len(months_to_reach) else None,
+        'projected': {'p10': round(float(p10), 2), 'p50': round(float(p50), 2), 'p90': round(float(p90), 2)},
+    }
+
+
+def goal_attainment(history: Sequence[float], target, current, deadline: Optional[date], today: date,
+                    open_goals: int = 1, seed: Optional[int] = None, paths: int = DEFAULT_PATHS) -> Dict:
+    """
+    Attainment estimate of one goal.
+
+    Args:
+        history: Owner's monthly net savings (see ``monthly_net``)
+        target: Goal amount
+        current: Amount already saved
+        deadline: Target date, or None for an open-ended goal
+        today: Reference date
+        open_goals: Number of the owner's unfinished goals sharing the savings
+        seed: Seed for reproducible estimates (e.g. the goal's pk)
+
+    Returns:
+        ``status`` (REACHED, ON_TRACK, AT_RISK, OFF_TRACK, NO_DEADLINE or
+        INSUFFICIENT_HISTORY), ``probability`` (None without a deadline or
+        enough history), ``months_left``, ``median_months``, ``projected``
+        and ``history_months``
+    """
+    needed = float(target) - float(current)
+    months = months_until(today, deadline) if deadline else OPEN_ENDED_MONTHS
+    result = {
+        'status': None, 'probability': None, 'months_left': months if deadline else None,
+        'median_months': None, 'projected': None, 'history_months': len(history),
+    }
+    if needed <= 0:
+        return {**result, 'status': 'REACHED', 'probability': 1.0, 'median_months': 0}
+    if len(history) < MIN_HISTORY_MONTHS:
+        return {**result, 'status': 'INSUFFICIENT_HISTORY'}
+    if months == 0:
+        return {**result, 'status': 'OFF_TRACK', 'probability': 0.0}
+
+    share = np.asarray(history, dtype=float) / max(open_goals, 1)
+    estimate = simulate(share, needed, months, paths=paths, seed=seed)
+    if not deadline:
+        return {**result, **estimate, 'status': 'NO_DEADLINE', 'probability': None}
+
+    probability = estimate['probability']
+    if probability >= ON_TRACK_PROBABILITY:
+        status = 'ON_TRACK'
+    elif probability >= AT_RISK_PROBABILITY:
+        status = 'AT_RISK'
+    else:
+        status = 'OFF_TRACK'
+    return {**result, **estimate, 'status': status, 'probability': round(probability, 3)}
@@ -0,0 +1,177 @@
+"""
+Health probes and cached system statistics.
+
+Load balancers poll ``/healthz`` (is the process up? no database) and
+``/readyz`` (one ``SELECT 1`` with a timeout) every few seconds, so neither
+may do real work. Row counts for ``api_status`` are computed off the request
+path, cached, and refreshed in the background once stale; large tables use
+the database's planner statistics instead of ``COUNT(*)``.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from .singleflight import acquire, release
+
+logger = logging.getLogger(__name__)
+
+READY_TIMEOUT_SECONDS = getattr(settings, 'READYZ_TIMEOUT_SECONDS', 2.0)
+
+_ping_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='readyz')
+_ping_lock = threading.Lock()
+_ping_future = None
+
+
+def _ping():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    finally:
+        connection.close()
+
+
+def _off_request_thread_ok() -> bool:
+    # In-memory SQLite and open transactions are only visible on this connection
+    if connection.in_atomic_block:
+        return False
+    return not (connection.vendor == 'sqlite' and connection.is_in_memory_db())
+
+
+def check_database(timeout: float = READY_TIMEOUT_SECONDS):
+    """
+    Ping the default database.
+
+    The ping runs on its own thread so a hung database fails the probe
+    after ``timeout`` seconds instead of tying up the worker; while a
+    previous ping is still stuck, probes fail immediately.
+
+    Returns:
+        (ok, error message or None)
+    """
+    global _ping_future
+    if not _off_request_thread_ok():
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True, None
+        except DatabaseError as e:
+            return False, str(e)
+
+    with _ping_lock:
+        if _ping_future is not None and not _ping_future.done():
+            return False, 'previous database ping still pending'
+        _ping_future = _ping_executor.submit(_ping)
+        future = _ping_future
+    try:
+        future.result(timeout=timeout)
+        return True, None
+    except FutureTimeout:
+        return False, f'database ping timed out after {timeout}s'
+    except DatabaseError as e:
+        return False, str(e)
+
+
+def approximate_count(model):
+    """
+    Row count from planner statistics, or None when there are none.
+
+    SQLite keeps them in ``sqlite_stat1`` after ``ANALYZE``; PostgreSQL in
+    ``pg_class.reltuples``.
+    """
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+                row = cursor.fetchone()
+                return int(row[0].split()[0]) if row else None
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+                row = cursor.fetchone()
+                return int(row[0]) if row and row[0] >= 0 else None
+    except DatabaseError:
+        # sqlite_stat1 does not exist until the first ANALYZE
+        return None
+    return None
+
+
+class SystemStatsService:
+    """
+    Cached row counts for the status endpoints.
+
+    Usage:
+        SystemStatsService.get()      # cached counts; refreshes in the background when stale
+        SystemStatsService.refresh()  # recompute now (management command, tests)
+    """
+
+    CACHE_KEY = 'system_stats'
+    REFRESH_SECONDS = getattr(settings, 'SYSTEM_STATS_REFRESH_SECONDS', 5 * 60)
+    # Tables whose planner estimate is at least this large are not COUNT(*)ed
+    APPROXIMATE_ABOVE = getattr(settings, 'SYSTEM_STATS_APPROXIMATE_ABOVE', 10000)
+    MODELS = (
+        ('total_users', 'student_module.User'),
+        ('student_wallets', 'student_module.Wallet'),
+        ('couple_wallets', 'couple_module.CoupleWallet'),
+        ('individual_wallets', 'individual_module.IndividualWallet'),
+        ('institutes', 'institute_module.Institute'),
+    )
+
+    @classmethod
+    def count(cls, model):
+        """(count, approximate) for one model."""
+        estimate = approximate_count(model)
+        if estimate is not None and estimate >= cls.APPROXIMATE_ABOVE:
+            return estimate, True
+        return model.objects.count(), False
+
+    @classmethod
+    def refresh(cls):
+        counts, approximate = {}, []
+        for name, label in cls.MODELS:
+            counts[name], is_estimate = cls.count(apps.get_model(label))
+            if is_estimate:
+                approximate.append(name)
+        stats = {
+            'counts': counts,
+            'approximate': approximate,
+            'refreshed_at': timezone.now().isoformat(),
+            'expires': timezone.now().timestamp() + cls.REFRESH_SECONDS,
+        }
+        # Kept well past staleness so readers always get the last counts
+        cache.set(cls.CACHE_KEY, stats, cls.REFRESH_SECONDS * 12)
+        return stats
+
+    @classmethod
+    def _refresh_once(cls):
+        if not acquire(cls.CACHE_KEY):
+            return
+        try:
+            cls.refresh()
+        except Exception as e:
+            logger.error(f"Refreshing system stats failed: {e}")
+        finally:
+            release(cls.CACHE_KEY)
+            connection.close()
+
+    @classmethod
+    def get(cls):
+        """
+        Last computed stats, or None before the first refresh finishes.
+
+        A stale or missing entry triggers one background refresh (inline
+        when the data is only visible on this connection, e.g. in tests).
+        """
+        stats = cache.get(cls.CACHE_KEY)
+        if stats is not None and stats['expires'] > timezone.now().timestamp():
+            return stats
+        if not _off_request_thread_ok():
+            return cls.refresh()
+        threading.Thread(target=cls._refresh_once, name='system-stats', daemon=True).start()
+        return stats
@@ -0,0 +1,141 @@
+"""
+Batch loading for serializer method fields.
+
+A ``SerializerMethodField`` that runs a query per object turns a list
+response into N+1 queries. ``BatchMethodField`` instead names a loader and
+the key it needs from each object. When the serializer is used with
+``many=True`` and ``Meta.list_serializer_class = BatchListSerializer``, the
+keys of every row are collected first and each loader resolves them with one
+query. Loaders live for the whole request, so two fields (or two
+serializers) asking for the same wallet share one fetch.
+
+Usage:
+
+    class WalletByUserLoader(BatchLoader):
+        def batch_load(self, keys):
+            return {w.user_id: w for w in Wallet.objects.filter(user_id__in=keys)}
+
+    class DashboardSerializer(serializers.ModelSerializer):
+        wallet_balance = BatchMethodField(WalletByUserLoader, key='parent_id')
+
+        def get_wallet_balance(self, obj, wallet):
+            return float(wallet.balance) if wallet else 0.0
+
+        class Meta:
+            list_serializer_class = BatchListSerializer
+"""
+from typing import Any, Callable, Dict, Iterable, Union
+
+from django.db import models
+from rest_framework import serializers
+
+
+class BatchLoader:
+    """
+    Resolve keys in batches and remember the results.
+
+    Subclasses implement ``batch_load(keys) -> {key: value}``; keys missing
+    from the result resolve to ``default``.
+    """
+
+    default = None
+
+    def __init__(self):
+        self._results = {}
+        self._pending = set()
+
+    def batch_load(self, keys: list) -> Dict:
+        raise NotImplementedError
+
+    def prime(self, keys: Iterable) -> None:
+        """Queue keys to be fetched together on the next load."""
+        self._pending.update(key for key in keys if key is not None and key not in self._results)
+
+    def load(self, key) -> Any:
+        if key is None:
+            return self.default
+        if key not in self._results:
+            self._pending.add(key)
+            self._dispatch()
+        return self._results.get(key, self.default)
+
+    def _dispatch(self) -> None:
+        keys = [key for key in self._pending if key not in self._results]
+        self._pending.clear()
+        if not keys:
+            return
+        found = self.batch_load(keys)
+        for key in keys:
+            self._results[key] = found.get(key, self.default)
+
+
+def get_loader(context: Dict, loader_class) -> BatchLoader:
+    """
+    Return the loader instance for this request (or serializer context).
+
+    Loaders are stored on the request when one is in the context so that
+    every serializer rendering the same response shares them.
+    """
+    request = context.get('request')
+    if request is not None:
+        holder = getattr(request, '_batch_loaders', None)
+        if holder is None:
+            holder = {}
+            request._batch_loaders = holder
+    else:
+        holder = context.setdefault('_batch_loaders', {})
+    loader = holder.get(loader_class)
+    if loader is None:
+        loader = holder[loader_class] = loader_class()
+    return loader
+
+
+class BatchMethodField(serializers.Field):
+    """
+    Read-only field whose value comes from a batch loader.
+
+    Args:
+        loader_class: BatchLoader subclass resolving the key
+        key: Attribute name, dict key or callable giving the loader key for
+            an object
+        method_name: Serializer method called as ``method(obj, loaded)``;
+            defaults to ``get_<field_name>``. Without a method the loaded
+            value is returned as is.
+    """
+
+    def __init__(self, loader_class, key: Union[str, Callable], method_name: str = None, **kwargs):
+        self.loader_class = loader_class
+        self.key = key
+        self.method_name = method_name
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def bind(self, field_name, parent):
+        if self.method_name is None:
+            self.method_name = f'get_{field_name}'
+        super().bind(field_name, parent)
+
+    def key_for(self, instance):
+        if callable(self.key):
+            return self.key(instance)
+        if isinstance(instance, dict):
+            return instance.get(self.key)
+        return getattr(instance, self.key, None)
+
+    def to_representation(self, instance):
+        loaded = get_loader(self.context, self.loader_class).load(self.key_for(instance))
+        method = getattr(self.parent, self.method_name, None)
+        return method(instance, loaded) if method else loaded
+
+
+class BatchListSerializer(serializers.ListSerializer):
+    """List serializer that primes every BatchMethodField before rendering rows."""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        items = list(iterable)
+        for field in self.child.fields.values():
+            if isinstance(field, BatchMethodField):
+                get_loader(self.context, field.loader_class).prime(field.key_for(item) for item in items)
+        return super().to_representation(items)
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.cohorts import CohortSketchService
+from core.timeseries import shift
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the cohort spending sketches behind /api/cohorts/percentile/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--month', action='append', default=[],
+            help='Month to rebuild as YYYY-MM (repeatable; default: this month and the previous one)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            months = [datetime.strptime(value, '%Y-%m').date() for value in options['month']]
+        except ValueError:
+            raise CommandError('--month must be YYYY-MM')
+        if not months:
+            this_month = timezone.localdate().replace(day=1)
+            months = [shift(this_month, 'month', -1), this_month]
+
+        for month in months:
+            built = CohortSketchService.build(month)
+            self.stdout.write(f'{month:%Y-%m}: {built} sketches')
+        self.stdout.write(self.style.SUCCESS('Cohort sketches rebuilt'))
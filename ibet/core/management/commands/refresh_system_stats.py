@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.health import SystemStatsService
+
+
+class Command(BaseCommand):
+    help = 'Recompute the cached system statistics served by /api/status/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Run ANALYZE first so large tables get fresh row estimates',
+        )
+
+    def handle(self, *args, **options):
+        if options['analyze']:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            self.stdout.write(self.style.SUCCESS('Database statistics updated'))
+
+        stats = SystemStatsService.refresh()
+        for name, count in stats['counts'].items():
+            marker = ' (approximate)' if name in stats['approximate'] else ''
+            self.stdout.write(f'{name}: {count}{marker}')
+        self.stdout.write(self.style.SUCCESS('System statistics refreshed'))
@@ -46,7 +46,13 @@ class RequestLoggingMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
 
+    # Health probes are polled every few seconds; logging them drowns real traffic
+    QUIET_PATHS = ('/healthz', '/readyz')
+
     def __call__(self, request):
+        if request.path in self.QUIET_PATHS:
+            return self.get_response(request)
+
         # Log the request
         logger.info(
             f"Request: {request.method} {request.path} from {request.META.get('REMOTE_ADDR')} "
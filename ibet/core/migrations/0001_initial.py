@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:47
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ledger', models.CharField(max_length=50)),
+                ('owner_id', models.PositiveBigIntegerField()),
+                ('counter', models.CharField(max_length=100)),
+                ('period_start', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('fired', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('ledger', 'owner_id', 'counter', 'period_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CohortSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('persona', models.CharField(max_length=20)),
+                ('institute_id', models.PositiveBigIntegerField(default=0, help_text='0 for every user of the persona')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('category', models.CharField(blank=True, default='', max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('sketch', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('persona', 'institute_id', 'month', 'category')},
+            },
+        ),
+    ]
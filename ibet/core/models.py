@@ -0,0 +1,49 @@
+from decimal import Decimal
+
+from django.db import models
+
+
+class AlertCounter(models.Model):
+    """
+    Running total of one alert counter for one period (see core/alert_rules.py).
+
+    ``fired`` lists the keys of the rules that already fired in this period,
+    so each threshold alerts at most once per period.
+    """
+    ledger = models.CharField(max_length=50)
+    owner_id = models.PositiveBigIntegerField()
+    counter = models.CharField(max_length=100)
+    period_start = models.DateField()
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    fired = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('ledger', 'owner_id', 'counter', 'period_start')
+
+    def __str__(self):
+        return f"{self.ledger}:{self.owner_id} {self.counter} from {self.period_start}: {self.total}"
+
+
+class CohortSketch(models.Model):
+    """
+    Quantile sketch of one cohort's per-user spending in one month (see core/cohorts.py).
+
+    A cohort is the users of one persona, optionally narrowed to the
+    students of one institute (``institute_id=0`` is everyone); ``category=''`` sketches each user's total
+    over all categories.
+    """
+    persona = models.CharField(max_length=20)
+    institute_id = models.PositiveBigIntegerField(default=0, help_text="0 for every user of the persona")
+    month = models.DateField(help_text="First day of the month")
+    category = models.CharField(max_length=100, blank=True, default='')
+    count = models.PositiveIntegerField(default=0)
+    sketch = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('persona', 'institute_id', 'month', 'category')
+
+    def __str__(self):
+        cohort = f"institute {self.institute_id}" if self.institute_id else 'all'
+        return f"{self.persona} {cohort} {self.month:%Y-%m} {self.category or 'ALL'}: {self.count} users"
@@ -0,0 +1,124 @@
+"""
+Response cache for public and reference-data endpoints.
+
+Some endpoints (API root, language list, expense categories, investment
+suggestions, the SPA shell) return the same bytes to every user of a given
+language. Views marked with ``cache_response`` store their rendered body
+and serve it directly on later requests. Entries are keyed by path (never
+the query string, so clients cannot mint new entries by varying it; cached
+views must not read query parameters), active language, negotiated media
+type and the versions of the content they are built from; bumping a content version (``DataVersionService.bump('content',
+name)``, e.g. from a model signal) makes older entries unreachable.
+
+The decorator wraps the handler, not the outer view, so DRF authentication,
+permissions and throttling still run before a cached body is served.
+"""
+import functools
+import hashlib
+from typing import Callable, Iterable, Optional
+
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
+from rest_framework.response import Response
+
+from .data_version import DataVersionService
+
+RESPONSE_PREFIX = 'response'
+DEFAULT_TIMEOUT = 60 * 60
+
+
+def content_version(name: str) -> int:
+    return DataVersionService.get('content', name)
+
+
+def bump_content_version(name: str) -> None:
+    DataVersionService.bump('content', name)
+
+
+def _find_request(args):
+    for arg in args[:2]:
+        if isinstance(arg, HttpRequest) or hasattr(arg, '_request'):
+            return arg
+    raise TypeError("cache_response could not find the request argument")
+
+
+def _cache_key(namespace: str, request, tokens: Iterable, per_path: bool = True) -> str:
+    parts = [
+        request.path if per_path else '',
+        translation.get_language() or '',
+        getattr(request, 'accepted_media_type', '') or '',
+    ]
+    parts.extend(str(token) for token in tokens)
+    digest = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+    return f"{RESPONSE_PREFIX}:{namespace}:{digest}"
+
+
+def _render(request, response):
+    """The response with its body rendered, or None if it cannot be rendered here."""
+    if isinstance(response, Response) and not getattr(response, 'accepted_renderer', None):
+        view = getattr(request, 'parser_context', {}).get('view')
+        if view is None:
+            return None
+        view.finalize_response(request, response)
+    if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+        response.render()
+    return response
+
+
+def cache_response(namespace: str, content: Iterable[str] = (), vary_on: Optional[Callable] = None,
+                   timeout: int = DEFAULT_TIMEOUT, per_path: bool = True):
+    """
+    Cache the rendered body of a GET handler.
+
+    Args:
+        namespace: Prefix for the cache keys of this view
+        content: Content version names the body is built from
+        vary_on: Optional callable receiving the handler's arguments and
+            returning extra key tokens (e.g. a file's modification time)
+        timeout: Seconds an entry is kept
+        per_path: False for views that return the same body on every path
+            they are routed to (one entry instead of one per path)
+
+    Usage:
+        @api_view(['GET'])
+        @cache_response('languages')
+        def get_available_languages(request):
+            ...
+
+        @cache_response('investment_suggestions', content=('investment_suggestions',))
+        def list(self, request, *args, **kwargs):
+            ...
+    """
+    content = tuple(content)
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            request = _find_request(args)
+            if request.method not in ('GET', 'HEAD'):
+                return handler(*args, **kwargs)
+
+            tokens = [f"{name}={content_version(name)}" for name in content]
+            if vary_on:
+                tokens.extend(vary_on(*args, **kwargs))
+            key = _cache_key(namespace, request, tokens, per_path)
+
+            entry = cache.get(key)
+            if entry is not None:
+                status_code, content_type, body = entry
+                response = HttpResponse(body, status=status_code, content_type=content_type)
+                response['X-Response-Cache'] = 'HIT'
+                patch_vary_headers(response, ('Accept-Language',))
+                return response
+
+            response = handler(*args, **kwargs)
+            rendered = _render(request, response)
+            if rendered is not None and rendered.status_code == 200 and not rendered.streaming:
+                cache.set(key, (rendered.status_code, rendered['Content-Type'], rendered.content), timeout)
+                rendered['X-Response-Cache'] = 'MISS'
+                patch_vary_headers(rendered, ('Accept-Language',))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,175 @@
+"""
+Lazily computed dashboard sections with sparse fieldsets.
+
+A dashboard registers each part of its payload as a section provider.
+Clients may ask for ``?sections=wallet,locks`` or ``?fields=wallet_balance``
+and only the providers needed for those are run; without either parameter
+the full payload is built as before.
+
+Providers receive a ``SectionContext`` and return a dict of fields. A
+provider can read another section through ``ctx.get(name)`` if it declares
+it in ``depends``. Sections that write (``writes=True``) or that others
+depend on are computed first in the request thread; the remaining ones are
+independent reads and run through ``core.concurrency.run_concurrently``.
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .concurrency import run_concurrently
+
+
+class UnknownSectionError(ValueError):
+    """Raised when a request names sections or fields that do not exist."""
+
+
+class Section:
+    def __init__(self, name: str, provider: Callable, fields: Tuple[str, ...],
+                 depends: Tuple[str, ...] = (), cache: bool = True, writes: bool = False):
+        self.name = name
+        self.provider = provider
+        self.fields = fields
+        self.depends = depends
+        self.cache = cache
+        self.writes = writes
+
+
+class SectionContext:
+    """
+    Per-request state handed to providers.
+
+    Args:
+        registry: The SectionRegistry being rendered
+        computed: Previously computed section results to reuse (e.g. from a
+            cached snapshot); newly computed cacheable sections are added
+        **attrs: Values providers need, e.g. ``user`` or ``today``
+    """
+
+    def __init__(self, registry, computed: Optional[Dict] = None, **attrs):
+        self.registry = registry
+        self.computed = computed if computed is not None else {}
+        self.fresh = {}
+        self.__dict__.update(attrs)
+
+    def get(self, name: str) -> Dict:
+        if name in self.fresh:
+            return self.fresh[name]
+        if name in self.computed:
+            return self.computed[name]
+        section = self.registry.sections[name]
+        result = section.provider(self)
+        self.fresh[name] = result
+        if section.cache:
+            self.computed[name] = result
+        return result
+
+
+class SectionRegistry:
+    """
+    Ordered set of dashboard sections.
+
+    Usage:
+        sections = SectionRegistry()
+
+        @sections.register('wallet', fields=('wallet_balance',))
+        def wallet_section(ctx):
+            return {'wallet_balance': ...}
+    """
+
+    def __init__(self):
+        self.sections = OrderedDict()
+
+    def register(self, name: str, fields: Iterable[str], depends: Iterable[str] = (),
+                 cache: bool = True, writes: bool = False):
+        def decorator(provider):
+            self.sections[name] = Section(name, provider, tuple(fields), tuple(depends), cache, writes)
+            return provider
+        return decorator
+
+    def select(self, query_params) -> Tuple[List[str], Optional[set]]:
+        """
+        Work out which sections and fields a request asks for.
+
+        Args:
+            query_params: Request query parameters
+
+        Returns:
+            (section names in registry order, requested fields or None for all)
+
+        Raises:
+            UnknownSectionError: For names that are not registered
+        """
+        requested_sections = _split(query_params.get('sections'))
+        requested_fields = _split(query_params.get('fields'))
+
+        unknown = [name for name in requested_sections if name not in self.sections]
+        field_owner = {field: s.name for s in self.sections.values() for field in s.fields}
+        unknown += [field for field in requested_fields if field not in field_owner]
+        if unknown:
+            raise UnknownSectionError(', '.join(unknown))
+
+        if not requested_sections and not requested_fields:
+            return list(self.sections), None
+
+        wanted = set(requested_sections) | {field_owner[field] for field in requested_fields}
+        names = [name for name in self.sections if name in wanted]
+        fields = None
+        if requested_fields:
+            fields = set(requested_fields)
+            for name in requested_sections:
+                fields.update(self.sections[name].fields)
+        return names, fields
+
+    def _with_dependencies(self, names: Iterable[str]) -> List[str]:
+        ordered = []
+
+        def visit(name):
+            if name in ordered:
+                return
+            for dep in self.sections[name].depends:
+                visit(dep)
+            ordered.append(name)
+
+        for name in names:
+            visit(name)
+        return ordered
+
+    def render(self, ctx: SectionContext, names: Iterable[str], fields: Optional[set] = None) -> Dict:
+        """
+        Compute the named sections and merge their fields.
+
+        Args:
+            ctx: Context for this request
+            names: Section names to include in the output
+            fields: Optional subset of fields to return
+
+        Returns:
+            Merged payload dict
+        """
+        names = list(names)
+        ordered = self._with_dependencies(names)
+        dependencies = {dep for name in ordered for dep in self.sections[name].depends}
+
+        # Writers and shared dependencies first, in dependency order
+        for name in ordered:
+            if self.sections[name].writes or name in dependencies:
+                ctx.get(name)
+
+        pending = [name for name in ordered if name not in ctx.fresh and name not in ctx.computed]
+        results = run_concurrently({name: (lambda n=name: self.sections[n].provider(ctx)) for name in pending})
+        for name, result in results.items():
+            ctx.fresh[name] = result
+            if self.sections[name].cache:
+                ctx.computed[name] = result
+
+        payload = {}
+        for name in names:
+            payload.update(ctx.get(name))
+        if fields is not None:
+            payload = {key: value for key, value in payload.items() if key in fields}
+        return payload
+
+
+def _split(value) -> List[str]:
+    if not value:
+        return []
+    return [part.strip() for part in value.split(',') if part.strip()]
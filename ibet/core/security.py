@@ -318,8 +318,13 @@ class RateLimitService:
             SecurityUtils.log_security_event('suspicious_activity', user_id, {'action': action})
             return True
 
-        # Increment counter
-        cache.set(cache_key, recent_count + 1, timeout=3600)  # 1 hour
+        # Increment counter atomically so concurrent workers don't lose hits
+        cache.add(cache_key, 0, timeout=3600)  # 1 hour
+        try:
+            cache.incr(cache_key)
+        except ValueError:
+            # Expired between add and incr
+            cache.set(cache_key, 1, timeout=3600)
         return False
 
     @staticmethod
@@ -174,8 +174,13 @@ class SecurityEventManager:
             )
             return True
 
-        # Increment counter
-        cache.set(cache_key, current_count + 1, timeout=time_window_minutes * 60)
+        # Increment counter atomically so concurrent workers don't lose hits
+        cache.add(cache_key, 0, timeout=time_window_minutes * 60)
+        try:
+            cache.incr(cache_key)
+        except ValueError:
+            # Expired between add and incr
+            cache.set(cache_key, 1, timeout=time_window_minutes * 60)
         return False
 
     @classmethod
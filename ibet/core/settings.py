@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,6 +47,7 @@ INSTALLED_APPS = [
     'django_otp.plugins.otp_totp',
     'modeltranslation',
     # Local apps
+    'core',
     'student_module',
     'parent_module',
     'individual_module',
@@ -189,6 +192,45 @@ THROTTLE_RATES = {
     'burst': '2000/minute',  # Very relaxed for testing
 }
 
+# Caches. The shared tier is a SQLite file in WAL mode that every worker
+# process on the host opens, so OTPs, throttles and security counters agree
+# across workers. The default cache keeps a small per-process LRU in front
+# of it (core/cache_backends.py); OTP, throttle and security keys skip the
+# local tier so a used OTP or a new throttle hit is seen by every worker at once.
+CACHE_SQLITE_PATH = os.environ.get('IBET_CACHE_PATH', str(BASE_DIR / 'cache.sqlite3'))
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache_backends.TwoTierCache',
+        'OPTIONS': {
+            'SHARED': 'shared',
+            'LOCAL_MAX_ENTRIES': 2048,
+            'LOCAL_TIMEOUT': 5,
+            'LOCAL_EXCLUDE_PREFIXES': ('otp_', 'throttle_', 'suspicious', 'security_event_'),
+        },
+    },
+    'shared': {
+        'BACKEND': 'core.cache_backends.SQLiteCache',
+        'LOCATION': CACHE_SQLITE_PATH,
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+# Tests run against the same cache stack on a throwaway file, so every run
+# starts empty without touching the development cache
+if 'test' in sys.argv and 'IBET_CACHE_PATH' not in os.environ:
+    import atexit
+    import shutil
+    import tempfile
+
+    _test_cache_dir = tempfile.mkdtemp(prefix='ibet-test-cache-')
+    atexit.register(shutil.rmtree, _test_cache_dir, ignore_errors=True)
+    CACHES['shared']['LOCATION'] = os.path.join(_test_cache_dir, 'cache.sqlite3')
+
+# Backend for the per-user SSE event channel (core/events.py). Events go
+# through the shared cache so every worker process sees them; a single
+# worker may use 'core.events.InProcessEventBackend' for instant wake-ups.
+EVENT_BUS_BACKEND = 'core.events.CacheEventBackend'
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
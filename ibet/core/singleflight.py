@@ -0,0 +1,116 @@
+"""
+Single-flight cache fills for expensive aggregates.
+
+At the midnight rollover and after deploys many clients miss the cache for
+the same key at once. ``single_flight`` lets the first of them compute the
+value while the others either get the previous (stale) value or wait
+briefly for the fresh one. Values are refreshed early with probability
+rising towards expiry (XFetch), weighted by how long they took to compute,
+so entries written together do not all expire together.
+"""
+import logging
+import math
+import random
+import time
+from collections import namedtuple
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT = 30
+WAIT_SECONDS = getattr(settings, 'SINGLE_FLIGHT_WAIT_SECONDS', 2.0)
+POLL_SECONDS = 0.05
+STALE_SECONDS = getattr(settings, 'SINGLE_FLIGHT_STALE_SECONDS', 5 * 60)
+
+# Cached envelope: the value, when it stops being fresh, and how long it
+# took to compute (seconds)
+Entry = namedtuple('Entry', ('value', 'expires', 'delta'))
+
+
+def _lock_key(key: str) -> str:
+    return f"{key}:lock"
+
+
+def acquire(key: str, lock_timeout: int = LOCK_TIMEOUT) -> bool:
+    """Try to become the one request filling ``key``."""
+    return cache.add(_lock_key(key), 1, lock_timeout)
+
+
+def release(key: str) -> None:
+    cache.delete(_lock_key(key))
+
+
+def wait_for(key: str, predicate: Callable[[Any], bool], wait: float = WAIT_SECONDS) -> Optional[Any]:
+    """
+    Poll ``key`` until another request has filled it.
+
+    Args:
+        key: Cache key being filled
+        predicate: Accepts the cached value once it is usable
+        wait: Seconds to wait before giving up
+
+    Returns:
+        The cached value, or None if it did not appear in time
+    """
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        value = cache.get(key)
+        if value is not None and predicate(value):
+            return value
+        if cache.get(_lock_key(key)) is None:
+            # Filler finished or failed without producing a usable value
+            break
+        time.sleep(POLL_SECONDS)
+    return None
+
+
+def _should_refresh(entry: Entry, beta: float) -> bool:
+    # XFetch: -log(U) is exponentially distributed, so the chance of an early
+    # refresh grows as expiry approaches and with slower computations.
+    return time.time() - entry.delta * beta * math.log(1.0 - random.random()) >= entry.expires
+
+
+def single_flight(key: str, compute: Callable[[], Any], timeout: int,
+                  stale_timeout: int = STALE_SECONDS, beta: float = 1.0) -> Any:
+    """
+    Return the cached value for ``key``, computing it at most once at a time.
+
+    Args:
+        key: Cache key
+        compute: Zero-argument callable producing the value
+        timeout: Seconds the value stays fresh
+        stale_timeout: Extra seconds a stale value may be served while
+            another request recomputes it
+        beta: XFetch aggressiveness; higher refreshes earlier
+
+    Returns:
+        The fresh, stale or newly computed value
+    """
+    entry = cache.get(key)
+    if not isinstance(entry, Entry):
+        entry = None
+    if entry is not None and not _should_refresh(entry, beta):
+        return entry.value
+
+    if acquire(key):
+        try:
+            started = time.monotonic()
+            value = compute()
+            delta = time.monotonic() - started
+            cache.set(key, Entry(value, time.time() + timeout, delta), timeout + stale_timeout)
+            return value
+        finally:
+            release(key)
+
+    if entry is not None:
+        # Someone else is refreshing; the previous value is still usable
+        return entry.value
+
+    entry = wait_for(key, lambda e: isinstance(e, Entry))
+    if entry is not None:
+        return entry.value
+    logger.info(f"single_flight: computing {key} without the lock after waiting")
+    return compute()
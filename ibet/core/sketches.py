@@ -0,0 +1,108 @@
+"""
+Mergeable quantile sketches.
+
+``KLLSketch`` (Karnin, Lang & Liberty, "Optimal Quantile Approximation in
+Streams", 2016) summarises a stream of numbers in O(k) space: level ``h``
+holds items that each stand for 2**h original items, and a full level is
+sorted and every other item promoted to the next level. Two sketches are
+merged by concatenating their levels and compacting again, so sketches
+built separately (per institute, per batch) combine into one. Rank errors
+are around 1.7/k of the stream length; sketches of fewer than ``k`` items
+are exact.
+"""
+import math
+import random
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+
+
+class KLLSketch:
+    DEFAULT_K = 200
+    # Capacity shrinks by this factor per level below the top
+    C = 2 / 3
+
+    def __init__(self, k: int = DEFAULT_K, seed: Optional[int] = None):
+        self.k = k
+        self.n = 0
+        self.levels: List[List[float]] = [[]]
+        self._random = random.Random(seed)
+
+    def __len__(self):
+        return self.n
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return int(math.ceil(self.k * self.C ** depth)) + 1
+
+    def _size(self) -> int:
+        return sum(len(items) for items in self.levels)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self.levels)))
+
+    def _compress(self) -> None:
+        while self._size() > self._max_size():
+            for level, items in enumerate(self.levels):
+                if len(items) >= self._capacity(level):
+                    if level + 1 == len(self.levels):
+                        self.levels.append([])
+                    items.sort()
+                    # Odd counts keep their largest item at this level
+                    keep = [items.pop()] if len(items) % 2 else []
+                    offset = self._random.randint(0, 1)
+                    self.levels[level + 1].extend(items[offset::2])
+                    self.levels[level] = keep
+                    break
+
+    def update(self, value: float) -> None:
+        self.levels[0].append(float(value))
+        self.n += 1
+        self._compress()
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Fold ``other`` into this sketch (in place) and return it."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.n += other.n
+        self._compress()
+        return self
+
+    def rank(self, value: float, inclusive: bool = False) -> float:
+        """Estimated fraction of items below ``value`` (or at most, with ``inclusive``)."""
+        if not self.n:
+            return 0.0
+        find = bisect_right if inclusive else bisect_left
+        weight = 0
+        for level, items in enumerate(self.levels):
+            weight += find(sorted(items), value) << level
+        return min(weight / self.n, 1.0)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated item at rank ``q`` (0..1), or None for an empty sketch."""
+        weighted = sorted((item, 1 << level) for level, items in enumerate(self.levels) for item in items)
+        if not weighted:
+            return None
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+        seen = 0
+        for item, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return item
+        return weighted[-1][0]
+
+    def to_dict(self) -> Dict:
+        return {'k': self.k, 'n': self.n, 'levels': [sorted(items) for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'KLLSketch':
+        sketch = cls(k=data['k'])
+        sketch.n = data['n']
+        sketch.levels = [list(items) for items in data['levels']] or [[]]
+        return sketch
@@ -1,5 +1,6 @@
 import json
-from django.test import TestCase, RequestFactory, override_settings
+import os
+from django.test import TestCase, TransactionTestCase, RequestFactory, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.http import HttpResponse
@@ -245,3 +246,969 @@ class MiddlewareIntegrationTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('X-Content-Type-Options', response)
         self.assertIn('X-Frame-Options', response)
+
+
+class DataVersionTests(TestCase):
+    """Test per-scope data versions and version-keyed memoization"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username='versionuser', password='password123')
+
+    def test_bump_increases_version(self):
+        from .data_version import DataVersionService
+        before = DataVersionService.get('user', self.user.pk)
+        DataVersionService.bump('user', self.user.pk)
+        self.assertGreater(DataVersionService.get('user', self.user.pk), before)
+
+    def test_unknown_scope_rejected(self):
+        from .data_version import DataVersionService
+        with self.assertRaises(ValueError):
+            DataVersionService.get('household', 1)
+
+    def test_memoized_result_recomputed_after_bump(self):
+        from .data_version import DataVersionService, versioned_memoize
+        calls = []
+
+        @versioned_memoize('user', key=lambda user: user.pk)
+        def total(user):
+            calls.append(user.pk)
+            return len(calls)
+
+        self.assertEqual(total(self.user), 1)
+        self.assertEqual(total(self.user), 1)
+        DataVersionService.bump('user', self.user.pk)
+        self.assertEqual(total(self.user), 2)
+
+    def test_ledger_write_bumps_linked_parent(self):
+        from decimal import Decimal
+        from student_module.models import ParentStudentLink, Wallet
+        from .data_version import DataVersionService
+        parent = get_user_model().objects.create_user(username='versionparent', password='password123')
+        ParentStudentLink.objects.create(parent=parent, student=self.user)
+        before = DataVersionService.get('user', parent.pk)
+        Wallet.objects.create(user=self.user, balance=Decimal('10.00'))
+        self.assertGreater(DataVersionService.get('user', parent.pk), before)
+
+
+class ConditionalGetTests(APITestCase):
+    """Test ETag revalidation on polled statement endpoints"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='etaguser', password='password123', persona='STUDENT')
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/student/wallet/statement/'
+
+    def test_matching_etag_returns_not_modified(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertTrue(first['ETag'].startswith('W/'))
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_ledger_write_changes_etag(self):
+        from decimal import Decimal
+        from student_module.models import Wallet
+        first = self.client.get(self.url)
+        Wallet.objects.create(user=self.user, balance=Decimal('5.00'))
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+
+class EventStreamTests(TestCase):
+    """Test the per-user event channel and its SSE endpoint"""
+
+    def setUp(self):
+        from rest_framework.authtoken.models import Token
+        self.user = get_user_model().objects.create_user(username='streamuser', password='password123')
+        self.token = Token.objects.create(user=self.user)
+
+    def test_in_process_backend_cursor(self):
+        from .events import InProcessEventBackend, EventTypes
+        backend = InProcessEventBackend()
+        first = backend.publish(self.user.pk, EventTypes.BALANCE)
+        second = backend.publish(self.user.pk, EventTypes.LOCK)
+        self.assertEqual([e['type'] for e in backend.events_since(self.user.pk, first['id'])], [EventTypes.LOCK])
+        self.assertEqual(backend.latest_id(self.user.pk), second['id'])
+
+    def test_publish_waits_for_commit(self):
+        from decimal import Decimal
+        from student_module.models import Wallet
+        from .events import get_event_backend, EventTypes
+        backend = get_event_backend()
+        cursor = backend.latest_id(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Wallet.objects.create(user=self.user, balance=Decimal('1.00'))
+        self.assertEqual(backend.events_since(self.user.pk, cursor), [])
+        for callback in callbacks:
+            callback()
+        self.assertIn(EventTypes.BALANCE, [e['type'] for e in backend.events_since(self.user.pk, cursor)])
+
+    def test_stream_requires_authentication(self):
+        response = self.client.get('/api/events/stream/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_cache_backend_keeps_concurrent_events(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from .events import CacheEventBackend, EventTypes
+        backend = CacheEventBackend()
+        cursor = backend.latest_id(self.user.pk)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: backend.publish(self.user.pk, EventTypes.BALANCE), range(20)))
+        events = backend.events_since(self.user.pk, cursor)
+        self.assertEqual(len(events), 20)
+        self.assertEqual([e['id'] for e in events], sorted(e['id'] for e in events))
+        self.assertEqual(backend.events_since(self.user.pk, events[-1]['id']), [])
+
+    def test_ticket_is_single_use(self):
+        from .views_events import issue_stream_ticket, redeem_stream_ticket
+        ticket = issue_stream_ticket(self.user)
+        self.assertEqual(redeem_stream_ticket(ticket), self.user.pk)
+        self.assertIsNone(redeem_stream_ticket(ticket))
+        self.assertIsNone(redeem_stream_ticket(ticket + 'x'))
+
+    def test_stream_disabled_under_wsgi(self):
+        from .views_events import issue_stream_ticket
+        response = self.client.post('/api/events/ticket/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()['ticket'])
+        response = self.client.get(f'/api/events/stream/?ticket={issue_stream_ticket(self.user)}')
+        self.assertEqual(response.status_code, 204)
+
+    async def test_stream_opens_with_ticket(self):
+        from asgiref.sync import sync_to_async
+        from django.test import AsyncClient
+        from .views_events import issue_stream_ticket
+        client = AsyncClient()
+        # The auth token itself is not accepted in the URL
+        response = await client.get(f'/api/events/stream/?token={self.token.key}')
+        self.assertEqual(response.status_code, 401)
+
+        ticket = await sync_to_async(issue_stream_ticket)(self.user)
+        response = await client.get(f'/api/events/stream/?ticket={ticket}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = response.streaming_content.__aiter__()
+        self.assertTrue((await chunks.__anext__()).startswith(b'retry:'))
+        self.assertIn(b'event: ready', await chunks.__anext__())
+        await chunks.aclose()
+
+
+class RunConcurrentlyTests(TestCase):
+    """Test concurrent evaluation of independent dashboard reads"""
+
+    def test_runs_in_pool_threads_when_allowed(self):
+        import threading
+        from . import concurrency
+        with patch.object(concurrency, '_can_run_concurrently', return_value=True):
+            results = concurrency.run_concurrently({
+                'a': lambda: threading.current_thread().name,
+                'b': lambda: 2,
+            })
+        self.assertTrue(results['a'].startswith('dashboard-query'))
+        self.assertEqual(results['b'], 2)
+
+    def test_sequential_inside_transaction(self):
+        import threading
+        from .concurrency import run_concurrently
+        # TestCase wraps each test in a transaction
+        results = run_concurrently({
+            'a': lambda: threading.current_thread().name,
+            'b': lambda: get_user_model().objects.count(),
+        })
+        self.assertEqual(results['a'], threading.current_thread().name)
+        self.assertEqual(results['b'], 0)
+
+
+class RunConcurrentlyQueryTests(TransactionTestCase):
+    """Test ORM queries on the pool threads' own connections"""
+
+    def tearDown(self):
+        from . import concurrency
+        concurrency.shutdown()
+
+    def test_queries_reuse_worker_connections(self):
+        import threading
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+        from . import concurrency
+
+        User = get_user_model()
+        User.objects.create_user(username='pool1', password='x')
+        User.objects.create_user(username='pool2', is_staff=True, password='x')
+
+        def query(**filters):
+            return lambda: (User.objects.filter(**filters).count(), threading.current_thread().name)
+
+        # The in-memory test database ignores close(), so watch the calls instead
+        with patch.object(concurrency, '_can_run_concurrently', return_value=True), \
+                patch.object(DatabaseWrapper, 'close', autospec=True, side_effect=DatabaseWrapper.close) as close:
+            rounds = [
+                concurrency.run_concurrently({'all': query(), 'staff': query(is_staff=True)})
+                for _ in range(3)
+            ]
+            self.assertEqual([(r['all'][0], r['staff'][0]) for r in rounds], [(2, 1)] * 3)
+            self.assertTrue(all(r['all'][1].startswith('dashboard-query') for r in rounds))
+            self.assertEqual(close.call_count, 0)
+            workers = set(concurrency._worker_connections)
+
+            concurrency.shutdown()
+        self.assertEqual({call.args[0] for call in close.call_args_list}, workers)
+        self.assertEqual(concurrency._worker_connections, set())
+
+
+class SectionRegistryTests(TestCase):
+    """Test lazily computed dashboard sections"""
+
+    def setUp(self):
+        from .sections import SectionRegistry
+        self.calls = []
+        self.registry = SectionRegistry()
+
+        @self.registry.register('base', fields=('limit',))
+        def base(ctx):
+            self.calls.append('base')
+            return {'limit': 10}
+
+        @self.registry.register('usage', fields=('spent', 'remaining'), depends=('base',))
+        def usage(ctx):
+            self.calls.append('usage')
+            return {'spent': 4, 'remaining': ctx.get('base')['limit'] - 4}
+
+        @self.registry.register('clock', fields=('now',), cache=False)
+        def clock(ctx):
+            self.calls.append('clock')
+            return {'now': 'noon'}
+
+    def render(self, params, computed=None):
+        from .sections import SectionContext
+        names, fields = self.registry.select(params)
+        return self.registry.render(SectionContext(self.registry, computed=computed), names, fields)
+
+    def test_all_sections_by_default(self):
+        self.assertEqual(self.render({}), {'limit': 10, 'spent': 4, 'remaining': 6, 'now': 'noon'})
+
+    def test_only_requested_sections_are_computed(self):
+        self.assertEqual(self.render({'sections': 'clock'}), {'now': 'noon'})
+        self.assertEqual(self.calls, ['clock'])
+
+    def test_fields_pull_dependencies_but_return_only_fields(self):
+        self.assertEqual(self.render({'fields': 'remaining'}), {'remaining': 6})
+        self.assertEqual(sorted(self.calls), ['base', 'usage'])
+
+    def test_computed_sections_are_reused_except_uncached(self):
+        computed = {}
+        self.render({}, computed)
+        self.calls.clear()
+        self.render({}, computed)
+        self.assertEqual(self.calls, ['clock'])
+        self.assertNotIn('clock', computed)
+
+    def test_unknown_names_are_rejected(self):
+        from .sections import UnknownSectionError
+        with self.assertRaises(UnknownSectionError):
+            self.registry.select({'sections': 'base,nope'})
+
+
+class SingleFlightTests(TestCase):
+    """Test stampede protection for cached aggregates"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_value_computed_once_while_fresh(self):
+        from .singleflight import single_flight
+        calls = []
+        compute = lambda: calls.append(1) or len(calls)
+        self.assertEqual(single_flight('sf:fresh', compute, 60), 1)
+        self.assertEqual(single_flight('sf:fresh', compute, 60), 1)
+        self.assertEqual(len(calls), 1)
+
+    def test_stale_value_served_while_another_request_refreshes(self):
+        from django.core.cache import cache
+        from . import singleflight
+        cache.set('sf:stale', singleflight.Entry('old', 0, 0.1), 60)
+        singleflight.acquire('sf:stale')
+        self.assertEqual(singleflight.single_flight('sf:stale', lambda: 'new', 60), 'old')
+        singleflight.release('sf:stale')
+        self.assertEqual(singleflight.single_flight('sf:stale', lambda: 'new', 60), 'new')
+
+    def test_waiter_gets_value_filled_by_leader(self):
+        import threading
+        from django.core.cache import cache
+        from . import singleflight
+        singleflight.acquire('sf:wait')
+
+        def fill():
+            cache.set('sf:wait', singleflight.Entry('filled', 1e12, 0.1), 60)
+            singleflight.release('sf:wait')
+
+        timer = threading.Timer(0.1, fill)
+        timer.start()
+        self.assertEqual(singleflight.single_flight('sf:wait', lambda: 'own', 60), 'filled')
+        timer.join()
+
+    def test_early_refresh_near_expiry(self):
+        import time
+        from .singleflight import Entry, _should_refresh
+        self.assertFalse(_should_refresh(Entry(1, time.time() + 3600, 0.01), 1.0))
+        self.assertTrue(_should_refresh(Entry(1, time.time() - 1, 0.01), 1.0))
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+    'twotier-shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'twotier-shared'},
+})
+class TwoTierCacheTests(TestCase):
+    """Test the per-process LRU in front of a shared cache"""
+
+    def make_cache(self, **options):
+        from .cache_backends import TwoTierCache
+        options.setdefault('SHARED', 'twotier-shared')
+        return TwoTierCache('', {'OPTIONS': options})
+
+    def setUp(self):
+        from django.core.cache import caches
+        self.shared = caches['twotier-shared']
+        self.shared.clear()
+
+    def test_local_hit_skips_shared_tier(self):
+        cache = self.make_cache()
+        cache.set('token:abc', {'user_id': 1}, 60)
+        with patch.object(self.shared, 'get', side_effect=AssertionError('shared tier read')):
+            self.assertEqual(cache.get('token:abc'), {'user_id': 1})
+
+    def test_local_copy_is_not_shared_with_callers(self):
+        cache = self.make_cache()
+        rows = [{'id': 1}]
+        cache.set('rows', rows, 60)
+        rows.append({'id': 2})
+        first = cache.get('rows')
+        first[0]['id'] = 99
+        self.assertEqual(cache.get('rows'), [{'id': 1}])
+
+    def test_stale_local_copy_detected_by_stamp(self):
+        worker_a = self.make_cache(LOCAL_TIMEOUT=0)
+        worker_b = self.make_cache(LOCAL_TIMEOUT=0)
+        worker_a.set('link:1', 'old', 60)
+        self.assertEqual(worker_b.get('link:1'), 'old')
+        worker_a.set('link:1', 'new', 60)
+        self.assertEqual(worker_b.get('link:1'), 'new')
+        worker_a.delete('link:1')
+        self.assertIsNone(worker_b.get('link:1'))
+
+    def test_local_tier_is_bounded(self):
+        cache = self.make_cache(LOCAL_MAX_ENTRIES=2)
+        for i in range(3):
+            cache.set(f'k{i}', str(i), 60)
+        self.assertEqual(list(cache._local), [('k1', None), ('k2', None)])
+        self.assertEqual(cache.get('k0'), '0')
+
+    def test_counters_always_read_from_shared_tier(self):
+        worker_a = self.make_cache()
+        worker_b = self.make_cache()
+        worker_a.add('throttle:1', 0, 60)
+        self.assertEqual(worker_b.get('throttle:1'), 0)
+        worker_a.incr('throttle:1')
+        self.assertEqual(worker_b.get('throttle:1'), 1)
+        self.assertFalse(worker_b.add('throttle:1', 0, 60))
+
+
+def _sqlite_cache_worker(path, rounds):
+    from .cache_backends import SQLiteCache
+    cache = SQLiteCache(path, {})
+    for _ in range(rounds):
+        cache.incr('hits')
+    cache.set(f'otp_{os.getpid()}', {'otp': '123456'}, 60)
+
+
+class SQLiteCacheTests(TestCase):
+    """Test the SQLite-backed cache shared by worker processes"""
+
+    def setUp(self):
+        import tempfile
+        from .cache_backends import SQLiteCache
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'cache.sqlite3')
+        self.cache = SQLiteCache(self.path, {})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_basic_operations_and_expiry(self):
+        self.cache.set('a', {'x': 1}, 60)
+        self.assertEqual(self.cache.get('a'), {'x': 1})
+        self.assertFalse(self.cache.add('a', 'other', 60))
+        self.cache.set('gone', 1, -1)
+        self.assertIsNone(self.cache.get('gone'))
+        self.assertTrue(self.cache.add('gone', 2, 60))
+        self.assertTrue(self.cache.delete('a'))
+        self.assertFalse(self.cache.has_key('a'))
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+
+    def test_sweep_removes_expired_rows(self):
+        import sqlite3
+        self.cache._sweep_interval = 0
+        self.cache.set('old', 'v', -1)
+        self.cache.set('new', 'v', 60)
+        rows = sqlite3.connect(self.path).execute('SELECT cache_key FROM cache_entries').fetchall()
+        self.assertEqual([r[0] for r in rows], [self.cache.make_key('new')])
+
+    def test_close_releases_connection(self):
+        import sqlite3
+        self.cache.set('a', 1, 60)
+        conn = self.cache._connection()
+        self.cache.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute('SELECT 1')
+        self.assertEqual(self.cache.get('a'), 1)
+
+    def test_counters_and_values_shared_across_processes(self):
+        import multiprocessing
+        self.cache.add('hits', 0, 60)
+        ctx = multiprocessing.get_context('fork')
+        workers = [ctx.Process(target=_sqlite_cache_worker, args=(self.path, 50)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+            self.assertEqual(worker.exitcode, 0)
+        self.assertEqual(self.cache.get('hits'), 200)
+        for worker in workers:
+            self.assertEqual(self.cache.get(f'otp_{worker.pid}'), {'otp': '123456'})
+
+
+class BatchLoaderTests(TestCase):
+    """Test batched serializer method fields"""
+
+    def setUp(self):
+        from rest_framework import serializers
+        from .loaders import BatchListSerializer, BatchLoader, BatchMethodField
+
+        self.batches = []
+        batches = self.batches
+
+        class SquareLoader(BatchLoader):
+            def batch_load(self, keys):
+                batches.append(sorted(keys))
+                return {key: key * key for key in keys}
+
+        class RowSerializer(serializers.Serializer):
+            n = serializers.IntegerField()
+            square = BatchMethodField(SquareLoader, key='n')
+            square_label = BatchMethodField(SquareLoader, key='n')
+
+            def get_square_label(self, obj, square):
+                return f"{obj['n']}^2={square}"
+
+            class Meta:
+                list_serializer_class = BatchListSerializer
+
+        self.serializer_class = RowSerializer
+
+    def test_list_resolves_keys_in_one_batch(self):
+        data = self.serializer_class([{'n': 1}, {'n': 2}, {'n': 3}], many=True).data
+        self.assertEqual([row['square'] for row in data], [1, 4, 9])
+        self.assertEqual(data[1]['square_label'], '2^2=4')
+        self.assertEqual(self.batches, [[1, 2, 3]])
+
+    def test_loader_shared_across_serializers_in_request(self):
+        request = RequestFactory().get('/')
+        self.serializer_class([{'n': 2}], many=True, context={'request': request}).data
+        self.serializer_class({'n': 2}, context={'request': request}).data
+        self.assertEqual(self.batches, [[2]])
+
+
+class TimeSeriesTests(APITestCase):
+    """Test dense bucketed rollups"""
+
+    def setUp(self):
+        from datetime import date
+        from decimal import Decimal
+        from individual_module.models import IndividualExpense
+
+        self.user = get_user_model().objects.create_user(username='series', password='testpass123')
+        for day, amount, category in [(date(2025, 1, 3), '10.00', 'FOOD'), (date(2025, 1, 3), '5.00', 'TRANSPORT'),
+                                      (date(2025, 3, 20), '7.50', 'FOOD')]:
+            IndividualExpense.objects.create(user=self.user, amount=Decimal(amount), category=category, expense_date=day)
+
+    def test_month_buckets_are_dense(self):
+        from datetime import date
+        from .timeseries import metrics
+
+        with self.assertNumQueries(1):
+            points = metrics.get('individual.expenses').series(self.user, 'month', date(2025, 1, 15), date(2025, 4, 10), split=True)
+        self.assertEqual([p['start'] for p in points], [date(2025, 1, 1), date(2025, 2, 1), date(2025, 3, 1), date(2025, 4, 1)])
+        self.assertEqual([float(p['total']) for p in points], [15.0, 0.0, 7.5, 0.0])
+        self.assertEqual(points[0]['count'], 2)
+        self.assertEqual(points[-1]['end'], date(2025, 4, 10))
+        self.assertEqual({k: float(v) for k, v in points[0]['split'].items()}, {'FOOD': 10.0, 'TRANSPORT': 5.0})
+
+    def test_bucket_helpers(self):
+        from datetime import date
+        from .timeseries import InvalidSeriesError, bucket_starts, shift
+
+        self.assertEqual(shift(date(2024, 12, 1), 'month'), date(2025, 1, 1))
+        self.assertEqual(shift(date(2025, 1, 1), 'month', -1), date(2024, 12, 1))
+        self.assertEqual(bucket_starts(date(2025, 1, 1), date(2025, 1, 14), 'week'),
+                         [date(2024, 12, 30), date(2025, 1, 6), date(2025, 1, 13)])
+        with self.assertRaises(InvalidSeriesError):
+            bucket_starts(date(2000, 1, 1), date(2025, 1, 1), 'day')
+
+    def test_endpoint(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('timeseries', args=['individual.expenses'])
+        response = self.client.get(url, {'bucket': 'week', 'start': '2025-01-01', 'end': '2025-01-14'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['start'], '2024-12-30')
+        self.assertEqual([p['total'] for p in response.data['points']], [15.0, 0.0, 0.0])
+
+        self.assertEqual(self.client.get(url, {'bucket': 'hour'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse('timeseries', args=['nope'])).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_year_heatmap(self):
+        url = reverse('timeseries-heatmap', args=['individual.expenses'])
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url, {'year': '2025'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        days = response.data['days']
+        self.assertEqual(len(days), 365)
+        self.assertEqual(days[2], 1500)
+        self.assertEqual(days[31 + 28 + 19], 750)
+        self.assertEqual(sum(days), 2250)
+        food = int(response.data['categories']['FOOD'], 16)
+        self.assertEqual([i for i in range(365) if food >> i & 1], [2, 78])
+
+        # Cached until the user's data changes
+        with self.assertNumQueries(0):
+            self.client.get(url, {'year': '2025'})
+        self.assertEqual(self.client.get(url, {'year': 'abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class HealthTests(TestCase):
+    """Test health probes and cached system statistics"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_healthz_does_not_touch_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/healthz')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok'})
+
+    def test_readyz(self):
+        self.assertEqual(self.client.get('/readyz').status_code, 200)
+        with patch('core.views.check_database', return_value=(False, 'down')):
+            response = self.client.get('/readyz')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['database'], 'down')
+
+    def test_stats_are_cached(self):
+        get_user_model().objects.create_user(username='stats1', password='testpass123')
+        response = self.client.get(reverse('system_stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['statistics']['total_users'], 1)
+
+        get_user_model().objects.create_user(username='stats2', password='testpass123')
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('system_stats'))
+        self.assertEqual(response.data['statistics']['total_users'], 1)
+
+        response = self.client.get(reverse('api_status'))
+        self.assertEqual(response.data['database'], 'connected')
+        self.assertEqual(response.data['statistics']['total_users'], 1)
+
+    def test_large_tables_use_estimates(self):
+        from .health import SystemStatsService
+
+        with patch('core.health.approximate_count', return_value=250000):
+            stats = SystemStatsService.refresh()
+        self.assertEqual(stats['counts']['total_users'], 250000)
+        self.assertIn('total_users', stats['approximate'])
+
+
+class ResponseCacheTests(APITestCase):
+    """Test the response cache for reference-data endpoints"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='refdata', password='testpass123')
+
+    def test_languages_cached_per_language(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('get_available_languages')
+        first = self.client.get(url, HTTP_ACCEPT_LANGUAGE='en')
+        self.assertEqual(first['X-Response-Cache'], 'MISS')
+        second = self.client.get(url, HTTP_ACCEPT_LANGUAGE='en')
+        self.assertEqual(second['X-Response-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertIn('Accept-Language', second['Vary'])
+
+        from django.utils import translation
+        from .response_cache import _cache_key
+        request = RequestFactory().get(url)
+        with translation.override('ta'):
+            tamil_key = _cache_key('languages', request, [])
+        with translation.override('en'):
+            self.assertNotEqual(_cache_key('languages', request, []), tamil_key)
+
+    def test_cached_body_still_requires_authentication(self):
+        url = reverse('get_available_languages')
+        self.client.force_authenticate(user=self.user)
+        self.client.get(url)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_investment_suggestions_follow_content_version(self):
+        from individual_module.models import InvestmentSuggestion
+
+        self.client.force_authenticate(user=self.user)
+        url = '/api/individual/investment-suggestions/'
+        InvestmentSuggestion.objects.create(
+            title='Gold', plan_type='GOLD', description='d', benefits='b', risk_level='Low',
+            minimum_investment=500, current_scenario_analysis='c'
+        )
+        self.assertEqual(len(json.loads(self.client.get(url).content)), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url)['X-Response-Cache'], 'HIT')
+
+        InvestmentSuggestion.objects.create(
+            title='FD', plan_type='FD', description='d', benefits='b', risk_level='Low',
+            minimum_investment=500, current_scenario_analysis='c'
+        )
+        response = self.client.get(url)
+        self.assertEqual(response['X-Response-Cache'], 'MISS')
+        self.assertEqual(len(json.loads(response.content)), 2)
+
+    def test_query_string_does_not_create_entries(self):
+        from .response_cache import _cache_key
+
+        factory = RequestFactory()
+        self.assertEqual(
+            _cache_key('api_root', factory.get('/ta/?x=1'), []), _cache_key('api_root', factory.get('/ta/?x=2'), [])
+        )
+        # The SPA shell is one entry per build, whatever the route
+        self.assertNotEqual(_cache_key('spa_index', factory.get('/login/'), [1]),
+                            _cache_key('spa_index', factory.get('/anything'), [1]))
+        self.assertEqual(_cache_key('spa_index', factory.get('/login/'), [1], per_path=False),
+                         _cache_key('spa_index', factory.get('/anything?x=3'), [1], per_path=False))
+
+        self.client.force_authenticate(user=self.user)
+        url = reverse('get_available_languages')
+        self.assertEqual(self.client.get(url, {'x': 'first'})['X-Response-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url, {'x': 'second'})['X-Response-Cache'], 'HIT')
+
+
+class DownsampleTests(TestCase):
+    """Test LTTB chart downsampling"""
+
+    def test_keeps_endpoints_and_peaks(self):
+        from .downsample import downsample, lttb_indices
+
+        y = [0.0] * 1000
+        y[137] = 50.0
+        y[612] = -40.0
+        indices = lttb_indices(range(1000), y, 20)
+        self.assertEqual(len(indices), 20)
+        self.assertEqual((indices[0], indices[-1]), (0, 999))
+        self.assertTrue(all(a < b for a, b in zip(indices, indices[1:])))
+        self.assertIn(137, indices)
+        self.assertIn(612, indices)
+
+        points = [{'total': v} for v in y]
+        self.assertEqual(len(downsample(points, 50, y_key='total')), 50)
+        self.assertIs(downsample(points, None, y_key='total'), points)
+        self.assertIs(downsample(points[:10], 50, y_key='total')[0], points[0])
+
+    def test_max_points_param(self):
+        from .downsample import max_points_param
+
+        self.assertIsNone(max_points_param({}))
+        self.assertEqual(max_points_param({'max_points': '200'}), 200)
+        for bad in ('abc', '1', '999999'):
+            with self.assertRaises(ValueError):
+                max_points_param({'max_points': bad})
+
+
+class AlertRuleTests(TestCase):
+    """Test the event-driven alert rule engine"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='alerts', password='testpass123')
+
+    def test_thresholds_fire_once_per_period(self):
+        from datetime import date
+        from decimal import Decimal
+        from individual_module.models import IndividualExpense, SpendingAlert
+        from individual_module.models_wallet import IndividualWallet
+
+        IndividualWallet.objects.create(user=self.user, monthly_budget=Decimal('1000.00'))
+
+        def spend(amount, day):
+            IndividualExpense.objects.create(user=self.user, amount=Decimal(amount), category='FOOD', expense_date=day)
+            return list(SpendingAlert.objects.filter(user=self.user).order_by('id').values_list('alert_type', flat=True))
+
+        self.assertEqual(spend('400', date(2026, 3, 2)), [])
+        self.assertEqual(spend('150', date(2026, 3, 5)), ['SPENT_50'])
+        self.assertEqual(spend('100', date(2026, 3, 6)), ['SPENT_50'])
+        self.assertEqual(spend('300', date(2026, 3, 9)), ['SPENT_50', 'SPENT_80'])
+        self.assertEqual(spend('500', date(2026, 3, 10)), ['SPENT_50', 'SPENT_80'])
+        # A new month starts a new running total
+        self.assertEqual(spend('600', date(2026, 4, 1)), ['SPENT_50', 'SPENT_80', 'SPENT_50'])
+
+    def test_rules_recompile_when_settings_change(self):
+        from decimal import Decimal
+        from individual_module.models_wallet import IndividualWallet
+        from .alert_rules import rules
+
+        wallet = IndividualWallet.objects.create(user=self.user, monthly_budget=Decimal('1000.00'))
+        compiled = rules.rules_for('individual.expenses', self.user.pk)
+        self.assertIs(rules.rules_for('individual.expenses', self.user.pk), compiled)
+        self.assertEqual([rule.threshold for _, group in compiled.counters for rule in group],
+                         [Decimal('500.00'), Decimal('800.00')])
+
+        wallet.monthly_budget = Decimal('2000.00')
+        wallet.save()
+        recompiled = rules.rules_for('individual.expenses', self.user.pk)
+        self.assertEqual([rule.threshold for _, group in recompiled.counters for rule in group],
+                         [Decimal('1000.00'), Decimal('1600.00')])
+
+    def test_delete_resyncs_running_total(self):
+        from datetime import date
+        from decimal import Decimal
+        from individual_module.models import IndividualExpense
+        from individual_module.models_wallet import IndividualWallet
+        from .models import AlertCounter
+
+        IndividualWallet.objects.create(user=self.user, monthly_budget=Decimal('1000.00'))
+        expense = IndividualExpense.objects.create(user=self.user, amount=Decimal('300'), category='FOOD', expense_date=date(2026, 5, 3))
+        IndividualExpense.objects.create(user=self.user, amount=Decimal('100'), category='FOOD', expense_date=date(2026, 5, 4))
+        counter = AlertCounter.objects.get(ledger='individual.expenses', owner_id=self.user.pk)
+        self.assertEqual(counter.total, Decimal('400.00'))
+
+        with patch('core.alert_rules.timezone.localdate', return_value=date(2026, 5, 20)):
+            expense.delete()
+        counter.refresh_from_db()
+        self.assertEqual(counter.total, Decimal('100.00'))
+
+    def test_student_daily_warning_and_parent_alerts(self):
+        from datetime import date
+        from decimal import Decimal
+        from parent_module.models import AlertSettings, ParentAlert
+        from student_module.models import MonthlyAllowance, StudentNotification, Transaction
+
+        parent = get_user_model().objects.create_user(username='alertparent', password='testpass123')
+        MonthlyAllowance.objects.create(parent=parent, student=self.user, monthly_amount=Decimal('3000.00'), start_date=date(2026, 6, 1))
+        AlertSettings.objects.create(parent=parent, student=self.user, alert_type='DAILY_LIMIT')
+        AlertSettings.objects.create(parent=parent, student=self.user, alert_type='50%')
+
+        def spend(amount, day, description=''):
+            Transaction.objects.create(
+                user=self.user, amount=Decimal(amount), transaction_type='EXP', transaction_date=day, description=description
+            )
+
+        # Daily allowance 100: the warning fires at 80, the parent's alert at 100
+        spend('70', date(2026, 6, 10))
+        spend('15', date(2026, 6, 10))
+        spend('10', date(2026, 6, 10), description='[Pocket Money] snacks')
+        spend('10', date(2026, 6, 10))
+        warnings = StudentNotification.objects.filter(student=self.user, notification_type='DAILY_80%')
+        self.assertEqual(warnings.count(), 1)
+        self.assertEqual(list(ParentAlert.objects.filter(parent=parent).values_list('alert_type', flat=True)), [])
+
+        spend('5', date(2026, 6, 10))
+        self.assertEqual(list(ParentAlert.objects.filter(parent=parent).values_list('alert_type', flat=True)), ['DAILY_LIMIT'])
+
+        spend('1400', date(2026, 6, 11))
+        self.assertEqual(
+            sorted(ParentAlert.objects.filter(parent=parent).values_list('alert_type', flat=True)),
+            ['50%', 'DAILY_LIMIT', 'DAILY_LIMIT'],
+        )
+        self.assertEqual(warnings.count(), 2)
+
+    def test_couple_low_balance(self):
+        from decimal import Decimal
+        from couple_module.models import CoupleAlert, CoupleLink
+        from couple_module.models_wallet import CoupleWallet
+
+        partner = get_user_model().objects.create_user(username='alertpartner', password='testpass123')
+        CoupleLink.objects.create(user1=self.user, user2=partner)
+        wallet = CoupleWallet.objects.create(partner1=self.user, partner2=partner, alert_threshold=Decimal('100.00'))
+        wallet.deposit(Decimal('500.00'), deposited_by=self.user)
+
+        wallet.withdraw(Decimal('300.00'), withdrawn_by=self.user)
+        self.assertFalse(CoupleAlert.objects.exists())
+        wallet.withdraw(Decimal('150.00'), withdrawn_by=self.user)
+        wallet.withdraw(Decimal('10.00'), withdrawn_by=self.user)
+        self.assertEqual(list(CoupleAlert.objects.values_list('alert_type', flat=True)), ['LOW_BALANCE'])
+
+
+class CohortPercentileTests(APITestCase):
+    """Tests for KLL sketches and cohort spending percentiles"""
+
+    def setUp(self):
+        from datetime import date
+        from decimal import Decimal
+        from individual_module.models import IndividualExpense
+        from institute_module.models import Institute, InstituteStudentProfile
+        from student_module.models import Transaction
+
+        User = get_user_model()
+        self.month = date(2026, 6, 1)
+        self.owner = User.objects.create_user(username='cohortowner', password='testpass123', persona='INSTITUTE_OWNER')
+        self.institute = Institute.objects.create(owner=self.owner, name='Cohort School')
+        self.students = []
+        for i in range(1, 15):
+            student = User.objects.create_user(username=f'cohort{i}', persona='STUDENT')
+            Transaction.objects.create(
+                user=student, amount=Decimal(i * 100), transaction_type='EXP', transaction_date=date(2026, 6, i)
+            )
+            if i <= 10:
+                InstituteStudentProfile.objects.create(
+                    user=student, institute=self.institute, student_name=f'Student {i}',
+                    parent_mobile='9000000000', monthly_fee=Decimal('1000'),
+                )
+            self.students.append(student)
+        self.individual = User.objects.create_user(username='cohortsolo', password='testpass123', persona='INDIVIDUAL')
+        IndividualExpense.objects.create(user=self.individual, amount=Decimal('50'), category='FOOD', expense_date=date(2026, 6, 2))
+
+    def test_sketch_rank_and_merge(self):
+        import random
+        from core.sketches import KLLSketch
+
+        rng = random.Random(7)
+        values = [rng.random() * 1000 for _ in range(20000)]
+        left, right = KLLSketch(seed=1), KLLSketch(seed=2)
+        left.extend(values[:10000])
+        right.extend(values[10000:])
+        merged = KLLSketch.from_dict(left.to_dict()).merge(right)
+
+        self.assertEqual(len(merged), 20000)
+        self.assertLess(sum(map(len, merged.levels)), 1000)
+        ordered = sorted(values)
+        for q in (0.1, 0.5, 0.9):
+            self.assertAlmostEqual(merged.rank(ordered[int(q * 20000)]), q, delta=0.02)
+
+        exact = KLLSketch()
+        exact.extend([3, 1, 2])
+        self.assertEqual(exact.rank(2), 1 / 3)
+        self.assertEqual(exact.quantile(0.5), 2)
+
+    def test_build_and_percentile(self):
+        from core.cohorts import CohortSketchService, CohortUnavailableError
+        from core.models import CohortSketch
+
+        built = CohortSketchService.build(self.month)
+        # STUDENT: everyone and the institute; INDIVIDUAL: everyone, overall and FOOD
+        self.assertEqual(built, 4)
+        self.assertEqual(CohortSketch.objects.get(persona='STUDENT', institute_id=0).count, 14)
+
+        result = CohortSketchService.percentile(self.students[7], self.month)
+        self.assertEqual(result['amount'], 800.0)
+        self.assertEqual(result['percentile'], 50.0)
+        self.assertEqual(result['cohort_size'], 14)
+        # No statistic that is some other user's exact total
+        self.assertNotIn('median', result)
+
+        result = CohortSketchService.percentile(self.students[5], self.month, institute_ids=[self.institute.pk])
+        self.assertEqual(result['percentile'], 50.0)
+        self.assertEqual(result['institutes'], [self.institute.pk])
+
+        # One individual is below the minimum cohort size
+        with self.assertRaises(CohortUnavailableError):
+            CohortSketchService.percentile(self.individual, self.month, 'food')
+
+    def test_institute_cohorts_need_more_users(self):
+        from core.cohorts import CohortSketchService, CohortUnavailableError
+        from institute_module.models import InstituteStudentProfile
+
+        # Six active students: too few for an institute cohort
+        InstituteStudentProfile.objects.filter(student_name__in=[f'Student {i}' for i in range(7, 11)]).update(is_active=False)
+        CohortSketchService.build(self.month)
+        self.assertEqual(CohortSketchService.percentile(self.students[0], self.month)['cohort_size'], 14)
+        with self.assertRaises(CohortUnavailableError):
+            CohortSketchService.percentile(self.students[0], self.month, institute_ids=[self.institute.pk])
+
+    def test_endpoint_permissions(self):
+        from django.urls import reverse
+        from core.cohorts import CohortSketchService
+        from student_module.models import ParentStudentLink
+
+        CohortSketchService.build(self.month)
+        url = reverse('cohort-percentile')
+        student = self.students[2]
+
+        self.client.force_authenticate(user=student)
+        response = self.client.get(url, {'month': '2026-06'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['percentile'], 14.3)
+        self.assertEqual(self.client.get(url, {'month': 'June'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'month': '2026-06', 'institute': '999'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'month': '2025-01'}).status_code, 404)
+
+        other = self.students[3]
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(url, {'user': student.pk, 'month': '2026-06'}).status_code, 404)
+
+        parent = get_user_model().objects.create_user(username='cohortparent', password='testpass123', persona='PARENT')
+        ParentStudentLink.objects.create(parent=parent, student=student)
+        self.client.force_authenticate(user=parent)
+        response = self.client.get(url, {'user': student.pk, 'month': '2026-06'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user'], student.pk)
+
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(url, {'user': student.pk, 'month': '2026-06', 'institute': self.institute.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['cohort_size'], 10)
+        self.assertEqual(self.client.get(url, {'user': self.students[12].pk, 'month': '2026-06'}).status_code, 404)
+
+
+class GoalOddsTests(TestCase):
+    """Tests for the Monte Carlo goal-attainment estimate"""
+
+    def test_simulate(self):
+        from core.goal_odds import simulate
+
+        steady = simulate([1000.0, 1000.0, 1000.0], needed=5000, months=6, paths=1000, seed=1)
+        self.assertEqual(steady['probability'], 1.0)
+        self.assertEqual(steady['median_months'], 5)
+        self.assertEqual(steady['projected']['p50'], 6000.0)
+
+        # Half the months save nothing: reaching 4 x 1000 in 6 months is about 34% likely
+        coin = simulate([1000.0, 0.0], needed=4000, months=6, paths=20000, seed=1)
+        self.assertAlmostEqual(coin['probability'], 22 / 64, delta=0.02)
+
+    def test_goal_attainment_statuses(self):
+        from datetime import date
+        from core.goal_odds import goal_attainment, months_until
+
+        today = date(2026, 6, 20)
+        self.assertEqual(months_until(today, date(2026, 6, 30)), 1)
+        self.assertEqual(months_until(today, date(2026, 9, 1)), 4)
+        self.assertEqual(months_until(today, date(2026, 6, 1)), 0)
+
+        history = [500.0, 700.0, 600.0, 400.0]
+        self.assertEqual(goal_attainment(history, 100, 100, date(2026, 9, 1), today)['status'], 'REACHED')
+        self.assertEqual(goal_attainment(history[:2], 1000, 0, date(2026, 9, 1), today)['status'], 'INSUFFICIENT_HISTORY')
+        self.assertEqual(goal_attainment(history, 1000, 0, date(2026, 9, 1), today, seed=1)['status'], 'ON_TRACK')
+        # Two open goals share the savings
+        shared = goal_attainment(history, 2000, 0, date(2026, 9, 1), today, open_goals=2, seed=1)
+        self.assertEqual(shared['status'], 'OFF_TRACK')
+        self.assertEqual(goal_attainment(history, 1000, 0, date(2026, 5, 1), today)['probability'], 0.0)
+
+        open_ended = goal_attainment(history, 3000, 0, None, today, seed=1)
+        self.assertEqual(open_ended['status'], 'NO_DEADLINE')
+        self.assertIsNone(open_ended['probability'])
+        self.assertEqual(open_ended['median_months'], 6)
@@ -0,0 +1,281 @@
+"""
+Time-series rollups for chart endpoints.
+
+A metric names the rows a user may chart (a queryset built from the
+requesting user), the date field to bucket on and the value to sum.
+``rollup`` answers (rows, bucket, range, optional split) with one
+``GROUP BY Trunc(...)`` query and returns one point per bucket, including
+empty ones, so charts never have to fill gaps themselves.
+
+Apps register their metrics in ``<app>/timeseries.py`` (imported from the
+app's ``ready()``); ``/api/timeseries/<metric>/`` serves any of them.
+
+Usage:
+
+    @metrics.register('individual.expenses', date_field='expense_date', split_field='category')
+    def individual_expenses(user):
+        return IndividualExpense.objects.filter(user=user)
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.db import models
+from django.db.models import Count, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .data_version import DataVersionService, versioned_memoize
+
+BUCKETS = ('day', 'week', 'month', 'year')
+# Range used when a request gives no start, in buckets ending today
+DEFAULT_SPANS = {'day': 30, 'week': 12, 'month': 12, 'year': 5}
+MAX_POINTS = 400
+
+
+class UnknownMetricError(LookupError):
+    """Raised for a metric name that is not registered."""
+
+
+class InvalidSeriesError(ValueError):
+    """Raised for an unknown bucket or an unusable date range."""
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """First day of the bucket containing ``day`` (weeks start on Monday)."""
+    if bucket == 'day':
+        return day
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    if bucket == 'year':
+        return day.replace(month=1, day=1)
+    raise InvalidSeriesError(f"Unknown bucket '{bucket}'")
+
+
+def shift(start: date, bucket: str, steps: int = 1) -> date:
+    """Start of the bucket ``steps`` buckets after (or before) ``start``."""
+    if bucket == 'day':
+        return start + timedelta(days=steps)
+    if bucket == 'week':
+        return start + timedelta(weeks=steps)
+    if bucket == 'month':
+        index = start.year * 12 + start.month - 1 + steps
+        return date(index // 12, index % 12 + 1, 1)
+    if bucket == 'year':
+        return start.replace(year=start.year + steps)
+    raise InvalidSeriesError(f"Unknown bucket '{bucket}'")
+
+
+def bucket_starts(start: date, end: date, bucket: str) -> List[date]:
+    """Start dates of every bucket from the one containing ``start`` to the one containing ``end``."""
+    current = bucket_start(start, bucket)
+    starts = []
+    while current <= end:
+        starts.append(current)
+        if len(starts) > MAX_POINTS:
+            raise InvalidSeriesError(f"Range spans more than {MAX_POINTS} {bucket} buckets")
+        current = shift(current, bucket)
+    return starts
+
+
+def default_range(bucket: str, today: Optional[date] = None) -> Tuple[date, date]:
+    today = today or timezone.localdate()
+    return shift(bucket_start(today, bucket), bucket, -(DEFAULT_SPANS[bucket] - 1)), today
+
+
+def densify(totals: Dict[date, Decimal], starts: Iterable[date], default=Decimal('0')) -> List[Tuple[date, Decimal]]:
+    """Pair every bucket start with its total, using ``default`` for empty buckets."""
+    return [(start, totals.get(start, default)) for start in starts]
+
+
+def filter_range(queryset, date_field: str, start: date, end: date):
+    """Rows whose ``date_field`` falls on a local date from ``start`` to ``end`` inclusive."""
+    field = queryset.model._meta.get_field(date_field)
+    if isinstance(field, models.DateTimeField):
+        lower = timezone.make_aware(datetime.combine(start, time.min))
+        upper = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+        return queryset.filter(**{f'{date_field}__gte': lower, f'{date_field}__lt': upper})
+    return queryset.filter(**{f'{date_field}__gte': start, f'{date_field}__lte': end})
+
+
+def rollup(queryset, date_field: str, bucket: str, start: date, end: date,
+           value: str = 'amount', split_field: Optional[str] = None) -> List[Dict]:
+    """
+    Sum ``value`` per bucket with one grouped query.
+
+    Args:
+        queryset: Rows to aggregate, already scoped to their owner
+        date_field: DateField or DateTimeField to bucket on (datetimes are
+            bucketed in the current time zone)
+        bucket: One of BUCKETS
+        start: First local date included (widened to its bucket's start)
+        end: Last local date included
+        value: Field to sum
+        split_field: Optional field to break each bucket's total down by
+
+    Returns:
+        One dict per bucket, oldest first: ``start``, ``end`` (dates),
+        ``total`` (Decimal), ``count`` and, with ``split_field``, ``split``
+        mapping each value of that field to its total
+    """
+    if bucket not in BUCKETS:
+        raise InvalidSeriesError(f"Unknown bucket '{bucket}'")
+    if start > end:
+        raise InvalidSeriesError("start must not be after end")
+    starts = bucket_starts(start, end, bucket)
+    queryset = filter_range(queryset, date_field, starts[0], end)
+
+    group_by = ['series_bucket'] + ([split_field] if split_field else [])
+    rows = queryset.annotate(
+        series_bucket=Trunc(date_field, bucket, output_field=models.DateField())
+    ).values(*group_by).annotate(total=Sum(value), count=Count('pk')).order_by()
+
+    totals, counts, splits = {}, {}, {}
+    for row in rows:
+        key = row['series_bucket']
+        amount = row['total'] or Decimal('0')
+        totals[key] = totals.get(key, Decimal('0')) + amount
+        counts[key] = counts.get(key, 0) + row['count']
+        if split_field:
+            splits.setdefault(key, {})[row[split_field]] = amount
+
+    points = []
+    for point_start, total in densify(totals, starts):
+        point = {
+            'start': point_start,
+            'end': min(shift(point_start, bucket) - timedelta(days=1), end),
+            'total': total,
+            'count': counts.get(point_start, 0),
+        }
+        if split_field:
+            point['split'] = splits.get(point_start, {})
+        points.append(point)
+    return points
+
+
+class Metric:
+    def __init__(self, name: str, queryset: Callable, date_field: str, value: str = 'amount',
+                 split_field: Optional[str] = None, scope: str = 'user', scope_ids: Optional[Callable] = None):
+        self.name = name
+        self.queryset = queryset
+        self.date_field = date_field
+        self.value = value
+        self.split_field = split_field
+        # Data version scope whose bumps invalidate cached results for a user
+        self.scope = scope
+        self.scope_ids = scope_ids or (lambda user: user.pk)
+
+    def series(self, user, bucket: str, start: date, end: date, split: bool = False) -> List[Dict]:
+        return rollup(
+            self.queryset(user), self.date_field, bucket, start, end,
+            value=self.value, split_field=self.split_field if split else None,
+        )
+
+
+class MetricRegistry:
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, name: str, date_field: str, value: str = 'amount', split_field: Optional[str] = None,
+                 scope: str = 'user', scope_ids: Optional[Callable] = None):
+        """
+        Register a function ``(user) -> QuerySet`` as the rows behind metric ``name``.
+
+        ``scope``/``scope_ids`` name the data versions the rows depend on
+        (default: the requesting user's own version).
+        """
+        def decorator(queryset):
+            self.metrics[name] = Metric(name, queryset, date_field, value, split_field, scope, scope_ids)
+            return queryset
+        return decorator
+
+    def get(self, name: str) -> Metric:
+        try:
+            return self.metrics[name]
+        except KeyError:
+            raise UnknownMetricError(name)
+
+
+metrics = MetricRegistry()
+
+
+def parse_series_params(query_params, today: Optional[date] = None) -> Dict:
+    """
+    Read ``bucket``, ``start``, ``end`` and ``split`` from a request.
+
+    Dates are ISO ``YYYY-MM-DD``; without ``start`` the bucket's default span
+    ending at ``end`` (or today) is used.
+
+    Raises:
+        InvalidSeriesError: For an unknown bucket or malformed dates
+    """
+    bucket = query_params.get('bucket') or 'day'
+    if bucket not in BUCKETS:
+        raise InvalidSeriesError(f"Unknown bucket '{bucket}'")
+    try:
+        end = date.fromisoformat(query_params['end']) if query_params.get('end') else (today or timezone.localdate())
+        start = date.fromisoformat(query_params['start']) if query_params.get('start') else default_range(bucket, end)[0]
+    except ValueError:
+        raise InvalidSeriesError("Dates must be YYYY-MM-DD")
+    split = str(query_params.get('split', '')).lower() in ('1', 'true', 'yes')
+    return {'bucket': bucket, 'start': start, 'end': end, 'split': split}
+
+
+def serialize_points(points: List[Dict]) -> List[Dict]:
+    """JSON-friendly points: ISO dates and float totals."""
+    result = []
+    for point in points:
+        item = {
+            'start': point['start'].isoformat(),
+            'end': point['end'].isoformat(),
+            'total': float(point['total']),
+            'count': point['count'],
+        }
+        if 'split' in point:
+            item['split'] = {str(key): float(amount) for key, amount in point['split'].items()}
+        result.append(item)
+    return result
+
+
+def _year_heatmap(metric_name: str, scope_ids, user, year: int) -> Dict:
+    metric = metrics.get(metric_name)
+    start, end = date(year, 1, 1), date(year, 12, 31)
+    points = metric.series(user, 'day', start, end, split=metric.split_field is not None)
+
+    days, categories = [], {}
+    for index, point in enumerate(points):
+        days.append(int((point['total'] * 100).to_integral_value(ROUND_HALF_UP)))
+        for category, amount in point.get('split', {}).items():
+            if amount:
+                categories[str(category)] = categories.get(str(category), 0) | (1 << index)
+    return {
+        'metric': metric_name,
+        'year': year,
+        'start': start.isoformat(),
+        'days': days,
+        'max': max(days),
+        'categories': {category: format(mask, 'x') for category, mask in sorted(categories.items())},
+    }
+
+
+_heatmap_by_scope = {
+    scope: versioned_memoize(scope, key=lambda metric_name, scope_ids, *args: scope_ids)(_year_heatmap)
+    for scope in DataVersionService.SCOPES
+}
+
+
+def year_heatmap(metric: Metric, user, year: int) -> Dict:
+    """
+    Daily totals for a calendar year as a compact heatmap.
+
+    Computed from one grouped day rollup and cached per (metric, user,
+    year, data version).
+
+    Returns:
+        Dict with ``days`` (365/366 integers, amount in paise per day from
+        1 January), ``max`` and ``categories`` mapping each split value to a
+        hex bitmask whose bit ``i`` is set when day ``i`` had spending in it
+    """
+    return _heatmap_by_scope[metric.scope](metric.name, metric.scope_ids(user), user, year)
@@ -3,7 +3,11 @@ from django.urls import path, include
 from django.conf.urls.i18n import i18n_patterns
 from django.views.generic import RedirectView
 from rest_framework.authtoken.views import obtain_auth_token
-from .views import api_root, api_status, set_language, get_available_languages
+from .views import api_root, api_status, healthz, readyz, system_stats, set_language, get_available_languages
+from .views_cohorts import CohortPercentileView
+from .views_events import event_stream, stream_ticket
+from .views_timeseries import TimeSeriesHeatmapView, TimeSeriesView
+from .response_cache import cache_response
 import os
 
 
@@ -11,7 +15,17 @@ import os
 FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'frontend', 'dist')
 
 
+def frontend_build_version(request, page):
+    # Rebuilding the frontend replaces index.html; its mtime keys the cache
+    try:
+        return [os.stat(os.path.join(FRONTEND_DIR, 'index.html')).st_mtime_ns]
+    except OSError:
+        return ['missing']
+
+
 # Simple view to serve React app (SPA)
+# Every route returns the same index.html, so the build version is the only key
+@cache_response('spa_index', vary_on=frontend_build_version, per_path=False)
 def serve_frontend(request, page):
     from django.http import HttpResponse
     import os
@@ -34,6 +48,16 @@ urlpatterns = [
     path('api/set-language/', set_language, name='set_language'),
     path('api/languages/', get_available_languages, name='get_available_languages'),
     path('api/status/', api_status, name='api_status'),
+    path('api/status/stats/', system_stats, name='system_stats'),
+    # Load balancer probes: liveness (no database) and readiness (database ping)
+    path('healthz', healthz, name='healthz'),
+    path('readyz', readyz, name='readyz'),
+    # Server-Sent Events stream of per-user change notifications
+    path('api/events/stream/', event_stream, name='event_stream'),
+    path('api/events/ticket/', stream_ticket, name='event_stream_ticket'),
+    path('api/timeseries/<str:metric>/', TimeSeriesView.as_view(), name='timeseries'),
+    path('api/timeseries/<str:metric>/heatmap/', TimeSeriesHeatmapView.as_view(), name='timeseries-heatmap'),
+    path('api/cohorts/percentile/', CohortPercentileView.as_view(), name='cohort-percentile'),
     # Auth endpoints (outside i18n_patterns for language-agnostic access)
     path('api/auth/', include('core.urls_auth')),
     # Frontend routes
@@ -5,9 +5,14 @@ from rest_framework.response import Response
 from django.utils import translation
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
+from django.http import JsonResponse
+
+from .health import SystemStatsService, check_database
+from .response_cache import cache_response
 
 
 @api_view(['GET'])
+@cache_response('api_root')
 def api_root(request):
     """
     Root API endpoint that provides information about available endpoints.
@@ -36,40 +41,13 @@ def api_status(request):
     """
     API status endpoint that provides detailed system status information.
     """
-    from django.db import connection
-    from django.conf import settings
-    
     # Check database connectivity
-    db_status = 'unknown'
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        db_status = 'connected'
-    except Exception as e:
-        db_status = f'error: {str(e)}'
-    
-    # Get project stats
-    stats = {}
-    try:
-        from student_module.models import Wallet as StudentWallet
-        from couple_module.models import CoupleWallet
-        from individual_module.models import IndividualWallet
-        from retiree_module.models import RetireeWallet
-        from dailywage_module.models import DailyWageWallet
-        from django.contrib.auth import get_user_model
-        
-        User = get_user_model()
-        stats = {
-            'total_users': User.objects.count(),
-            'student_wallets': StudentWallet.objects.count(),
-            'couple_wallets': CoupleWallet.objects.count(),
-            'individual_wallets': IndividualWallet.objects.count(),
-            'retiree_wallets': RetireeWallet.objects.count(),
-            'dailywage_wallets': DailyWageWallet.objects.count(),
-        }
-    except Exception as e:
-        stats = {'error': str(e)}
-    
+    db_ok, db_error = check_database()
+    db_status = 'connected' if db_ok else f'error: {db_error}'
+
+    # Project stats are cached and refreshed in the background
+    stats = SystemStatsService.get()
+
     return Response({
         'status': 'online',
         'version': '1.0.0',
@@ -89,11 +67,41 @@ def api_status(request):
             'rate_limiting': 'Throttling on sensitive operations',
             'permissions': 'Role-based access control',
         },
-        'statistics': stats,
+        'statistics': stats['counts'] if stats else {},
         'message': 'IBET Wallet API is running'
     })
 
 
+def healthz(request):
+    """Liveness probe: the process is up and serving requests. Never touches the database."""
+    return JsonResponse({'status': 'ok'})
+
+
+def readyz(request):
+    """Readiness probe: one database ping with a timeout."""
+    db_ok, db_error = check_database()
+    if not db_ok:
+        return JsonResponse({'status': 'unavailable', 'database': db_error}, status=503)
+    return JsonResponse({'status': 'ok'})
+
+
+@api_view(['GET'])
+def system_stats(request):
+    """
+    Row counts served from cache (see core/health.py).
+
+    ``approximate`` lists counts taken from planner statistics.
+    """
+    stats = SystemStatsService.get()
+    if stats is None:
+        return Response({'status': 'refreshing'}, status=status.HTTP_202_ACCEPTED)
+    return Response({
+        'statistics': stats['counts'],
+        'approximate': stats['approximate'],
+        'refreshed_at': stats['refreshed_at'],
+    })
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def set_language(request):
@@ -133,6 +141,7 @@ def set_language(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_response('languages')
 def get_available_languages(request):
     """
     API endpoint to get list of available languages.
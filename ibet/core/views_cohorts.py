@@ -0,0 +1,72 @@
+"""
+Cohort spending percentile of one user.
+
+GET /api/cohorts/percentile/?user=42&month=2025-06&category=FOOD&institute=3
+"""
+from datetime import datetime
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .cohorts import (
+    ALL_INSTITUTES, CohortSketchService, CohortUnavailableError, UnknownCohortError, institute_memberships
+)
+
+
+def can_view_spending(viewer, target) -> bool:
+    """The user themself, their linked parent, or the owner of an institute they study at."""
+    if viewer.pk == target.pk:
+        return True
+    if apps.get_model('student_module', 'ParentStudentLink').objects.filter(
+        parent=viewer, student=target
+    ).exists():
+        return True
+    return apps.get_model('institute_module', 'InstituteStudentProfile').objects.filter(
+        user=target, institute__owner=viewer, is_active=True
+    ).exists()
+
+
+class CohortPercentileView(APIView):
+    """Where a user's monthly spending ranks among users of the same persona (and institute)."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        target = request.user
+        if params.get('user'):
+            target = get_user_model().objects.filter(pk=params['user']).first() if params['user'].isdigit() else None
+            # Users outside the viewer's reach look the same as missing ones
+            if target is None or not can_view_spending(request.user, target):
+                return Response({'error': _('User not found')}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            month = datetime.strptime(params['month'], '%Y-%m').date() if params.get('month') \
+                else timezone.localdate().replace(day=1)
+        except ValueError:
+            return Response({'error': _('month must be YYYY-MM')}, status=status.HTTP_400_BAD_REQUEST)
+
+        institute_ids = [ALL_INSTITUTES]
+        if params.get('institute'):
+            raw_ids = params['institute'].split(',')
+            if not all(raw.strip().isdigit() for raw in raw_ids):
+                return Response({'error': _('Invalid institute')}, status=status.HTTP_400_BAD_REQUEST)
+            institute_ids = [int(raw) for raw in raw_ids]
+            if not set(institute_ids) <= set(institute_memberships([target.pk]).get(target.pk, [])):
+                return Response(
+                    {'error': _('The user is not a student of this institute')}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+        try:
+            result = CohortSketchService.percentile(target, month, params.get('category', ''), institute_ids)
+        except UnknownCohortError:
+            return Response(
+                {'error': _('Percentiles are not available for this account type')}, status=status.HTTP_400_BAD_REQUEST
+            )
+        except CohortUnavailableError:
+            return Response({'error': _('Not enough data for this cohort yet')}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'user': target.pk, **result})
@@ -0,0 +1,151 @@
+"""
+Server-Sent Events stream of per-user change notifications.
+
+Served as an async view so that, under ASGI (``core/asgi.py``), an open
+stream costs a coroutine rather than a worker thread. Under WSGI Django
+would have to drain the whole stream before sending it, so the endpoint
+answers ``204 No Content`` there and clients keep polling.
+
+``EventSource`` cannot send an Authorization header and a token in the URL
+would end up in access logs, so clients first POST to
+``/api/events/ticket/`` for a signed ticket that is valid once, for
+STREAM_TICKET_MAX_AGE seconds, and open the stream with ``?ticket=``.
+"""
+import asyncio
+import json
+import logging
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+from rest_framework import permissions
+from rest_framework.authtoken.models import Token
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from .events import get_event_backend
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 5000
+# Streams end periodically so deactivated users stop receiving events;
+# clients open a new stream with a fresh ticket.
+MAX_STREAM_SECONDS = 300
+STREAM_TICKET_MAX_AGE = 60
+STREAM_TICKET_SALT = 'core.views_events.stream_ticket'
+
+
+def streaming_supported(request) -> bool:
+    """Whether the request is served over ASGI, where streams do not hold a worker."""
+    return isinstance(request, ASGIRequest)
+
+
+def issue_stream_ticket(user) -> str:
+    return signing.dumps({'user': user.pk, 'nonce': secrets.token_urlsafe(12)}, salt=STREAM_TICKET_SALT)
+
+
+def redeem_stream_ticket(ticket: str):
+    """
+    User id of a valid, unused ticket, or None.
+
+    Each ticket is accepted once; the nonce is remembered for the ticket's lifetime.
+    """
+    try:
+        payload = signing.loads(ticket, salt=STREAM_TICKET_SALT, max_age=STREAM_TICKET_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if not cache.add(f"events:ticket:{payload['nonce']}", 1, STREAM_TICKET_MAX_AGE):
+        return None
+    return payload['user']
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def stream_ticket(request):
+    """Single-use ticket for opening the event stream; ``null`` when streaming is unavailable."""
+    if not streaming_supported(request._request):
+        return Response({'ticket': None})
+    return Response({'ticket': issue_stream_ticket(request.user), 'expires_in': STREAM_TICKET_MAX_AGE})
+
+
+async def _authenticate(request):
+    ticket = request.GET.get('ticket')
+    if ticket:
+        user_id = await sync_to_async(redeem_stream_ticket)(ticket)
+        if user_id is None:
+            return None
+        return await get_user_model().objects.filter(pk=user_id, is_active=True).afirst()
+
+    header = request.headers.get('Authorization', '')
+    if header.startswith('Token '):
+        try:
+            token = await Token.objects.select_related('user').aget(key=header[len('Token '):].strip())
+        except Token.DoesNotExist:
+            return None
+        return token.user if token.user.is_active else None
+
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def _format_event(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+async def event_stream(request):
+    """
+    Stream events for the authenticated user as ``text/event-stream``.
+
+    Resumes after ``Last-Event-ID`` (header, or ``?last_event_id=`` for a
+    new EventSource); otherwise a connection only receives events published
+    after it opened.
+    """
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({'error': _('Authentication credentials were not provided.')}, status=401)
+    if not streaming_supported(request):
+        return HttpResponse(status=204)
+
+    backend = get_event_backend()
+    events_since = sync_to_async(backend.events_since, thread_sensitive=False)
+    latest_id = sync_to_async(backend.latest_id, thread_sensitive=False)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id', '')
+    cursor = int(last_event_id) if last_event_id.isdigit() else await latest_id(user.pk)
+
+    async def stream(cursor):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + MAX_STREAM_SECONDS
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        yield _format_event({'id': cursor, 'type': 'ready', 'data': {}})
+        last_sent = loop.time()
+
+        while loop.time() < deadline:
+            events = await events_since(user.pk, cursor)
+            if not events:
+                newest = await latest_id(user.pk)
+                if newest > cursor:
+                    # Events fell out of the buffer; ask the client for a full refresh
+                    events = [{'id': newest, 'type': 'refresh', 'data': {}}]
+            for event in events:
+                yield _format_event(event)
+                cursor = event['id']
+                last_sent = loop.time()
+
+            idle = loop.time() - last_sent
+            if idle >= HEARTBEAT_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = loop.time()
+                idle = 0
+            await backend.wait(user.pk, cursor, HEARTBEAT_SECONDS - idle)
+
+    response = StreamingHttpResponse(stream(cursor), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,57 @@
+"""
+Generic chart endpoint over the registered time-series metrics.
+
+GET /api/timeseries/<metric>/?bucket=month&start=2025-01-01&end=2025-12-31&split=1&max_points=200
+GET /api/timeseries/<metric>/heatmap/?year=2025
+"""
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .downsample import downsample, max_points_param
+from .timeseries import (
+    InvalidSeriesError, UnknownMetricError, metrics, parse_series_params, serialize_points, year_heatmap
+)
+
+
+class TimeSeriesView(APIView):
+    """Dense bucketed totals of one metric for the requesting user."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, metric):
+        try:
+            series_metric = metrics.get(metric)
+        except UnknownMetricError:
+            return Response({'error': _('Unknown metric')}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            params = parse_series_params(request.query_params)
+            max_points = max_points_param(request.query_params)
+            points = series_metric.series(request.user, **params)
+        except (InvalidSeriesError, ValueError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'metric': metric,
+            'bucket': params['bucket'],
+            'start': points[0]['start'].isoformat(),
+            'end': params['end'].isoformat(),
+            'points': serialize_points(downsample(points, max_points, y_key='total')),
+        })
+
+
+class TimeSeriesHeatmapView(APIView):
+    """Year-at-a-glance daily totals (paise per day) with per-category day bitmasks."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, metric):
+        try:
+            series_metric = metrics.get(metric)
+        except UnknownMetricError:
+            return Response({'error': _('Unknown metric')}, status=status.HTTP_404_NOT_FOUND)
+        this_year = timezone.localdate().year
+        year = request.query_params.get('year', str(this_year))
+        if not year.isdigit() or not 2000 <= int(year) <= this_year + 1:
+            return Response({'error': _('Invalid year')}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(year_heatmap(series_metric, request.user, int(year)))
@@ -0,0 +1,52 @@
+"""Budget and low-balance alert rules for couple wallets (see core/alert_rules.py)."""
+from django.db.models import Q
+from django.utils.translation import gettext as _
+
+from core.alert_rules import Rule, rules
+from .models import CoupleAlert, CoupleLink
+from .models_wallet import CoupleWallet, CoupleWalletTransaction
+
+BUDGET_PERCENTS = (80, 100)
+
+
+@rules.ledger('couple.withdrawals', date_field='created_at', category_field='category')
+def couple_withdrawals(owner_id):
+    return CoupleWalletTransaction.objects.filter(wallet_id=owner_id, transaction_type='WITHDRAWAL')
+
+
+def create_couple_alert(rule, total):
+    values = {'spent': total, 'limit': rule.threshold, 'percent': rule.data.get('percent')}
+    if rule.measure == 'balance':
+        alert_type, title = 'LOW_BALANCE', _('Low Balance Alert')
+        message = _('The joint wallet balance is at or below your alert threshold of ₹%(limit)s.') % values
+    else:
+        alert_type, title = 'BUDGET_WARNING', _('Budget Warning')
+        message = _('You have spent ₹%(spent)s this month, %(percent)s%% of your monthly budget.') % values
+    return CoupleAlert.objects.create(
+        couple_id=rule.data['couple_id'], alert_type=alert_type, title=title, message=message,
+    )
+
+
+@rules.provider('couple.withdrawals')
+def couple_wallet_rules(owner_id):
+    """80%/100% of the monthly budget, and the low-balance threshold once a day."""
+    wallet = CoupleWallet.objects.filter(pk=owner_id).first()
+    if wallet is None:
+        return
+    partners = (wallet.partner1_id, wallet.partner2_id)
+    link_id = CoupleLink.objects.filter(
+        Q(user1_id__in=partners) | Q(user2_id__in=partners), is_active=True
+    ).values_list('pk', flat=True).first()
+    if link_id is None:
+        return
+    if wallet.monthly_budget > 0:
+        for percent in BUDGET_PERCENTS:
+            yield Rule(
+                f'budget_{percent}', wallet.monthly_budget * percent / 100, create_couple_alert, period='month',
+                data={'couple_id': link_id, 'percent': percent},
+            )
+    if wallet.alert_threshold > 0:
+        yield Rule(
+            'low_balance', wallet.alert_threshold, create_couple_alert, period='day', measure='balance',
+            data={'couple_id': link_id},
+        )
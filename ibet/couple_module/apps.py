@@ -7,3 +7,6 @@ class CoupleModuleConfig(AppConfig):
 
     def ready(self):
         import couple_module.translation  # noqa
+        import couple_module.signals  # noqa
+        import couple_module.timeseries  # noqa
+        import couple_module.alert_rules  # noqa
@@ -0,0 +1,35 @@
+"""Goal-attainment estimates for JointGoal (see core/goal_odds.py)."""
+from typing import Dict, List
+
+from django.db.models import F, Q
+
+from core.data_version import versioned_memoize
+from core.goal_odds import goal_attainment, monthly_net
+from .models_wallet import CoupleWalletTransaction, JointGoal
+
+
+@versioned_memoize('user', key=lambda partners, today: partners)
+def joint_monthly_net_savings(partners, today) -> List[float]:
+    """Joint wallet deposits minus withdrawals, per complete month."""
+    transactions = CoupleWalletTransaction.objects.filter(
+        Q(wallet__partner1_id__in=partners) | Q(wallet__partner2_id__in=partners)
+    )
+    return monthly_net(
+        (transactions.filter(transaction_type='DEPOSIT'), 'created_at'),
+        (transactions.filter(transaction_type='WITHDRAWAL'), 'created_at'),
+        today,
+    )
+
+
+def joint_goal_attainment(goal, today) -> Dict:
+    """Attainment estimate of ``goal``; select the goal's ``couple`` along with it."""
+    return _joint_goal_attainment(goal, today, [goal.couple.user1_id, goal.couple.user2_id])
+
+
+@versioned_memoize('user', key=lambda goal, today, partners: partners)
+def _joint_goal_attainment(goal, today, partners) -> Dict:
+    open_goals = JointGoal.objects.filter(couple_id=goal.couple_id, current_amount__lt=F('target_amount')).count()
+    return goal_attainment(
+        joint_monthly_net_savings(partners, today), goal.target_amount, goal.current_amount, goal.deadline, today,
+        open_goals=open_goals, seed=goal.pk,
+    )
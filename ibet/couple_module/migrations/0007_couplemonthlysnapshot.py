@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:03
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('couple_module', '0006_couplewallettransaction_category'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoupleMonthlySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveIntegerField()),
+                ('total_deposits', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('total_withdrawals', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('total_transfers', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('partner1_deposits', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('partner2_deposits', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('cumulative_deposits', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='All deposits up to the end of this month', max_digits=14)),
+                ('savings_at_close', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Emergency fund plus joint goals at month end', max_digits=12)),
+                ('monthly_budget', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10)),
+                ('health_score', models.DecimalField(decimal_places=1, default=Decimal('0.0'), max_digits=5)),
+                ('transaction_count', models.PositiveIntegerField(default=0)),
+                ('category_breakdown', models.JSONField(default=list)),
+                ('spending_trend', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_snapshots', to='couple_module.couplewallet')),
+            ],
+            options={
+                'ordering': ['year', 'month'],
+                'unique_together': {('wallet', 'year', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:10
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('couple_module', '0007_couplemonthlysnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoupleSettlementLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('partner1_contributed', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('partner2_contributed', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('total_shared_expenses', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('transaction_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('wallet', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='settlement_ledger', to='couple_module.couplewallet')),
+            ],
+        ),
+    ]
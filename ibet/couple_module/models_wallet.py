@@ -186,6 +186,111 @@ class CoupleWalletTransaction(models.Model):
         return f"{self.wallet.partner1.username} & {self.wallet.partner2.username} - {self.transaction_type}: {self.amount}"
 
 
+class CoupleMonthlySnapshot(models.Model):
+    """
+    Frozen monthly summary of a couple wallet.
+
+    Written once for each closed month that had activity and never updated,
+    so month-over-month charts only compute the current month.
+    """
+    wallet = models.ForeignKey(CoupleWallet, on_delete=models.CASCADE, related_name='monthly_snapshots')
+    year = models.PositiveIntegerField()
+    month = models.PositiveIntegerField()
+    total_deposits = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    total_withdrawals = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    total_transfers = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    partner1_deposits = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    partner2_deposits = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    cumulative_deposits = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'), help_text="All deposits up to the end of this month")
+    savings_at_close = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'), help_text="Emergency fund plus joint goals at month end")
+    monthly_budget = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    health_score = models.DecimalField(max_digits=5, decimal_places=1, default=Decimal('0.0'))
+    transaction_count = models.PositiveIntegerField(default=0)
+    category_breakdown = models.JSONField(default=list)
+    spending_trend = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['wallet', 'year', 'month']
+        ordering = ['year', 'month']
+
+    def __str__(self):
+        return f"Snapshot {self.month}/{self.year} for wallet {self.wallet_id}"
+
+
+class CoupleSettlementLedger(models.Model):
+    """
+    Running settlement totals for a couple wallet.
+
+    Shared (non-PERSONAL) deposits per partner and shared withdrawals are
+    added as transactions are created, so the settlement view reads one row
+    instead of aggregating the wallet's whole history. Wallets without a
+    ledger (or after edits/deletes of old transactions) are rebuilt from
+    the transactions.
+    """
+    wallet = models.OneToOneField(CoupleWallet, on_delete=models.CASCADE, related_name='settlement_ledger')
+    partner1_contributed = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    partner2_contributed = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    total_shared_expenses = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    transaction_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Settlement ledger for wallet {self.wallet_id}"
+
+    @staticmethod
+    def deltas(wallet, tx):
+        """Field increments a single transaction contributes to the ledger."""
+        if tx.transaction_type == 'DEPOSIT':
+            if tx.deposited_by_id == wallet.partner1_id:
+                return {'partner1_contributed': tx.amount}
+            if tx.deposited_by_id == wallet.partner2_id:
+                return {'partner2_contributed': tx.amount}
+        elif tx.transaction_type == 'WITHDRAWAL':
+            return {'total_shared_expenses': tx.amount}
+        return {}
+
+    @classmethod
+    def rebuild(cls, wallet):
+        """Recompute the ledger for ``wallet`` from its transactions."""
+        shared = CoupleWalletTransaction.objects.filter(wallet=wallet).exclude(category='PERSONAL')
+        totals = shared.aggregate(
+            partner1_contributed=models.Sum('amount', filter=models.Q(transaction_type='DEPOSIT', deposited_by_id=wallet.partner1_id)),
+            partner2_contributed=models.Sum('amount', filter=models.Q(transaction_type='DEPOSIT', deposited_by_id=wallet.partner2_id)),
+            total_shared_expenses=models.Sum('amount', filter=models.Q(transaction_type='WITHDRAWAL')),
+            transaction_count=models.Count('id'),
+        )
+        defaults = {field: value or Decimal('0.00') for field, value in totals.items() if field != 'transaction_count'}
+        defaults['transaction_count'] = totals['transaction_count']
+        return cls.objects.update_or_create(wallet=wallet, defaults=defaults)[0]
+
+    @classmethod
+    def record(cls, tx, sign=1):
+        """
+        Apply one created (sign=1) or deleted (sign=-1) transaction.
+
+        Increments use F() expressions so concurrent writers do not lose
+        updates. A wallet without a ledger is rebuilt on the next write,
+        which already includes ``tx``.
+        """
+        if tx.category == 'PERSONAL':
+            return
+        wallet = CoupleWallet.objects.filter(pk=tx.wallet_id).first()
+        if wallet is None:
+            # Wallet is being deleted along with its transactions
+            return
+        updates = {field: models.F(field) + sign * amount for field, amount in cls.deltas(wallet, tx).items()}
+        updates['transaction_count'] = models.F('transaction_count') + sign
+        updates['updated_at'] = timezone.now()
+        if not cls.objects.filter(wallet_id=wallet.pk).update(**updates) and sign > 0:
+            cls.rebuild(wallet)
+
+    @classmethod
+    def for_wallet(cls, wallet):
+        ledger = cls.objects.filter(wallet=wallet).first()
+        return ledger or cls.rebuild(wallet)
+
+
 class CoupleWalletOTPRequest(models.Model):
     """
     OTP requests for couple wallet operations.
@@ -0,0 +1,142 @@
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from core.alert_rules import rules as alert_rules
+from core.data_version import DataVersionService
+from core.events import EventTypes, publish
+from .models import CoupleLink, SharedWallet, SharedTransaction, SpendingRequest, CoupleAlert
+from .models_wallet import CoupleWallet, CoupleWalletTransaction, CouplePersonalWallet, JointGoal, CoupleSettlementLedger
+
+
+# Couple-scoped aggregates (settlement, monthly summary) are keyed by the
+# couple wallet; each write also bumps both partners' user versions.
+def couple_wallet_changed(wallet_id):
+    partners = CoupleWallet.objects.filter(pk=wallet_id).values_list('partner1_id', 'partner2_id').first()
+    DataVersionService.bump('couple', wallet_id)
+    if partners:
+        DataVersionService.bump_many('user', partners)
+
+
+def couple_link_changed(link_id):
+    users = CoupleLink.objects.filter(pk=link_id).values_list('user1_id', 'user2_id').first()
+    if not users:
+        return
+    DataVersionService.bump_many('user', users)
+    wallet_ids = CoupleWallet.objects.filter(
+        Q(partner1_id__in=users) | Q(partner2_id__in=users)
+    ).values_list('pk', flat=True)
+    DataVersionService.bump_many('couple', wallet_ids)
+
+
+@receiver([post_save, post_delete], sender=CoupleWallet)
+def couple_wallet_saved(sender, instance, **kwargs):
+    DataVersionService.bump('couple', instance.pk)
+    DataVersionService.bump_many('user', [instance.partner1_id, instance.partner2_id])
+
+
+@receiver([post_save, post_delete], sender=CoupleWalletTransaction)
+def couple_wallet_transaction_changed(sender, instance, **kwargs):
+    couple_wallet_changed(instance.wallet_id)
+
+
+@receiver([post_save, post_delete], sender=CouplePersonalWallet)
+def personal_wallet_changed(sender, instance, **kwargs):
+    DataVersionService.bump('user', instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=JointGoal)
+def joint_goal_changed(sender, instance, **kwargs):
+    couple_link_changed(instance.couple_id)
+
+
+@receiver([post_save, post_delete], sender=SharedWallet)
+def shared_wallet_changed(sender, instance, **kwargs):
+    couple_link_changed(instance.couple_id)
+
+
+@receiver([post_save, post_delete], sender=SharedTransaction)
+def shared_transaction_changed(sender, instance, **kwargs):
+    couple_link_changed(SharedWallet.objects.filter(pk=instance.wallet_id).values_list('couple_id', flat=True).first())
+
+
+@receiver([post_save, post_delete], sender=CoupleLink)
+def couple_link_saved(sender, instance, **kwargs):
+    DataVersionService.bump_many('user', [instance.user1_id, instance.user2_id])
+
+
+@receiver([post_save, post_delete], sender=SpendingRequest)
+@receiver([post_save, post_delete], sender=CoupleAlert)
+def couple_activity_changed(sender, instance, **kwargs):
+    couple_link_changed(instance.couple_id)
+
+
+def couple_users(link_id):
+    return CoupleLink.objects.filter(pk=link_id).values_list('user1_id', 'user2_id').first() or []
+
+
+@receiver(post_save, sender=CoupleWallet)
+def publish_couple_balance(sender, instance, **kwargs):
+    publish([instance.partner1_id, instance.partner2_id], EventTypes.BALANCE, {'wallet_id': instance.pk})
+
+
+@receiver(post_save, sender=CouplePersonalWallet)
+def publish_personal_balance(sender, instance, **kwargs):
+    publish([instance.user_id], EventTypes.BALANCE)
+
+
+@receiver(post_save, sender=CoupleAlert)
+def publish_couple_alert(sender, instance, created, **kwargs):
+    if created:
+        publish(couple_users(instance.couple_id), EventTypes.NOTIFICATION, {'alert_id': instance.pk})
+
+
+@receiver(post_save, sender=SpendingRequest)
+def publish_couple_spending_request(sender, instance, **kwargs):
+    publish(couple_users(instance.couple_id), EventTypes.SPENDING_REQUEST, {'request_id': instance.pk})
+
+
+@receiver(post_save, sender=CoupleWalletTransaction)
+def settlement_transaction_saved(sender, instance, created, **kwargs):
+    if created:
+        CoupleSettlementLedger.record(instance)
+    else:
+        # Edited in place; the old amount is unknown, so recompute
+        wallet = CoupleWallet.objects.filter(pk=instance.wallet_id).first()
+        if wallet:
+            CoupleSettlementLedger.rebuild(wallet)
+
+
+@receiver(post_delete, sender=CoupleWalletTransaction)
+def settlement_transaction_deleted(sender, instance, **kwargs):
+    CoupleSettlementLedger.record(instance, sign=-1)
+
+
+# Budget and low-balance alert rules (couple_module/alert_rules.py) run off
+# withdrawals; the wallet and the couple link are what they are compiled from.
+@receiver(post_save, sender=CoupleWalletTransaction)
+def alert_rules_transaction_saved(sender, instance, created, **kwargs):
+    if not created:
+        alert_rules.resync('couple.withdrawals', instance.wallet_id)
+    elif instance.transaction_type == 'WITHDRAWAL':
+        alert_rules.record(
+            'couple.withdrawals', instance.wallet_id, instance.amount,
+            timezone.localdate(instance.created_at), instance.category, balance=instance.balance_after,
+        )
+
+
+@receiver(post_delete, sender=CoupleWalletTransaction)
+def alert_rules_transaction_deleted(sender, instance, **kwargs):
+    alert_rules.resync('couple.withdrawals', instance.wallet_id)
+
+
+@receiver([post_save, post_delete], sender=CoupleWallet)
+def alert_rules_wallet_changed(sender, instance, **kwargs):
+    alert_rules.invalidate('couple.withdrawals', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=CoupleLink)
+def alert_rules_link_changed(sender, instance, **kwargs):
+    users = (instance.user1_id, instance.user2_id)
+    for wallet_id in CoupleWallet.objects.filter(Q(partner1_id__in=users) | Q(partner2_id__in=users)).values_list('pk', flat=True):
+        alert_rules.invalidate('couple.withdrawals', wallet_id)
@@ -0,0 +1,210 @@
+"""
+Monthly summaries for couple wallets.
+
+A month is summarised from a single grouped query over its transactions
+(day x type x category x partner); totals, the category breakdown, the
+daily spending trend and partner contributions are all derived from those
+rows. Closed months are frozen into CoupleMonthlySnapshot rows the first
+time they are needed, so the dashboard and month-over-month history only
+ever query the current month.
+"""
+import logging
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from core.timeseries import bucket_starts, densify
+from .models_wallet import CoupleWalletTransaction, CoupleMonthlySnapshot
+
+logger = logging.getLogger(__name__)
+
+OUTFLOW_TYPES = ('WITHDRAWAL', 'GOAL_TRANSFER', 'EMERGENCY_TRANSFER')
+TRANSFER_TYPES = ('EMERGENCY_TRANSFER', 'GOAL_TRANSFER')
+CATEGORY_TYPES = ('WITHDRAWAL', 'GOAL_TRANSFER')
+
+
+def month_bounds(year, month):
+    """Aware datetimes for the start of the month and of the next month."""
+    start = timezone.make_aware(datetime(year, month, 1))
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return start, timezone.make_aware(datetime(next_year, next_month, 1))
+
+
+def health_score(savings, lifetime_deposits, withdrawals, budget):
+    """
+    Savings rate and budget adherence combined into a 0-100 score.
+
+    Returns:
+        (savings_rate, health_score) as floats
+    """
+    lifetime_deposits = float(lifetime_deposits) or 1.0
+    savings_rate = (float(savings) / lifetime_deposits) * 100
+    budget = float(budget or 0)
+    budget_adherence = 100 - ((float(withdrawals) / budget * 100) if budget > 0 else 0)
+    score = min(max((savings_rate * 0.4) + (budget_adherence * 0.6), 0), 100)
+    return savings_rate, score
+
+
+def compute_month(wallet, year, month, last_day=None):
+    """
+    Summarise one month of a couple wallet with one grouped query.
+
+    Args:
+        wallet: CoupleWallet instance
+        year: Year of the month
+        month: Month number (1-12)
+        last_day: Last local date to include in the spending trend
+            (defaults to the month's last day)
+
+    Returns:
+        Dict of totals, partner deposits, category_breakdown and spending_trend
+    """
+    start, end = month_bounds(year, month)
+    if last_day is None:
+        last_day = (end - timedelta(days=1)).date()
+
+    rows = CoupleWalletTransaction.objects.filter(
+        wallet=wallet, created_at__gte=start, created_at__lt=end
+    ).annotate(day=TruncDate('created_at')).values(
+        'day', 'transaction_type', 'category', 'withdrawn_by__username', 'deposited_by_id'
+    ).annotate(total=Sum('amount'), count=Count('id')).order_by()
+
+    totals = {'DEPOSIT': Decimal('0'), 'WITHDRAWAL': Decimal('0'), 'TRANSFER': Decimal('0')}
+    partner_deposits = {wallet.partner1_id: Decimal('0'), wallet.partner2_id: Decimal('0')}
+    categories = {}
+    daily = {}
+    transaction_count = 0
+
+    for row in rows:
+        amount = row['total'] or Decimal('0')
+        tx_type = row['transaction_type']
+        transaction_count += row['count']
+        if tx_type == 'DEPOSIT':
+            totals['DEPOSIT'] += amount
+            if row['deposited_by_id'] in partner_deposits:
+                partner_deposits[row['deposited_by_id']] += amount
+        elif tx_type == 'WITHDRAWAL':
+            totals['WITHDRAWAL'] += amount
+        if tx_type in TRANSFER_TYPES:
+            totals['TRANSFER'] += amount
+        if tx_type in CATEGORY_TYPES:
+            key = (row['category'], row['withdrawn_by__username'], tx_type)
+            categories[key] = categories.get(key, Decimal('0')) + amount
+        if tx_type in OUTFLOW_TYPES:
+            daily[row['day']] = daily.get(row['day'], Decimal('0')) + amount
+
+    category_breakdown = [
+        {
+            'category': 'SAVINGS GOAL' if tx_type == 'GOAL_TRANSFER' else category,
+            'withdrawn_by': username or str(_('System')),
+            'total': float(total),
+        }
+        for (category, username, tx_type), total in sorted(categories.items(), key=lambda item: item[1], reverse=True)
+    ]
+
+    spending_trend = [
+        {'day': str(current_date.day), 'full_date': str(current_date), 'total': float(total)}
+        for current_date, total in densify(daily, bucket_starts(last_day.replace(day=1), last_day, 'day'))
+    ]
+
+    return {
+        'total_deposits': totals['DEPOSIT'],
+        'total_withdrawals': totals['WITHDRAWAL'],
+        'total_transfers': totals['TRANSFER'],
+        'partner1_deposits': partner_deposits[wallet.partner1_id],
+        'partner2_deposits': partner_deposits[wallet.partner2_id],
+        'transaction_count': transaction_count,
+        'category_breakdown': category_breakdown,
+        'spending_trend': spending_trend,
+    }
+
+
+def freeze_closed_months(wallet, today=None):
+    """
+    Create snapshots for closed months with activity that have none yet.
+
+    Months are frozen in order so each snapshot can carry the running total
+    of deposits; after the first call per month this is two cheap queries.
+
+    Returns:
+        The latest snapshot, or None if the wallet has no closed months
+    """
+    today = today or timezone.localdate()
+    current_start = month_bounds(today.year, today.month)[0]
+
+    latest = CoupleMonthlySnapshot.objects.filter(wallet=wallet).order_by('-year', '-month').first()
+    pending = CoupleWalletTransaction.objects.filter(wallet=wallet, created_at__lt=current_start)
+    if latest:
+        pending = pending.filter(created_at__gte=month_bounds(latest.year, latest.month)[1])
+    months = sorted(pending.annotate(m=TruncMonth('created_at')).values_list('m', flat=True).distinct().order_by())
+
+    cumulative = latest.cumulative_deposits if latest else Decimal('0')
+    for month_start in months:
+        month_start = timezone.localtime(month_start) if timezone.is_aware(month_start) else month_start
+        year, month = month_start.year, month_start.month
+        summary = compute_month(wallet, year, month)
+        cumulative += summary['total_deposits']
+
+        end = month_bounds(year, month)[1]
+        last_tx = CoupleWalletTransaction.objects.filter(wallet=wallet, created_at__lt=end).order_by('-created_at').values(
+            'emergency_fund_after', 'joint_goals_after'
+        ).first() or {}
+        savings = (last_tx.get('emergency_fund_after') or Decimal('0')) + (last_tx.get('joint_goals_after') or Decimal('0'))
+        score = health_score(savings, cumulative, summary['total_withdrawals'], wallet.monthly_budget)[1]
+
+        try:
+            with transaction.atomic():
+                latest = CoupleMonthlySnapshot.objects.create(
+                    wallet=wallet, year=year, month=month,
+                    cumulative_deposits=cumulative,
+                    savings_at_close=savings,
+                    monthly_budget=wallet.monthly_budget,
+                    health_score=Decimal(str(round(score, 1))),
+                    **summary
+                )
+        except IntegrityError:
+            # Frozen concurrently by another request
+            latest = CoupleMonthlySnapshot.objects.get(wallet=wallet, year=year, month=month)
+            cumulative = latest.cumulative_deposits
+    return latest
+
+
+def monthly_history(wallet, months, today=None):
+    """
+    Month-over-month totals and health scores for the last ``months`` months.
+
+    Closed months come from snapshots (months without activity read as
+    zero); the current month is passed in by the caller.
+    """
+    today = today or timezone.localdate()
+    keys = []
+    year, month = today.year, today.month
+    for _step in range(months - 1):
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+        keys.append((year, month))
+    keys.reverse()
+    if not keys:
+        return []
+
+    snapshots = {
+        (s.year, s.month): s
+        for s in CoupleMonthlySnapshot.objects.filter(wallet=wallet, year__gte=keys[0][0]).only(
+            'year', 'month', 'total_deposits', 'total_withdrawals', 'total_transfers', 'health_score'
+        )
+    }
+    history = []
+    for key in keys:
+        snapshot = snapshots.get(key)
+        history.append({
+            'month': f"{key[0]}-{key[1]:02d}",
+            'total_deposits': float(snapshot.total_deposits) if snapshot else 0.0,
+            'total_withdrawals': float(snapshot.total_withdrawals) if snapshot else 0.0,
+            'total_transfers': float(snapshot.total_transfers) if snapshot else 0.0,
+            'health_score': float(snapshot.health_score) if snapshot else None,
+        })
+    return history
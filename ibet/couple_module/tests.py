@@ -65,3 +65,188 @@ class CoupleModuleTestCase(APITestCase):
         # Check wallet balance
         wallet.refresh_from_db()
         self.assertEqual(wallet.balance, 900.00)
+
+
+class CoupleMonthlySummaryTests(APITestCase):
+    def setUp(self):
+        from datetime import datetime
+        from decimal import Decimal
+        from django.utils import timezone
+        from .models_wallet import CoupleWallet, CoupleWalletTransaction
+
+        self.user1 = User.objects.create_user(username='summary1', email='s1@example.com', password='testpass123')
+        self.user2 = User.objects.create_user(username='summary2', email='s2@example.com', password='testpass123')
+        self.wallet = CoupleWallet.objects.create(
+            partner1=self.user1, partner2=self.user2, monthly_budget=Decimal('1000.00')
+        )
+
+        def add(when, tx_type, amount, **extra):
+            tx = CoupleWalletTransaction.objects.create(
+                wallet=self.wallet, amount=Decimal(amount), transaction_type=tx_type,
+                description=tx_type, balance_after=Decimal('0'), **extra
+            )
+            CoupleWalletTransaction.objects.filter(pk=tx.pk).update(created_at=timezone.make_aware(when))
+
+        self.today = timezone.localdate().replace(day=15)
+        last_month = (self.today.replace(day=1) - timezone.timedelta(days=1)).replace(day=10)
+        add(datetime(last_month.year, last_month.month, 10, 12), 'DEPOSIT', '500.00', deposited_by=self.user1)
+        add(datetime(last_month.year, last_month.month, 11, 12), 'WITHDRAWAL', '100.00', withdrawn_by=self.user1, category='Food')
+        add(datetime(self.today.year, self.today.month, 2, 12), 'DEPOSIT', '300.00', deposited_by=self.user2)
+        add(datetime(self.today.year, self.today.month, 3, 12), 'WITHDRAWAL', '50.00', withdrawn_by=self.user2, category='Rent')
+        self.last_month = last_month
+
+    def test_closed_months_are_frozen_once(self):
+        from .models_wallet import CoupleMonthlySnapshot
+        from .summaries import freeze_closed_months
+
+        snapshot = freeze_closed_months(self.wallet, self.today)
+        self.assertEqual((snapshot.year, snapshot.month), (self.last_month.year, self.last_month.month))
+        self.assertEqual(float(snapshot.total_deposits), 500.0)
+        self.assertEqual(float(snapshot.total_withdrawals), 100.0)
+        self.assertEqual(float(snapshot.cumulative_deposits), 500.0)
+
+        with self.assertNumQueries(2):
+            again = freeze_closed_months(self.wallet, self.today)
+        self.assertEqual(again.pk, snapshot.pk)
+        self.assertEqual(CoupleMonthlySnapshot.objects.filter(wallet=self.wallet).count(), 1)
+
+    def test_current_month_in_one_query(self):
+        from .summaries import compute_month
+
+        with self.assertNumQueries(1):
+            summary = compute_month(self.wallet, self.today.year, self.today.month, last_day=self.today)
+        self.assertEqual(float(summary['total_deposits']), 300.0)
+        self.assertEqual(float(summary['partner2_deposits']), 300.0)
+        self.assertEqual(summary['category_breakdown'], [{'category': 'Rent', 'withdrawn_by': 'summary2', 'total': 50.0}])
+        self.assertEqual(len(summary['spending_trend']), 15)
+        self.assertEqual(summary['spending_trend'][2]['total'], 50.0)
+
+    def test_monthly_summary_history(self):
+        from unittest import mock
+
+        self.client.force_authenticate(user=self.user1)
+        with mock.patch('couple_module.views_wallet.timezone.localdate', return_value=self.today):
+            response = self.client.get(reverse('couple-wallet-monthly-summary'), {'months': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_deposits'], 300.0)
+        self.assertEqual(response.data['metrics']['p2_ratio'], 100.0)
+        history = response.data['history']
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history[1]['total_deposits'], 500.0)
+        self.assertEqual(history[2]['total_deposits'], 300.0)
+
+
+class CoupleSettlementLedgerTests(APITestCase):
+    def setUp(self):
+        from decimal import Decimal
+        from .models_wallet import CoupleWallet
+
+        self.user1 = User.objects.create_user(username='ledger1', email='l1@example.com', password='testpass123')
+        self.user2 = User.objects.create_user(username='ledger2', email='l2@example.com', password='testpass123')
+        self.wallet = CoupleWallet.objects.create(partner1=self.user1, partner2=self.user2)
+        self.wallet.deposit(Decimal('300.00'), deposited_by=self.user1)
+        self.wallet.deposit(Decimal('100.00'), deposited_by=self.user2)
+        self.wallet.withdraw(Decimal('80.00'), category='Food', withdrawn_by=self.user2)
+        self.wallet.withdraw(Decimal('20.00'), category='PERSONAL', withdrawn_by=self.user1)
+
+    def test_ledger_tracks_transactions(self):
+        from .models_wallet import CoupleSettlementLedger
+
+        ledger = CoupleSettlementLedger.objects.get(wallet=self.wallet)
+        self.assertEqual(float(ledger.partner1_contributed), 300.0)
+        self.assertEqual(float(ledger.partner2_contributed), 100.0)
+        self.assertEqual(float(ledger.total_shared_expenses), 80.0)
+        self.assertEqual(ledger.transaction_count, 3)
+
+        self.wallet.transactions.filter(transaction_type='WITHDRAWAL', category='Food').get().delete()
+        ledger.refresh_from_db()
+        self.assertEqual(float(ledger.total_shared_expenses), 0.0)
+        self.assertEqual(ledger.transaction_count, 2)
+
+        rebuilt = CoupleSettlementLedger.rebuild(self.wallet)
+        self.assertEqual(float(rebuilt.partner1_contributed), 300.0)
+        self.assertEqual(rebuilt.transaction_count, 2)
+
+    def test_settlement_paginates_history(self):
+        self.client.force_authenticate(user=self.user1)
+        url = reverse('couple-wallet-settlement')
+        response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['owes_to'], 'ledger1')
+        self.assertEqual(float(response.data['amount_owed']), 100.0)
+        self.assertEqual(len(response.data['history']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['history']), 1)
+        self.assertIsNone(response.data['next'])
+
+    def test_settlement_filters_history(self):
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.get(reverse('couple-wallet-settlement'), {'category': 'Food'})
+        self.assertEqual([tx['category'] for tx in response.data['history']], ['Food'])
+        self.assertEqual(float(response.data['amount_owed']), 100.0)
+
+    def test_export_includes_every_row(self):
+        from decimal import Decimal
+
+        for _ in range(60):
+            self.wallet.deposit(Decimal('1.00'), deposited_by=self.user2, description='top up')
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.get(reverse('couple-wallet-settlement-export'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = b''.join(response.streaming_content).decode().strip().splitlines()
+        # Header, 63 shared transactions, no PERSONAL withdrawal
+        self.assertEqual(len(rows), 64)
+
+        response = self.client.get(reverse('couple-wallet-settlement-export'), {'search': 'top up'})
+        rows = b''.join(response.streaming_content).decode().strip().splitlines()
+        self.assertEqual(len(rows), 61)
+
+    def test_export_neutralises_formulas(self):
+        import csv
+        import io
+        from decimal import Decimal
+
+        self.wallet.deposit(Decimal('5.00'), deposited_by=self.user1, description='=HYPERLINK("http://x")')
+        self.wallet.deposit(Decimal('5.00'), deposited_by=self.user1, description='-2+3')
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.get(reverse('couple-wallet-settlement-export'))
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        descriptions = [row[4] for row in rows[1:]]
+        self.assertIn('\'=HYPERLINK("http://x")', descriptions)
+        self.assertIn("'-2+3", descriptions)
+        self.assertEqual(rows[1][5], '5.00')
+
+
+class JointGoalAttainmentTests(APITestCase):
+    def test_goals_include_attainment(self):
+        from datetime import datetime, timedelta
+        from decimal import Decimal
+        from django.utils import timezone
+        from .models_wallet import CoupleWallet, CoupleWalletTransaction, JointGoal
+
+        user1 = User.objects.create_user(username='jointgoal1', password='testpass123')
+        user2 = User.objects.create_user(username='jointgoal2', password='testpass123')
+        link = CoupleLink.objects.create(user1=user1, user2=user2)
+        wallet = CoupleWallet.objects.create(partner1=user1, partner2=user2)
+        month = timezone.localdate().replace(day=1)
+        for _ in range(4):
+            month = (month - timedelta(days=1)).replace(day=1)
+            tx = CoupleWalletTransaction.objects.create(
+                wallet=wallet, amount=Decimal('2000.00'), transaction_type='DEPOSIT', description='Deposit',
+                balance_after=Decimal('0'), deposited_by=user1,
+            )
+            CoupleWalletTransaction.objects.filter(pk=tx.pk).update(
+                created_at=timezone.make_aware(datetime(month.year, month.month, 3, 12))
+            )
+        JointGoal.objects.create(couple=link, name='Trip', target_amount=Decimal('10000'))
+
+        self.client.force_authenticate(user=user2)
+        response = self.client.get(reverse('couple-wallet-goals'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        attainment = response.data[0]['attainment']
+        self.assertEqual(attainment['status'], 'NO_DEADLINE')
+        self.assertEqual(attainment['median_months'], 5)
+        self.assertEqual(attainment['history_months'], 4)
@@ -0,0 +1,22 @@
+"""Time-series metrics for couples (see core/timeseries.py)."""
+from django.db.models import Q
+
+from core.timeseries import metrics
+from .models_wallet import CoupleWalletTransaction
+from .summaries import OUTFLOW_TYPES
+
+
+@metrics.register('couple.outflows', date_field='created_at', split_field='category')
+def couple_outflows(user):
+    return CoupleWalletTransaction.objects.filter(
+        Q(wallet__partner1=user) | Q(wallet__partner2=user),
+        transaction_type__in=OUTFLOW_TYPES,
+    )
+
+
+@metrics.register('couple.deposits', date_field='created_at', split_field='deposited_by__username')
+def couple_deposits(user):
+    return CoupleWalletTransaction.objects.filter(
+        Q(wallet__partner1=user) | Q(wallet__partner2=user),
+        transaction_type='DEPOSIT',
+    )
@@ -9,6 +9,8 @@ from django.utils import timezone
 from datetime import datetime, timedelta
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
+from core.conditional import conditional_get
+from core.concurrency import run_concurrently
 from .models import (
     CoupleLink, SharedWallet, SpendingRequest, SharedTransaction,
     CoupleDashboard, CoupleAlert
@@ -203,6 +205,7 @@ class CoupleOverviewView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_get()
     def get(self, request, *args, **kwargs):
         user = request.user
 
@@ -219,57 +222,45 @@ class CoupleOverviewView(APIView):
             )
 
         # Get wallet information (Use CoupleWallet instead of legacy SharedWallet)
-        from .models_wallet import CoupleWallet
-        try:
-            wallet = CoupleWallet.objects.get(
-                Q(partner1=couple.user1, partner2=couple.user2) |
-                Q(partner1=couple.user2, partner2=couple.user1)
-            )
-            wallet_balance = wallet.balance
-            monthly_budget = wallet.monthly_budget
-        except CoupleWallet.DoesNotExist:
-            wallet_balance = 0.00
-            monthly_budget = 0.00
-
-        # Count pending requests
-        pending_requests_count = SpendingRequest.objects.filter(
-            couple=couple,
-            status='PENDING'
-        ).count()
-
-        # Get recent transactions (last 10)
-        from .models_wallet import CoupleWalletTransaction
-        recent_transactions = []
-        if 'wallet' in locals():
-            recent_transactions = CoupleWalletTransaction.objects.filter(
-                wallet=wallet
-            ).order_by('-created_at')[:10]
-
-        # Count unread alerts for current user
-        unread_alerts_count = CoupleAlert.objects.filter(
-            couple=couple
-        ).exclude(
-            Q(is_read_user1=True) if user == couple.user1 else Q(is_read_user2=True)
-        ).count()
-
-        # Create the response data
+        from .models_wallet import CoupleWallet, CoupleWalletTransaction
+        from .serializers_wallet import CoupleWalletTransactionSerializer
+        wallet = CoupleWallet.objects.filter(
+            Q(partner1=couple.user1, partner2=couple.user2) |
+            Q(partner1=couple.user2, partner2=couple.user1)
+        ).first()
+
+        def recent_transactions():
+            # Last 10
+            if not wallet:
+                return []
+            return CoupleWalletTransactionSerializer(
+                CoupleWalletTransaction.objects.filter(wallet=wallet).order_by('-created_at')[:10], many=True
+            ).data
+
+        # Independent reads; run concurrently
+        results = run_concurrently({
+            'couple_info': lambda: CoupleLinkSerializer(couple).data,
+            'pending_requests_count': lambda: SpendingRequest.objects.filter(
+                couple=couple,
+                status='PENDING'
+            ).count(),
+            # Count unread alerts for current user
+            'unread_alerts_count': lambda: CoupleAlert.objects.filter(
+                couple=couple
+            ).exclude(
+                Q(is_read_user1=True) if user == couple.user1 else Q(is_read_user2=True)
+            ).count(),
+            'recent_transactions': recent_transactions,
+        })
+
         response_data = {
-            'couple_info': CoupleLinkSerializer(couple).data,
-            'wallet_balance': float(wallet_balance),
-            'monthly_budget': float(monthly_budget),
-            'pending_requests_count': pending_requests_count,
-            'unread_alerts_count': unread_alerts_count,
-            'recent_transactions': []
+            'couple_info': results['couple_info'],
+            'wallet_balance': float(wallet.balance if wallet else 0.00),
+            'monthly_budget': float(wallet.monthly_budget if wallet else 0.00),
+            'pending_requests_count': results['pending_requests_count'],
+            'unread_alerts_count': results['unread_alerts_count'],
+            'recent_transactions': results['recent_transactions']
         }
-        
-        # Handle transaction serialization robustly
-        if recent_transactions:
-            try:
-                from .serializers_wallet import CoupleWalletTransactionSerializer
-                response_data['recent_transactions'] = CoupleWalletTransactionSerializer(recent_transactions, many=True).data
-            except ImportError:
-                # Fallback to general serializer if specific one fails to import
-                response_data['recent_transactions'] = SharedTransactionSerializer(recent_transactions, many=True).data
 
         return Response(response_data)
 
@@ -2,8 +2,13 @@
 Secure wallet views for Couple Module.
 Provides secure shared wallet operations with OTP protection and monitoring.
 """
+import csv
+import io
+
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.utils.translation import gettext_lazy as _
@@ -12,9 +17,11 @@ from core.throttling import OTPGenerationThrottle, OTPVerificationThrottle, Wall
 from core.security import OTPSecurityService, SecurityUtils
 from core.security_monitoring import SecurityEventManager, AuditService
 from core.permissions import OTPGenerationPermission, OTPVerificationPermission
-from .models_wallet import CoupleWallet, CoupleWalletTransaction, CoupleWalletOTPRequest
+from .models_wallet import CoupleWallet, CoupleWalletTransaction, CoupleWalletOTPRequest, CoupleSettlementLedger
 from .serializers_wallet import CoupleWalletSerializer, CoupleWalletTransactionSerializer
-from django.db.models import Sum, Q, Count
+from core.downsample import downsample, max_points_param
+from .summaries import compute_month, freeze_closed_months, health_score, monthly_history
+from django.db.models import Q
 from django.utils import timezone
 from decimal import Decimal, InvalidOperation
 
@@ -37,6 +44,76 @@ def validate_and_convert_amount(amount_data):
         return None, _("Invalid amount format")
 
 
+class SettlementHistoryPagination(CursorPagination):
+    """Keyset pagination over a wallet's shared transactions, newest first."""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
+
+
+def settlement_summary(wallet):
+    """Contribution balance between partners from the running settlement ledger."""
+    ledger = CoupleSettlementLedger.for_wallet(wallet)
+    p1_contrib = ledger.partner1_contributed
+    p2_contrib = ledger.partner2_contributed
+    total_shared = ledger.total_shared_expenses
+
+    ideal_share = total_shared / Decimal(2)
+    diff = p1_contrib - p2_contrib
+    amount_owed = abs(diff) / Decimal(2)
+    owes_to = None
+    if diff > 0:
+        owes_to = wallet.partner1.username
+    elif diff < 0:
+        owes_to = wallet.partner2.username
+
+    return {
+        'partner1_contributed': p1_contrib,
+        'partner2_contributed': p2_contrib,
+        'total_shared_expenses': total_shared,
+        'ideal_share': ideal_share,
+        'imbalance': diff,
+        'owes_to': owes_to,
+        'amount_owed': amount_owed,
+        'transaction_count': ledger.transaction_count,
+    }
+
+
+def settlement_history(wallet, params):
+    """Shared (non-personal) transactions of a wallet, filtered by ``search`` and ``category``."""
+    txs = CoupleWalletTransaction.objects.filter(wallet=wallet).exclude(
+        category='PERSONAL'
+    ).select_related('deposited_by', 'withdrawn_by')
+    if params.get('search'):
+        txs = txs.filter(description__icontains=params['search'])
+    if params.get('category') and params['category'] != 'ALL':
+        txs = txs.filter(category=params['category'])
+    return txs
+
+
+# Leading characters that make a spreadsheet treat a cell as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def csv_text(value):
+    """User-entered text for a CSV cell, quoted so spreadsheets never evaluate it."""
+    value = '' if value is None else str(value)
+    return f"'{value}" if value.startswith(CSV_FORMULA_PREFIXES) else value
+
+
+def settlement_history_row(t):
+    return {
+        'id': t.id,
+        'amount': float(t.amount),
+        'type': t.transaction_type,
+        'category': t.category,
+        'description': t.description,
+        'user': t.deposited_by.username if t.deposited_by else (t.withdrawn_by.username if t.withdrawn_by else 'System'),
+        'date': t.created_at
+    }
+
+
 class CoupleWalletViewSet(viewsets.ModelViewSet):
     """
     Secure API endpoint for couple wallet management.
@@ -300,114 +377,73 @@ class CoupleWalletViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def monthly_summary(self, request):
-        """Get enhanced monthly transaction summary for dashboard charts"""
+        """
+        Get enhanced monthly transaction summary for dashboard charts.
+
+        The current month comes from one grouped query; closed months are
+        frozen snapshots (see couple_module/summaries.py). Pass ?months=N for
+        a month-over-month history of the last N months, and ?max_points=N to
+        downsample the daily spending trend (LTTB).
+        """
+        try:
+            max_points = max_points_param(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         try:
             wallet = self.get_object()
-            from django.utils.timezone import localdate
-            today_date = localdate()
-            
-            # Start of month in local time
-            current_month_start_date = today_date.replace(day=1)
-            
-            # Use __date lookup for transactions to ensure local date matching
-            transactions = CoupleWalletTransaction.objects.filter(
-                wallet=wallet,
-                created_at__date__gte=current_month_start_date,
-                created_at__date__lte=today_date
-            )
-            
-            summary = transactions.aggregate(
-                total_deposits=Sum('amount', filter=Q(transaction_type='DEPOSIT')),
-                total_withdrawals=Sum('amount', filter=Q(transaction_type='WITHDRAWAL')),
-                total_transfers=Sum('amount', filter=Q(transaction_type__in=['EMERGENCY_TRANSFER', 'GOAL_TRANSFER'])),
-                transaction_count=Count('id')
-            )
+            today_date = timezone.localdate()
 
-            # 2. Category Breakdown (Pie Chart) with Partner Attribution
-            # Include WITHDRAWAL and GOAL_TRANSFER
-            category_qs = transactions.filter(
-                transaction_type__in=['WITHDRAWAL', 'GOAL_TRANSFER']
-            ).values('category', 'withdrawn_by__username', 'transaction_type').annotate(
-                total=Sum('amount')
-            ).order_by('-total')
-            
-            category_data = []
-            for item in category_qs:
-                cat_label = item['category']
-                if item['transaction_type'] == 'GOAL_TRANSFER':
-                    cat_label = 'SAVINGS GOAL'
-                
-                category_data.append({
-                    'category': cat_label,
-                    'withdrawn_by': item['withdrawn_by__username'] or _('System'),
-                    'total': float(item['total'] or 0)
-                })
+            latest_snapshot = freeze_closed_months(wallet, today_date)
+            summary = compute_month(wallet, today_date.year, today_date.month, last_day=today_date)
 
-            # 3. Spending Trend (Continuous Daily Breakdown for current month)
-            # Include all outflows (Withdrawals + Transfers to goals)
-            daily_spending_qs = transactions.filter(
-                transaction_type__in=['WITHDRAWAL', 'GOAL_TRANSFER', 'EMERGENCY_TRANSFER']
-            ).values('created_at__date').annotate(
-                total=Sum('amount')
-            ).order_by('created_at__date')
-            
-            # Map by date object for reliability
-            data_map = {item['created_at__date']: float(item['total'] or 0) for item in daily_spending_qs}
-            
-            spending_trend = []
-            import calendar
-            
-            # Fill every day of the month from 1st to today (using local date)
-            for day in range(1, today_date.day + 1):
-                current_date = today_date.replace(day=day)
-                spending_trend.append({
-                    'day': str(day),
-                    'full_date': str(current_date),
-                    'total': data_map.get(current_date, 0.0)
-                })
-
-            # 4. Contribution Ratio
-            p1_contrib = transactions.filter(transaction_type='DEPOSIT', deposited_by=wallet.partner1).aggregate(total=Sum('amount'))['total'] or Decimal(0)
-            p2_contrib = transactions.filter(transaction_type='DEPOSIT', deposited_by=wallet.partner2).aggregate(total=Sum('amount'))['total'] or Decimal(0)
-            
+            # Contribution Ratio
+            p1_contrib = summary['partner1_deposits']
+            p2_contrib = summary['partner2_deposits']
             total_contrib = float(p1_contrib + p2_contrib)
             p1_ratio = (float(p1_contrib) / total_contrib * 100) if total_contrib > 0 else 50
             p2_ratio = (float(p2_contrib) / total_contrib * 100) if total_contrib > 0 else 50
 
-            # 5. Financial Health Score
-            total_transfers = float(summary['total_transfers'] or 0)
-            total_deposits = float(summary['total_deposits'] or 0)
-            total_withdrawals = float(summary['total_withdrawals'] or 0)
-            
-            # Use total accumulated savings for a more stable savings rate
-            total_savings = float(wallet.emergency_fund + wallet.joint_goals)
-            
-            # Get lifetime deposits for this wallet to calculate overall rate
-            lifetime_deposits = CoupleWalletTransaction.objects.filter(
-                wallet=wallet, transaction_type='DEPOSIT'
-            ).aggregate(total=Sum('amount'))['total'] or Decimal('1.00')
-            
-            savings_rate = (total_savings / float(lifetime_deposits)) * 100
-            
+            # Financial Health Score
+            total_transfers = float(summary['total_transfers'])
+            total_deposits = float(summary['total_deposits'])
+            total_withdrawals = float(summary['total_withdrawals'])
+
+            # Use total accumulated savings for a more stable savings rate,
+            # over lifetime deposits (closed months' running total + this month)
+            total_savings = wallet.emergency_fund + wallet.joint_goals
+            lifetime_deposits = (latest_snapshot.cumulative_deposits if latest_snapshot else Decimal('0')) + summary['total_deposits']
+            savings_rate, health = health_score(total_savings, lifetime_deposits or Decimal('1.00'), total_withdrawals, wallet.monthly_budget)
             budget_val = float(wallet.monthly_budget or 0)
-            budget_adherence = 100 - ((total_withdrawals / budget_val * 100) if budget_val > 0 else 0)
-            health_score = min(max((savings_rate * 0.4) + (budget_adherence * 0.6), 0), 100)
 
-            return Response({
+            response = {
                 'month_name': today_date.strftime('%B %Y'),
                 'total_deposits': total_deposits,
                 'total_withdrawals': total_withdrawals,
                 'total_transfers': total_transfers,
                 'monthly_budget': budget_val,
-                'category_breakdown': category_data,
-                'spending_trend': spending_trend,
+                'category_breakdown': summary['category_breakdown'],
+                'spending_trend': downsample(summary['spending_trend'], max_points, y_key='total'),
                 'metrics': {
                     'savings_rate': round(savings_rate, 1),
                     'p1_ratio': round(p1_ratio, 1),
                     'p2_ratio': round(p2_ratio, 1),
-                    'health_score': round(health_score, 0)
+                    'health_score': round(health, 0)
                 }
-            })
+            }
+
+            months = request.query_params.get('months')
+            if months and months.isdigit() and int(months) > 1:
+                history = monthly_history(wallet, min(int(months), 36), today_date)
+                history.append({
+                    'month': today_date.strftime('%Y-%m'),
+                    'total_deposits': total_deposits,
+                    'total_withdrawals': total_withdrawals,
+                    'total_transfers': total_transfers,
+                    'health_score': round(health, 1),
+                })
+                response['history'] = history
+
+            return Response(response)
 
         except CoupleWallet.DoesNotExist:
             return Response({'error': _('Couple wallet not found')}, status=status.HTTP_404_NOT_FOUND)
@@ -528,15 +564,18 @@ class CoupleWalletViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def goals(self, request):
         from .models_wallet import JointGoal
+        from .goal_odds import joint_goal_attainment
         goals = JointGoal.objects.filter(couple__user1=request.user) | JointGoal.objects.filter(couple__user2=request.user)
+        today = timezone.localdate()
         return Response([{
             'id': g.id,
             'name': g.name,
             'target_amount': g.target_amount,
             'current_amount': g.current_amount,
             'deadline': g.deadline,
-            'progress_percentage': g.progress_percentage
-        } for g in goals.distinct()])
+            'progress_percentage': g.progress_percentage,
+            'attainment': joint_goal_attainment(g, today),
+        } for g in goals.distinct().select_related('couple')])
 
     @action(detail=False, methods=['post'])
     def goals_create(self, request):
@@ -606,48 +645,48 @@ class CoupleWalletViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def settlement(self, request):
+        """
+        Settlement totals plus one page of shared transaction history.
+
+        Totals come from the settlement ledger; the history is cursor
+        paginated (follow ``next``/``previous``, ``?page_size=`` up to 200)
+        and filtered with ``?search=`` and ``?category=``. The full history
+        is available as CSV from ``settlement/export/``.
+        """
         wallet = self.get_object()
-        from .models_wallet import CoupleWalletTransaction
-        # Get only shared transactions (exclude PERSONAL)
-        txs = CoupleWalletTransaction.objects.filter(wallet=wallet).exclude(category='PERSONAL').order_by('-created_at')
-        
-        p1_contrib = txs.filter(transaction_type='DEPOSIT', deposited_by=wallet.partner1).aggregate(Sum('amount'))['amount__sum'] or Decimal(0)
-        p2_contrib = txs.filter(transaction_type='DEPOSIT', deposited_by=wallet.partner2).aggregate(Sum('amount'))['amount__sum'] or Decimal(0)
-        total_shared = txs.filter(transaction_type='WITHDRAWAL').aggregate(Sum('amount'))['amount__sum'] or Decimal(0)
-        
-        ideal_share = total_shared / Decimal(2)
-        p1_net = p1_contrib
-        p2_net = p2_contrib
-        
-        diff = p1_net - p2_net
-        amount_owed = abs(diff) / Decimal(2)
-        owes_to = None
-        if diff > 0:
-            owes_to = wallet.partner1.username
-        elif diff < 0:
-            owes_to = wallet.partner2.username
-            
-        # Serialize history for the settlement view
-        history = [{
-            'id': t.id,
-            'amount': float(t.amount),
-            'type': t.transaction_type,
-            'category': t.category,
-            'description': t.description,
-            'user': t.deposited_by.username if t.deposited_by else (t.withdrawn_by.username if t.withdrawn_by else 'System'),
-            'date': t.created_at
-        } for t in txs]
-
-        return Response({
-            'partner1_contributed': p1_contrib,
-            'partner2_contributed': p2_contrib,
-            'total_shared_expenses': total_shared,
-            'ideal_share': ideal_share,
-            'imbalance': diff,
-            'owes_to': owes_to,
-            'amount_owed': amount_owed,
-            'history': history
-        })
+        paginator = SettlementHistoryPagination()
+        page = paginator.paginate_queryset(settlement_history(wallet, request.query_params), request, view=self)
+
+        data = settlement_summary(wallet)
+        data['history'] = [settlement_history_row(t) for t in page]
+        data['next'] = paginator.get_next_link()
+        data['previous'] = paginator.get_previous_link()
+        return Response(data)
+
+    @action(detail=False, methods=['get'], url_path='settlement/export')
+    def settlement_export(self, request):
+        """Every shared transaction matching ``?search=``/``?category=`` as CSV, newest first."""
+        wallet = self.get_object()
+        txs = settlement_history(wallet, request.query_params).order_by('-created_at', '-id')
+
+        def rows():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(['Date', 'Partner', 'Type', 'Category', 'Description', 'Amount'])
+            for t in txs.iterator(chunk_size=500):
+                row = settlement_history_row(t)
+                writer.writerow([
+                    timezone.localtime(row['date']).date().isoformat(), csv_text(row['user']), row['type'],
+                    csv_text(row['category']), csv_text(row['description']), f"{row['amount']:.2f}",
+                ])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+
+        response = StreamingHttpResponse(rows(), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="joint_spending_{timezone.localdate().isoformat()}.csv"'
+        return response
 
 
 class CoupleWalletTransactionViewSet(viewsets.ReadOnlyModelViewSet):
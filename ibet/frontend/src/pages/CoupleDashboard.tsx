@@ -65,6 +65,9 @@ interface SettlementData {
   imbalance: number;
   owes_to: string | null;
   amount_owed: number;
+  history: any[];
+  next: string | null;
+  previous: string | null;
 }
 
 const JOINT_CATEGORIES = [
@@ -136,35 +139,46 @@ export default function CoupleDashboard() {
   const [partnerUsername, setPartnerUsername] = useState('');
   const [linking, setLinking] = useState(false);
 
-  const downloadSettlementCSV = () => {
-    if (!settlement || !(settlement as any).history) return;
-    
-    const history = (settlement as any).history;
-    const headers = ['Date', 'Partner', 'Type', 'Category', 'Description', 'Amount'];
-    const rows = history.map((tx: any) => [
-      new Date(tx.date).toLocaleDateString(),
-      tx.user,
-      tx.type,
-      tx.category,
-      tx.description.replace(/,/g, ' '),
-      tx.amount
-    ]);
-
-    const csvContent = [
-      headers.join(','),
-      ...rows.map((r: any) => r.join(','))
-    ].join('\n');
-
-    const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
-    const url = URL.createObjectURL(blob);
-    const link = document.createElement('a');
-    link.setAttribute('href', url);
-    link.setAttribute('download', `joint_spending_${new Date().toISOString().split('T')[0]}.csv`);
-    document.body.appendChild(link);
-    link.click();
-    document.body.removeChild(link);
+  const settlementFilters = () => ({ search: settlementSearch, category: settlementCategoryFilter });
+
+  // The history is paginated; the CSV comes from the export endpoint so it covers every row
+  const downloadSettlementCSV = async () => {
+    try {
+      const blob = await api.downloadCoupleSettlementCSV(settlementFilters());
+      const url = URL.createObjectURL(blob);
+      const link = document.createElement('a');
+      link.setAttribute('href', url);
+      link.setAttribute('download', `joint_spending_${new Date().toISOString().split('T')[0]}.csv`);
+      document.body.appendChild(link);
+      link.click();
+      document.body.removeChild(link);
+      URL.revokeObjectURL(url);
+    } catch (err) {
+      console.error(err);
+      setError('Failed to export settlement history.');
+    }
   };
 
+  const loadMoreSettlement = async () => {
+    if (!settlement?.next) return;
+    try {
+      const page = await api.getPage(settlement.next);
+      setSettlement(prev => prev && { ...prev, history: [...prev.history, ...page.history], next: page.next });
+    } catch (err) {
+      console.error(err);
+      setError('Failed to load more history.');
+    }
+  };
+
+  // Search and category filters run on the server over the whole history
+  useEffect(() => {
+    if (activeTab !== 'settlement') return;
+    const timer = setTimeout(() => {
+      api.getCoupleSettlement(settlementFilters()).then(setSettlement).catch(err => console.error(err));
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [settlementSearch, settlementCategoryFilter]);
+
   useEffect(() => {
     // FORCE fetch profile on mount to ensure we have the correct user for THIS token
     api.getProfile().then(profile => {
@@ -213,7 +227,7 @@ export default function CoupleDashboard() {
         const requestsData = await api.getSpendingRequests();
         setRequests(requestsData);
       } else if (activeTab === 'settlement') {
-        const settlementData = await api.getCoupleSettlement();
+        const settlementData = await api.getCoupleSettlement(settlementFilters());
         setSettlement(settlementData);
       }
     } catch (err) {
@@ -792,13 +806,7 @@ export default function CoupleDashboard() {
                         </tr>
                       </thead>
                       <tbody>
-                        {(settlement as any).history
-                          ?.filter((tx: any) => {
-                            const matchesSearch = tx.description.toLowerCase().includes(settlementSearch.toLowerCase());
-                            const matchesCat = settlementCategoryFilter === 'ALL' || tx.category === settlementCategoryFilter;
-                            return matchesSearch && matchesCat;
-                          })
-                          .map((tx: any) => (
+                        {settlement.history.map((tx: any) => (
                           <tr key={tx.id}>
                             <td>{new Date(tx.date).toLocaleDateString()}</td>
                             <td><strong>{tx.user}</strong></td>
@@ -812,6 +820,11 @@ export default function CoupleDashboard() {
                       </tbody>
                     </table>
                   </div>
+                  {settlement.next && (
+                    <button onClick={loadMoreSettlement} className="print-btn" style={{ marginTop: '1rem' }}>
+                      Load more
+                    </button>
+                  )}
                 </div>
               </div>
             ) : (
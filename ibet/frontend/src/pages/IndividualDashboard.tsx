@@ -41,9 +41,11 @@ interface TodaySpending {
 }
 
 interface DailyData {
+  index: number;
   day: number;
   date: string;
   amount: number;
+  count: number;
 }
 
 interface YearlyData {
@@ -572,7 +574,7 @@ export default function IndividualDashboard() {
         <div className="info-cards" style={{ gridTemplateColumns: 'repeat(auto-fit, minmax(400px, 1fr))' }}>
           {/* Daily Expenditure Chart */}
           <div className="info-card" style={{ minHeight: '400px' }}>
-            <h3>📈 Spending Analysis (Every Withdrawal)</h3>
+            <h3>📈 Spending Analysis (Daily)</h3>
             <div style={{ width: '100%', height: '300px', marginTop: '1rem', minWidth: 0, minHeight: 0 }}>
               <ResponsiveContainer width="99%" height={300}>
                 <AreaChart data={dailyChartData}>
@@ -588,7 +590,7 @@ export default function IndividualDashboard() {
                     axisLine={false} 
                     tickLine={false} 
                     tick={{ fontSize: 10, fill: '#999' }}
-                    label={{ value: 'Your Transactions (Order)', position: 'insideBottom', offset: -5, fontSize: 12 }}
+                    label={{ value: 'Day of Month', position: 'insideBottom', offset: -5, fontSize: 12 }}
                   />
                   <YAxis 
                     axisLine={false} 
@@ -604,8 +606,7 @@ export default function IndividualDashboard() {
                           <div style={{ background: 'white', padding: '10px', border: '1px solid #ccc', borderRadius: '8px', boxShadow: '0 4px 12px rgba(0,0,0,0.1)' }}>
                             <p style={{ margin: 0, fontWeight: 'bold', color: '#667eea' }}>{data.date}</p>
                             <p style={{ margin: '4px 0', fontSize: '1.1rem', fontWeight: 'bold' }}>₹{data.amount}</p>
-                            <p style={{ margin: 0, color: '#333' }}>{data.category}: {data.description}</p>
-                            <p style={{ margin: 0, color: '#999', fontSize: '0.75rem' }}>Transaction #{data.index}</p>
+                            <p style={{ margin: 0, color: '#999', fontSize: '0.75rem' }}>{data.count} {data.count === 1 ? 'expense' : 'expenses'}</p>
                           </div>
                         );
                       }
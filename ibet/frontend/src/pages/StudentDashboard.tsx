@@ -73,14 +73,64 @@ export default function StudentDashboard() {
 
   useEffect(() => {
     loadStudentData();
-    
-    // Dynamic Mode: Background Polling every 30 seconds
-    const pollInterval = setInterval(() => {
-      loadStudentData(true);
-    }, 30000);
+
+    // Poll every 30 seconds until the event stream is open and whenever it
+    // drops; while it is open, refetch only when the server pushes a change.
+    let pollInterval: ReturnType<typeof setInterval> | null = null;
+    const startPolling = () => {
+      if (!pollInterval) {
+        pollInterval = setInterval(() => loadStudentData(true), 30000);
+      }
+    };
+    const stopPolling = () => {
+      if (pollInterval) {
+        clearInterval(pollInterval);
+        pollInterval = null;
+      }
+    };
+
+    let events: EventSource | null = null;
+    let reconnect: ReturnType<typeof setTimeout> | null = null;
+    let lastEventId = '';
+    let disposed = false;
+
+    const connect = async () => {
+      const stream = await api.openEventStream(lastEventId).catch(() => null);
+      if (disposed) {
+        stream?.close();
+        return;
+      }
+      if (!stream) return;
+      events = stream;
+      const remember = (event: Event) => {
+        lastEventId = (event as MessageEvent).lastEventId || lastEventId;
+      };
+      const refresh = (event: Event) => {
+        remember(event);
+        loadStudentData(true);
+      };
+      stream.addEventListener('ready', remember);
+      ['balance', 'lock', 'notification', 'otp_request', 'spending_request', 'refresh'].forEach((type) =>
+        stream.addEventListener(type, refresh)
+      );
+      stream.onopen = stopPolling;
+      stream.onerror = () => {
+        startPolling();
+        // Tickets are single-use, so the browser's own reconnect fails once a
+        // stream ends; open a new one with a fresh ticket instead.
+        stream.close();
+        reconnect = setTimeout(connect, 5000);
+      };
+    };
+
+    startPolling();
+    connect();
 
     return () => {
-      clearInterval(pollInterval);
+      disposed = true;
+      events?.close();
+      if (reconnect) clearTimeout(reconnect);
+      stopPolling();
     };
   }, []);
 
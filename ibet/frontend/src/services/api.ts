@@ -98,6 +98,19 @@ class ApiService {
     return text ? JSON.parse(text) : {} as T;
   }
 
+  // Server-Sent Events stream of "something changed" notifications, opened
+  // with a single-use ticket so the auth token never appears in a URL.
+  // Resolves to null when EventSource or server-side streaming is
+  // unavailable so callers keep polling.
+  async openEventStream(lastEventId?: string): Promise<EventSource | null> {
+    if (!this.token || typeof EventSource === 'undefined') return null;
+    const { ticket } = await this.request<{ ticket: string | null }>('/events/ticket/', { method: 'POST' });
+    if (!ticket) return null;
+    const query = new URLSearchParams({ ticket });
+    if (lastEventId) query.set('last_event_id', lastEventId);
+    return new EventSource(`${API_BASE_URL}/events/stream/?${query.toString()}`);
+  }
+
   // Auth endpoints
   async login(username: string, password: string): Promise<LoginResponse> {
     return this.request<LoginResponse>('/auth/login/', {
@@ -268,6 +281,7 @@ class ApiService {
   // Parent endpoints
   async getLinkedStudents(): Promise<any> { return this.request('/parent/students/'); }
   async getStudentOverview(studentId: number): Promise<any> { return this.request(`/parent/students/${studentId}/overview/`); }
+  async getFamilyOverview(): Promise<any> { return this.request('/parent/family-overview/'); }
   async generateParentOTP(studentId: number, amount: number, reason: string): Promise<any> {
     return this.request('/parent/generate-otp/', {
       method: 'POST', body: JSON.stringify({ student_id: studentId, amount_requested: amount, reason }),
@@ -613,6 +627,38 @@ async setTransactionPIN(pin: string): Promise<any> {    return this.request('/pa
     return this.request('/individual/wallet/yearly_spending_summary/');
   }
 
+  async getIndividualForecast(months?: number, maxPoints?: number): Promise<any> {
+    const query = new URLSearchParams();
+    if (months) query.set('months', String(months));
+    if (maxPoints) query.set('max_points', String(maxPoints));
+    const qs = query.toString();
+    return this.request(`/individual/forecast/${qs ? `?${qs}` : ''}`);
+  }
+
+  async getTimeSeries(metric: string, params: { bucket?: 'day' | 'week' | 'month' | 'year'; start?: string; end?: string; split?: boolean } = {}): Promise<any> {
+    const query = new URLSearchParams();
+    if (params.bucket) query.set('bucket', params.bucket);
+    if (params.start) query.set('start', params.start);
+    if (params.end) query.set('end', params.end);
+    if (params.split) query.set('split', '1');
+    const qs = query.toString();
+    return this.request(`/timeseries/${metric}/${qs ? `?${qs}` : ''}`);
+  }
+
+  async getSpendingHeatmap(metric: string, year?: number): Promise<any> {
+    return this.request(`/timeseries/${metric}/heatmap/${year ? `?year=${year}` : ''}`);
+  }
+
+  async getCohortPercentile(params: { user?: number; month?: string; category?: string; institute?: number[] } = {}): Promise<any> {
+    const query = new URLSearchParams();
+    if (params.user) query.set('user', String(params.user));
+    if (params.month) query.set('month', params.month);
+    if (params.category) query.set('category', params.category);
+    if (params.institute?.length) query.set('institute', params.institute.join(','));
+    const qs = query.toString();
+    return this.request(`/cohorts/percentile/${qs ? `?${qs}` : ''}`);
+  }
+
   async generateIndividualOTP(operationType: string, amount?: number, description?: string): Promise<any> {
     return this.request('/individual/generate-otp/', {
       method: 'POST',
@@ -683,8 +729,29 @@ async setTransactionPIN(pin: string): Promise<any> {    return this.request('/pa
   async respondToSpendingRequest(id: number, action: 'approve' | 'reject'): Promise<any> {
     return this.request(`/couple/spending-requests/${id}/respond/`, { method: 'POST', body: JSON.stringify({ action }) });
   }
-  async getCoupleSettlement(): Promise<any> {
-    return this.request('/couple/wallet/settlement/');
+  // Settlement totals and the first page of shared history; follow `next` with getPage()
+  async getCoupleSettlement(filters: { search?: string; category?: string } = {}): Promise<any> {
+    return this.request(`/couple/wallet/settlement/${this.settlementQuery(filters)}`);
+  }
+  // Whole (filtered) shared history as CSV
+  async downloadCoupleSettlementCSV(filters: { search?: string; category?: string } = {}): Promise<Blob> {
+    const headers: HeadersInit = {};
+    if (this.token) headers['Authorization'] = `Token ${this.token}`;
+    const response = await fetch(`${API_BASE_URL}/couple/wallet/settlement/export/${this.settlementQuery(filters)}`, { headers });
+    if (!response.ok) throw new Error('Export failed');
+    return response.blob();
+  }
+  private settlementQuery(filters: { search?: string; category?: string }): string {
+    const query = new URLSearchParams();
+    if (filters.search) query.set('search', filters.search);
+    if (filters.category && filters.category !== 'ALL') query.set('category', filters.category);
+    const qs = query.toString();
+    return qs ? `?${qs}` : '';
+  }
+  // Follow a `next`/`previous` link of a paginated response
+  async getPage(url: string): Promise<any> {
+    const { pathname, search } = new URL(url, window.location.origin);
+    return this.request(`${pathname.replace(API_BASE_URL, '')}${search}`);
   }
   async setCoupleBudget(amount: number): Promise<any> {
     return this.request('/couple/wallet/set_budget/', { method: 'POST', body: JSON.stringify({ monthly_budget: amount }) });
@@ -0,0 +1,48 @@
+"""Budget alert rules for individual users (see core/alert_rules.py)."""
+from decimal import Decimal
+
+from core.alert_rules import Rule, rules
+from .models import IndividualExpense, SpendingAlert
+from .models_wallet import IndividualWallet
+
+SPENDING_THRESHOLDS = (
+    (50, 'SPENT_50', '50% Spending Alert', 'You have spent 50% (₹{spent}) of your total budget/deposits (₹{limit}).'),
+    (80, 'SPENT_80', '80% Spending Alert', 'Warning! You have spent 80% (₹{spent}) of your total budget/deposits (₹{limit}).'),
+)
+
+
+@rules.ledger('individual.expenses', date_field='expense_date', category_field='category')
+def individual_expenses(owner_id):
+    return IndividualExpense.objects.filter(user_id=owner_id)
+
+
+def create_spending_alert(rule, total):
+    limit = rule.data['limit']
+    return SpendingAlert.objects.create(
+        user_id=rule.data['user_id'],
+        alert_type=rule.data['alert_type'],
+        title=rule.data['title'],
+        message=rule.data['message'].format(spent=total, limit=limit),
+        amount_spent=total,
+        total_deposited=limit,
+        percentage=min(total / limit * 100, Decimal('999.99')),
+    )
+
+
+@rules.provider('individual.expenses')
+def spending_threshold_rules(owner_id):
+    """50%/80% of the monthly budget, or of lifetime deposits when no budget is set."""
+    wallet = IndividualWallet.objects.filter(user_id=owner_id).first()
+    if wallet is None:
+        return
+    if wallet.monthly_budget > 0:
+        limit, period = wallet.monthly_budget, 'month'
+    elif wallet.total_deposits > 0:
+        limit, period = wallet.total_deposits, 'all'
+    else:
+        return
+    for percent, alert_type, title, message in SPENDING_THRESHOLDS:
+        yield Rule(
+            alert_type, limit * percent / 100, create_spending_alert, period=period,
+            data={'user_id': owner_id, 'alert_type': alert_type, 'title': title, 'message': message, 'limit': limit},
+        )
@@ -7,3 +7,7 @@ class IndividualModuleConfig(AppConfig):
 
     def ready(self):
         import individual_module.translation  # noqa
+        import individual_module.signals  # noqa
+        import individual_module.timeseries  # noqa
+        import individual_module.alert_rules  # noqa
+        import individual_module.cohorts  # noqa
@@ -0,0 +1,8 @@
+"""Cohort spending ledger for individual users (see core/cohorts.py)."""
+from core.cohorts import cohorts
+from .models import IndividualExpense
+
+
+@cohorts.register('INDIVIDUAL', date_field='expense_date', category_field='category')
+def individual_expenses():
+    return IndividualExpense.objects.filter(user__persona='INDIVIDUAL')
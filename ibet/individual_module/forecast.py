@@ -0,0 +1,267 @@
+"""
+Cash-flow forecast for individuals.
+
+Projects the main wallet balance day by day from tomorrow over the next
+3-12 months. Every stream is a (sources x days) NumPy array built by
+broadcasting over the horizon's calendar, so a year-long forecast is a
+handful of vector operations:
+
+- income: each active ``IncomeSource`` on its schedule, anchored on the
+  day it was added. Weekly and bi-weekly sources repeat every 7/14 days;
+  monthly, quarterly and yearly ones on the same day of the month
+  (clamped to the last day of shorter months).
+- spending: per category, the average spent on each weekday over the last
+  HISTORY_DAYS days (or since the first expense, if more recent).
+- savings: what is left on each active ``FinancialGoal`` in equal
+  instalments on the 1st of every month before its target date (at once
+  when it is overdue), and the ``EmergencyFund`` monthly contribution on
+  the same days until the fund reaches its target.
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.db.models import Sum
+from django.utils import timezone
+
+from core.timeseries import shift
+
+DEFAULT_MONTHS = 6
+MIN_MONTHS = 3
+MAX_MONTHS = 12
+HISTORY_DAYS = 90
+
+PERIOD_DAYS = {'WEEKLY': 7, 'BIWEEKLY': 14}
+PERIOD_MONTHS = {'MONTHLY': 1, 'QUARTERLY': 3, 'YEARLY': 12}
+
+
+def months_param(query_params) -> int:
+    """
+    Read ``?months=`` from a request.
+
+    Raises:
+        ValueError: If it is not an integer between MIN_MONTHS and MAX_MONTHS
+    """
+    value = query_params.get('months')
+    if value in (None, ''):
+        return DEFAULT_MONTHS
+    try:
+        months = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("months must be an integer")
+    if not MIN_MONTHS <= months <= MAX_MONTHS:
+        raise ValueError(f"months must be between {MIN_MONTHS} and {MAX_MONTHS}")
+    return months
+
+
+def _days(values: Iterable[date]) -> np.ndarray:
+    return np.array([np.datetime64(value, 'D') for value in values], dtype='datetime64[D]')
+
+
+def _day_of_month(days: np.ndarray) -> np.ndarray:
+    return (days - days.astype('datetime64[M]').astype('datetime64[D]')).astype(int) + 1
+
+
+class ForecastCalendar:
+    """Per-day calendar fields of a horizon, as arrays of length ``days``."""
+
+    def __init__(self, start: date, days: int):
+        self.start = start
+        self.dates = np.arange(np.datetime64(start, 'D'), np.datetime64(start, 'D') + days)
+        months = self.dates.astype('datetime64[M]')
+        self.month_index = months.astype(int)
+        self.day_of_month = _day_of_month(self.dates)
+        self.month_length = ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(int)
+        # 1970-01-01 was a Thursday; Monday is 0 as in date.weekday()
+        self.weekday = (self.dates.astype(int) + 3) % 7
+        self.instalment_days = (self.day_of_month == 1) | (np.arange(days) == 0)
+
+    def __len__(self):
+        return len(self.dates)
+
+
+def income_schedule(calendar: ForecastCalendar, sources: Sequence[Tuple[float, str, date]]) -> np.ndarray:
+    """
+    Daily income of recurring sources.
+
+    Args:
+        calendar: Forecast horizon
+        sources: (amount, frequency, anchor date) per source
+
+    Returns:
+        Array of the income due on each day
+    """
+    if not sources:
+        return np.zeros(len(calendar))
+    amounts = np.array([amount for amount, _, _ in sources], dtype=float)
+    anchors = _days(anchor for _, _, anchor in sources)
+    period_days = np.array([PERIOD_DAYS.get(frequency, 0) for _, frequency, _ in sources])[:, None]
+    period_months = np.array([PERIOD_MONTHS.get(frequency, 0) for _, frequency, _ in sources])[:, None]
+
+    elapsed = calendar.dates.astype(int)[None, :] - anchors.astype(int)[:, None]
+    months_elapsed = calendar.month_index[None, :] - anchors.astype('datetime64[M]').astype(int)[:, None]
+    pay_day = np.minimum(_day_of_month(anchors)[:, None], calendar.month_length[None, :])
+
+    by_days = (period_days > 0) & (elapsed % np.maximum(period_days, 1) == 0)
+    by_months = (
+        (period_months > 0)
+        & (months_elapsed % np.maximum(period_months, 1) == 0)
+        & (calendar.day_of_month[None, :] == pay_day)
+    )
+    due = (by_days | by_months) & (elapsed >= 0)
+    return amounts @ due
+
+
+def spending_baseline(rows: Iterable[Dict], history_start: date, history_end: date) -> Tuple[List[str], np.ndarray]:
+    """
+    Average daily spending per category and weekday.
+
+    Args:
+        rows: ``{'category', 'expense_date', 'total'}`` per category and day
+        history_start: First day of the history window
+        history_end: Last day of the history window
+
+    Returns:
+        (categories, array of shape (categories, 7))
+    """
+    rows = list(rows)
+    categories = sorted({row['category'] for row in rows})
+    baseline = np.zeros((len(categories), 7))
+    if not rows:
+        return categories, baseline
+    index = {category: i for i, category in enumerate(categories)}
+    np.add.at(
+        baseline,
+        (
+            np.array([index[row['category']] for row in rows]),
+            np.array([row['expense_date'].weekday() for row in rows]),
+        ),
+        np.array([float(row['total']) for row in rows]),
+    )
+    history = ForecastCalendar(history_start, (history_end - history_start).days + 1)
+    occurrences = np.bincount(history.weekday, minlength=7)
+    return categories, baseline / np.maximum(occurrences, 1)
+
+
+def goal_instalments(calendar: ForecastCalendar, goals: Sequence[Tuple[float, date]]) -> np.ndarray:
+    """
+    Daily contributions needed to reach each goal by its target date.
+
+    Args:
+        calendar: Forecast horizon
+        goals: (amount left, target date) per goal
+
+    Returns:
+        Array of the contributions due on each day
+    """
+    if not goals:
+        return np.zeros(len(calendar))
+    remaining = np.array([max(amount, 0.0) for amount, _ in goals])
+    targets = _days(target for _, target in goals)
+    due = calendar.instalment_days[None, :] & (calendar.dates[None, :] < targets[:, None])
+    # Overdue goals are funded at once
+    due[:, 0] |= ~due.any(axis=1)
+    per_instalment = remaining / due.sum(axis=1)
+    return per_instalment @ due
+
+
+def capped_contributions(calendar: ForecastCalendar, amount: float, remaining: float) -> np.ndarray:
+    """Monthly ``amount`` on the instalment days until ``remaining`` is covered."""
+    scheduled = np.cumsum(calendar.instalment_days * max(amount, 0.0))
+    return np.diff(np.minimum(scheduled, max(remaining, 0.0)), prepend=0.0)
+
+
+def first_negative(calendar: ForecastCalendar, balance: np.ndarray) -> Optional[str]:
+    negative = np.flatnonzero(balance < 0)
+    return str(calendar.dates[negative[0]]) if len(negative) else None
+
+
+class CashFlowForecast:
+    """
+    Day-by-day wallet projection of one individual.
+
+    Usage:
+        CashFlowForecast.for_user(user, months=6)
+    """
+
+    @classmethod
+    def for_user(cls, user, months: int = DEFAULT_MONTHS, today: Optional[date] = None) -> Dict:
+        from .models import EmergencyFund, FinancialGoal, IncomeSource, IndividualExpense
+        from .models_wallet import IndividualWallet
+
+        today = today or timezone.localdate()
+        start = today + timedelta(days=1)
+        days = (shift(start.replace(day=1), 'month', months) - start.replace(day=1)).days
+        calendar = ForecastCalendar(start, days)
+
+        sources = [
+            (float(amount), frequency, timezone.localtime(created_at).date())
+            for amount, frequency, created_at in IncomeSource.objects.filter(user=user, is_active=True)
+            .values_list('amount', 'frequency', 'created_at')
+        ]
+        income = income_schedule(calendar, sources)
+
+        history_end = today
+        history_start = today - timedelta(days=HISTORY_DAYS - 1)
+        rows = list(
+            IndividualExpense.objects.filter(
+                user=user, expense_date__gte=history_start, expense_date__lte=history_end
+            ).values('category', 'expense_date').annotate(total=Sum('amount')).order_by()
+        )
+        if rows:
+            history_start = max(history_start, min(row['expense_date'] for row in rows))
+        categories, baseline = spending_baseline(rows, history_start, history_end)
+        by_category = baseline[:, calendar.weekday]
+        spending = by_category.sum(axis=0)
+
+        goals = [
+            (float(target - current), target_date)
+            for target, current, target_date in FinancialGoal.objects.filter(user=user, status='ACTIVE')
+            .values_list('target_amount', 'current_amount', 'target_date')
+        ]
+        savings = goal_instalments(calendar, goals)
+        fund = EmergencyFund.objects.filter(user=user).first()
+        if fund is not None:
+            savings = savings + capped_contributions(
+                calendar, float(fund.monthly_contribution), float(fund.target_amount - fund.current_amount)
+            )
+
+        opening = float(
+            IndividualWallet.objects.filter(user=user).values_list('balance', flat=True).first() or 0
+        )
+        before_savings = opening + np.cumsum(income - spending)
+        balance = before_savings - np.cumsum(savings)
+        lowest = int(np.argmin(balance))
+
+        return {
+            'start': start.isoformat(),
+            'end': str(calendar.dates[-1]),
+            'months': months,
+            'opening_balance': round(opening, 2),
+            'totals': {
+                'income': round(float(income.sum()), 2),
+                'spending': round(float(spending.sum()), 2),
+                'savings': round(float(savings.sum()), 2),
+            },
+            'spending_by_category': {
+                category: round(float(total), 2) for category, total in zip(categories, by_category.sum(axis=1))
+            },
+            'first_negative': {
+                'balance': first_negative(calendar, balance),
+                'before_savings': first_negative(calendar, before_savings),
+            },
+            'lowest_balance': {'date': str(calendar.dates[lowest]), 'balance': round(float(balance[lowest]), 2)},
+            'points': [
+                {
+                    'date': str(day),
+                    'income': round(float(day_income), 2),
+                    'spending': round(float(day_spending), 2),
+                    'savings': round(float(day_savings), 2),
+                    'balance': round(float(day_balance), 2),
+                    'before_savings': round(float(day_before), 2),
+                }
+                for day, day_income, day_spending, day_savings, day_balance, day_before in zip(
+                    calendar.dates, income, spending, savings, balance, before_savings
+                )
+            ],
+        }
@@ -0,0 +1,33 @@
+"""Goal-attainment estimates for FinancialGoal (see core/goal_odds.py)."""
+from typing import Dict, List
+
+from django.db.models import F
+
+from core.data_version import versioned_memoize
+from core.goal_odds import goal_attainment, monthly_net
+from .models import FinancialGoal, IndividualExpense
+from .models_wallet import IndividualWalletTransaction
+
+INFLOW_TYPES = ('DEPOSIT', 'INCOME')
+
+
+@versioned_memoize('user', key=lambda user_id, today: user_id)
+def monthly_net_savings(user_id, today) -> List[float]:
+    """Main wallet deposits minus recorded expenses, per complete month."""
+    return monthly_net(
+        (IndividualWalletTransaction.objects.filter(wallet__user_id=user_id, transaction_type__in=INFLOW_TYPES),
+         'created_at'),
+        (IndividualExpense.objects.filter(user_id=user_id), 'expense_date'),
+        today,
+    )
+
+
+@versioned_memoize('user', key=lambda goal, today: goal.user_id)
+def financial_goal_attainment(goal, today) -> Dict:
+    open_goals = FinancialGoal.objects.filter(
+        user_id=goal.user_id, status='ACTIVE', current_amount__lt=F('target_amount')
+    ).count()
+    return goal_attainment(
+        monthly_net_savings(goal.user_id, today), goal.target_amount, goal.current_amount, goal.target_date, today,
+        open_goals=open_goals, seed=goal.pk,
+    )
@@ -4,8 +4,9 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from decimal import Decimal
+import math
 from modeltranslation.translator import translator, TranslationOptions
-from django.db.models import Sum, Avg, Count
+from core.alert_rules import capture as capture_alerts, rules as alert_rules
 
 User = get_user_model()
 
@@ -324,61 +325,13 @@ class IndividualExpense(models.Model):
         """
         Check if spending has crossed 50% or 80% threshold.
         Returns list of triggered alerts.
+
+        Thresholds are rules of the 'individual.expenses' ledger (see
+        individual_module/alert_rules.py); new expenses are evaluated as they
+        are saved, so this only fires rules crossed by other changes, e.g. a
+        lowered budget.
         """
-        from individual_module.models_wallet import IndividualWallet
-        
-        try:
-            wallet = IndividualWallet.objects.get(user=user)
-            total_deposited = wallet.total_deposits
-            
-            if wallet.monthly_budget > 0:
-                total_deposited = wallet.monthly_budget
-            
-            total_spent = IndividualExpense.objects.filter(
-                user=user
-            ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-            
-            if total_deposited <= 0:
-                return []
-            
-            spent_percentage = (total_spent / total_deposited) * 100
-            alerts_created = []
-            
-            if spent_percentage >= 50:
-                alert, created = SpendingAlert.objects.get_or_create(
-                    user=user,
-                    alert_type='SPENT_50',
-                    is_active=True,
-                    defaults={
-                        'title': '50% Spending Alert',
-                        'message': f'You have spent 50% (₹{total_spent}) of your total budget/deposits (₹{total_deposited}).',
-                        'amount_spent': total_spent,
-                        'total_deposited': total_deposited,
-                        'percentage': spent_percentage
-                    }
-                )
-                if created:
-                    alerts_created.append(alert)
-            
-            if spent_percentage >= 80:
-                alert, created = SpendingAlert.objects.get_or_create(
-                    user=user,
-                    alert_type='SPENT_80',
-                    is_active=True,
-                    defaults={
-                        'title': '80% Spending Alert',
-                        'message': f'Warning! You have spent 80% (₹{total_spent}) of your total budget/deposits (₹{total_deposited}).',
-                        'amount_spent': total_spent,
-                        'total_deposited': total_deposited,
-                        'percentage': spent_percentage
-                    }
-                )
-                if created:
-                    alerts_created.append(alert)
-            
-            return alerts_created
-        except IndividualWallet.DoesNotExist:
-            return []
+        return alert_rules.check('individual.expenses', user.pk)
 
     @classmethod
     @transaction.atomic
@@ -427,26 +380,38 @@ class IndividualExpense(models.Model):
             except ValueError as e:
                 raise ValueError(f"Individual Wallet Error: {str(e)}")
 
-        # 2. Create individual expense record for reporting/history
-        expense = IndividualExpense.objects.create(
-            user=user,
-            amount=amount,
-            category=category,
-            description=description,
-            expense_date=localdate()
-        )
+        # 2. Compare with the user's history before this expense joins it
+        anomaly_baseline = SpendingAnomalyDetector.baseline(user, category)
+        is_anomaly = SpendingAnomalyDetector.detect_anomaly(user, amount, category)
+
+        # 3. Create individual expense record for reporting/history;
+        #    budget threshold rules are evaluated as it is saved
+        with capture_alerts() as threshold_alerts:
+            expense = IndividualExpense.objects.create(
+                user=user,
+                amount=amount,
+                category=category,
+                description=description,
+                expense_date=localdate()
+            )
         
-        # 3. Update dashboard stats
+        # 4. Update dashboard stats
         dashboard, _ = IndividualDashboard.objects.get_or_create(user=user)
         dashboard.total_expenses += amount
         dashboard.save()
         
-        # 4. Check thresholds (Only if it's an individual wallet)
-        alerts = []
-        try:
-            alerts = cls.check_spending_threshold(user)
-        except:
-            pass
+        # 5. Collect alerts
+        alerts = list(threshold_alerts)
+        if is_anomaly:
+            average = Decimal(str(round(anomaly_baseline.mean, 2)))
+            alerts.append(SpendingAlert.objects.create(
+                user=user,
+                alert_type='ANOMALY',
+                title='Unusual Spending Detected',
+                message=f'This expense (₹{amount}) is unusually large. Your average {category} spending is ₹{average:.2f}.',
+                amount_spent=amount,
+                percentage=min(Decimal(amount) / average * 100, Decimal('999.99')),
+            ))
             
         return expense, alerts
 
@@ -486,29 +451,170 @@ class SpendingAlert(models.Model):
         return f"{self.user.username} - {self.alert_type}"
 
 
+class SpendingStats(models.Model):
+    """
+    Running statistics of a user's expense amounts, per category.
+
+    Each new expense updates its category's row and the user's overall row
+    (``category=''``) in constant time: Welford's count/mean/M2 for the
+    variance, an exponentially weighted mean of recent amounts and a window
+    of the last ``RECENT_SIZE`` amounts for quantiles. Deleting or editing
+    an expense drops the user's rows, which are rebuilt from their expenses
+    when next needed.
+    """
+    ALL_CATEGORIES = ''
+    RECENT_SIZE = 50
+    EWMA_ALPHA = 0.2
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='individual_spending_stats')
+    category = models.CharField(max_length=20, blank=True, default='')
+    count = models.PositiveIntegerField(default=0)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    mean = models.FloatField(default=0.0)
+    m2 = models.FloatField(default=0.0)
+    ewma = models.FloatField(default=0.0)
+    recent = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'category')
+
+    def __str__(self):
+        return f"{self.user.username} - {self.category or 'ALL'}: {self.count} expenses"
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def add(self, amount):
+        """Fold one amount into the statistics (not saved)."""
+        value = float(amount)
+        self.count += 1
+        self.total += Decimal(amount)
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.ewma = value if self.count == 1 else self.EWMA_ALPHA * value + (1 - self.EWMA_ALPHA) * self.ewma
+        self.recent = (list(self.recent) + [value])[-self.RECENT_SIZE:]
+
+    def quantile(self, q):
+        """Quantile ``q`` (0..1) of the recent window, linearly interpolated."""
+        if not self.recent:
+            return 0.0
+        values = sorted(self.recent)
+        position = (len(values) - 1) * q
+        lower = math.floor(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    def z_score(self, amount):
+        std = self.std
+        return (float(amount) - self.mean) / std if std > 0 else 0.0
+
+    @classmethod
+    @transaction.atomic
+    def record(cls, expense):
+        """Add a newly created expense to its category's and the user's overall statistics."""
+        if not cls.objects.filter(user_id=expense.user_id).exists():
+            # First write for this user: the rebuild already includes ``expense``
+            cls.rebuild(expense.user_id)
+            return
+        for category in (cls.ALL_CATEGORIES, expense.category):
+            stats, _ = cls.objects.select_for_update().get_or_create(user_id=expense.user_id, category=category)
+            stats.add(expense.amount)
+            stats.save()
+
+    @classmethod
+    @transaction.atomic
+    def rebuild(cls, user_id):
+        """Recompute all of a user's statistics from their expenses, oldest first."""
+        rows = {}
+        expenses = IndividualExpense.objects.filter(user_id=user_id).order_by(
+            'expense_date', 'created_at', 'id'
+        ).values_list('category', 'amount')
+        for category, amount in expenses.iterator():
+            for key in (cls.ALL_CATEGORIES, category):
+                if key not in rows:
+                    rows[key] = cls(user_id=user_id, category=key)
+                rows[key].add(amount)
+        cls.objects.filter(user_id=user_id).delete()
+        cls.objects.bulk_create(rows.values())
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """Drop a user's statistics; they are rebuilt on the next read or expense."""
+        cls.objects.filter(user_id=user_id).delete()
+
+    @classmethod
+    def for_user(cls, user, category=ALL_CATEGORIES):
+        """Statistics for ``user`` (and ``category``), or None without expenses in it."""
+        stats = cls.objects.filter(user=user, category=category).first()
+        if stats is None and not cls.objects.filter(user=user).exists():
+            cls.rebuild(user.pk)
+            stats = cls.objects.filter(user=user, category=category).first()
+        return stats
+
+
 class SpendingAnomalyDetector:
-    ANOMALY_MULTIPLIER = 3.0
+    """
+    Flags expenses that are unusually large for the user.
+
+    Reads the user's running ``SpendingStats`` for the expense's category
+    (the overall row while the category has too little history), so a check
+    costs one row lookup however long the history is. An amount is anomalous
+    when it is above all of:
+
+    - ``Z_THRESHOLD`` standard deviations over the mean,
+    - the ``QUANTILE`` of the recent window (so a user whose spending has
+      shifted up is compared with their recent amounts),
+    - ``MIN_RATIO`` × the mean (so flat histories with no variance do not
+      flag small increases).
+    """
+    Z_THRESHOLD = 3.0
+    QUANTILE = 0.95
+    MIN_RATIO = 1.5
     MIN_TRANSACTIONS = 3
-    
+
     @classmethod
-    def detect_anomaly(cls, user, amount):
-        expenses = IndividualExpense.objects.filter(user=user)
-        if expenses.count() < cls.MIN_TRANSACTIONS:
-            return False
-        avg_spending = expenses.aggregate(avg=Avg('amount'))['avg'] or Decimal('0')
-        if avg_spending == 0:
+    def baseline(cls, user, category=None):
+        """The statistics an amount in ``category`` is compared against, or None."""
+        if category:
+            stats = SpendingStats.for_user(user, category)
+            if stats and stats.count >= cls.MIN_TRANSACTIONS:
+                return stats
+        stats = SpendingStats.for_user(user)
+        if stats and stats.count >= cls.MIN_TRANSACTIONS:
+            return stats
+        return None
+
+    @classmethod
+    def threshold(cls, stats):
+        return max(
+            stats.mean + cls.Z_THRESHOLD * stats.std,
+            stats.quantile(cls.QUANTILE),
+            stats.mean * cls.MIN_RATIO,
+        )
+
+    @classmethod
+    def detect_anomaly(cls, user, amount, category=None):
+        stats = cls.baseline(user, category)
+        if stats is None or stats.mean <= 0:
             return False
-        return amount > avg_spending * Decimal(str(cls.ANOMALY_MULTIPLIER))
-    
+        return float(amount) > cls.threshold(stats)
+
     @classmethod
     def get_average_spending(cls, user):
-        result = IndividualExpense.objects.filter(user=user).aggregate(
-            avg=Avg('amount'), total=Sum('amount'), count=Count('id')
-        )
+        stats = SpendingStats.for_user(user)
+        if stats is None:
+            return {'average': Decimal('0'), 'total': Decimal('0'), 'count': 0}
         return {
-            'average': result['avg'] or Decimal('0'),
-            'total': result['total'] or Decimal('0'),
-            'count': result['count'] or 0
+            'average': (stats.total / stats.count).quantize(Decimal('0.01')),
+            'total': stats.total,
+            'count': stats.count,
         }
 
 
@@ -1,10 +1,12 @@
 from rest_framework import serializers
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from .models import (
     IncomeSource, EmergencyFund, IndividualDashboard,
     ExpenseAlert, FinancialGoal, InvestmentSuggestion, IndividualExpense
 )
 from .models_wallet import IndividualWallet
+from .goal_odds import financial_goal_attainment
 
 
 class IncomeSourceSerializer(serializers.ModelSerializer):
@@ -73,16 +75,21 @@ class FinancialGoalSerializer(serializers.ModelSerializer):
     """
     progress_percentage = serializers.ReadOnlyField()
     days_remaining = serializers.ReadOnlyField()
+    # Monte Carlo estimate of reaching the target by target_date (core/goal_odds.py)
+    attainment = serializers.SerializerMethodField()
 
     class Meta:
         model = FinancialGoal
         fields = [
             'id', 'name', 'description', 'goal_type', 'target_amount',
             'current_amount', 'target_date', 'status', 'progress_percentage',
-            'days_remaining', 'created_at', 'updated_at'
+            'days_remaining', 'attainment', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+    def get_attainment(self, obj):
+        return financial_goal_attainment(obj, timezone.localdate())
+
 
 class InvestmentSuggestionSerializer(serializers.ModelSerializer):
     """
@@ -0,0 +1,95 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.alert_rules import rules as alert_rules
+from core.data_version import DataVersionService
+from core.response_cache import bump_content_version
+from core.events import EventTypes, publish
+from .models import (
+    IncomeSource, EmergencyFund, ExpenseAlert, FinancialGoal, IndividualSavingsWallet,
+    SavingsTransaction, IndividualExpense, SpendingAlert, InvestmentSuggestion, SpendingStats
+)
+from .models_wallet import IndividualWallet, IndividualWalletTransaction
+
+
+# Bump the owner's data version on every ledger write so memoized
+# aggregates (monthly/yearly summaries) are recomputed.
+@receiver([post_save, post_delete], sender=IndividualWallet)
+@receiver([post_save, post_delete], sender=IndividualSavingsWallet)
+@receiver([post_save, post_delete], sender=IndividualExpense)
+@receiver([post_save, post_delete], sender=IncomeSource)
+@receiver([post_save, post_delete], sender=FinancialGoal)
+@receiver([post_save, post_delete], sender=EmergencyFund)
+@receiver([post_save, post_delete], sender=ExpenseAlert)
+@receiver([post_save, post_delete], sender=SpendingAlert)
+def individual_ledger_changed(sender, instance, **kwargs):
+    DataVersionService.bump('user', instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=IndividualWalletTransaction)
+def individual_wallet_transaction_changed(sender, instance, **kwargs):
+    DataVersionService.bump(
+        'user', IndividualWallet.objects.filter(pk=instance.wallet_id).values_list('user_id', flat=True).first()
+    )
+
+
+@receiver([post_save, post_delete], sender=SavingsTransaction)
+def savings_transaction_changed(sender, instance, **kwargs):
+    DataVersionService.bump(
+        'user', IndividualSavingsWallet.objects.filter(pk=instance.savings_wallet_id).values_list('user_id', flat=True).first()
+    )
+
+
+# Running per-category statistics for anomaly detection. New expenses are
+# folded in; edits and deletes cannot be undone from a running mean/window,
+# so the user's statistics are dropped and rebuilt when next needed.
+@receiver(post_save, sender=IndividualExpense)
+def spending_stats_expense_saved(sender, instance, created, **kwargs):
+    if created:
+        SpendingStats.record(instance)
+    else:
+        SpendingStats.invalidate(instance.user_id)
+
+
+@receiver(post_delete, sender=IndividualExpense)
+def spending_stats_expense_deleted(sender, instance, **kwargs):
+    SpendingStats.invalidate(instance.user_id)
+
+
+# Budget alert rules (individual_module/alert_rules.py) run off expense
+# writes; the wallet holds the budget they are compiled from.
+@receiver(post_save, sender=IndividualExpense)
+def alert_rules_expense_saved(sender, instance, created, **kwargs):
+    if created:
+        alert_rules.record('individual.expenses', instance.user_id, instance.amount, instance.expense_date, instance.category)
+    else:
+        alert_rules.resync('individual.expenses', instance.user_id)
+
+
+@receiver(post_delete, sender=IndividualExpense)
+def alert_rules_expense_deleted(sender, instance, **kwargs):
+    alert_rules.resync('individual.expenses', instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=IndividualWallet)
+def alert_rules_wallet_changed(sender, instance, **kwargs):
+    alert_rules.invalidate('individual.expenses', instance.user_id)
+
+
+@receiver(post_save, sender=IndividualWallet)
+@receiver(post_save, sender=IndividualSavingsWallet)
+def publish_individual_balance(sender, instance, **kwargs):
+    publish([instance.user_id], EventTypes.BALANCE)
+
+
+@receiver(post_save, sender=ExpenseAlert)
+@receiver(post_save, sender=SpendingAlert)
+def publish_individual_alert(sender, instance, created, **kwargs):
+    if created:
+        publish([instance.user_id], EventTypes.NOTIFICATION, {'alert_id': instance.pk})
+
+
+# Investment suggestions are shared reference data; cached responses built
+# from them are keyed by this content version.
+@receiver([post_save, post_delete], sender=InvestmentSuggestion)
+def investment_suggestion_changed(sender, instance, **kwargs):
+    bump_content_version('investment_suggestions')
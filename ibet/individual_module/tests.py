@@ -1,3 +1,4 @@
+from decimal import Decimal
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
@@ -107,3 +108,223 @@ class IndividualModuleAPITestCase(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(str(response.data['balance']), '1000.00')
+
+    def test_monthly_summary_keeps_every_expense(self):
+        """The pie of individual expenses must add up to the month's total"""
+        from decimal import Decimal
+        from django.utils import timezone
+        from .models import IndividualExpense
+
+        IndividualWallet.objects.create(user=self.user, balance=1000.00)
+        for i in range(1, 11):
+            IndividualExpense.objects.create(
+                user=self.user, amount=Decimal(i * 7), category='FOOD', expense_date=timezone.localdate()
+            )
+        url = reverse('individual_wallet:individual-wallet-monthly-summary')
+        response = self.client.get(url, {'max_points': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['individual_expenses']), 10)
+        self.assertEqual(
+            sum(exp['amount'] for exp in response.data['individual_expenses']), float(response.data['total_spent'])
+        )
+
+
+class SpendingStatsTests(TestCase):
+    """Running spending statistics and anomaly detection"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='statsuser', email='stats@example.com', password='testpass123')
+
+    def add_expenses(self, category, amounts):
+        from .models import IndividualExpense
+        return [
+            IndividualExpense.objects.create(user=self.user, amount=Decimal(str(amount)), category=category)
+            for amount in amounts
+        ]
+
+    def test_running_stats_match_full_aggregate(self):
+        import statistics
+        from .models import SpendingStats
+        amounts = [120, 80, 95, 130, 110, 60]
+        self.add_expenses('FOOD', amounts)
+        self.add_expenses('TRANSPORT', [40, 45])
+
+        food = SpendingStats.objects.get(user=self.user, category='FOOD')
+        self.assertEqual(food.count, 6)
+        self.assertEqual(food.total, Decimal('595'))
+        self.assertAlmostEqual(food.mean, statistics.mean(amounts))
+        self.assertAlmostEqual(food.variance, statistics.variance(amounts))
+        self.assertEqual(food.recent, [float(a) for a in amounts])
+        self.assertEqual(SpendingStats.objects.get(user=self.user, category='').count, 8)
+
+    def test_delete_invalidates_and_rebuilds(self):
+        from .models import SpendingStats, SpendingAnomalyDetector
+        expenses = self.add_expenses('FOOD', [100, 200, 300])
+        expenses[-1].delete()
+        self.assertFalse(SpendingStats.objects.filter(user=self.user).exists())
+
+        stats = SpendingAnomalyDetector.get_average_spending(self.user)
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['total'], Decimal('300'))
+        self.assertEqual(stats['average'], Decimal('150.00'))
+
+    def test_detect_anomaly_per_category(self):
+        from .models import SpendingAnomalyDetector
+        self.add_expenses('FOOD', [100, 110, 90, 105, 95, 100])
+        self.add_expenses('BILLS', [2000, 2100, 1900])
+
+        self.assertFalse(SpendingAnomalyDetector.detect_anomaly(self.user, Decimal('120'), 'FOOD'))
+        self.assertTrue(SpendingAnomalyDetector.detect_anomaly(self.user, Decimal('600'), 'FOOD'))
+        # Normal for bills even though far above the food average
+        self.assertFalse(SpendingAnomalyDetector.detect_anomaly(self.user, Decimal('2050'), 'BILLS'))
+        # Too little category history falls back to the user's overall stats
+        self.assertFalse(SpendingAnomalyDetector.detect_anomaly(self.user, Decimal('500'), 'HEALTH'))
+
+    def test_record_expense_creates_anomaly_alert(self):
+        from .models import IndividualExpense, SpendingAlert
+        IndividualWallet.objects.create(user=self.user, balance=Decimal('10000.00'))
+        for amount in ('100', '110', '90', '100'):
+            IndividualExpense.record_expense_and_check_alerts(self.user, Decimal(amount), 'FOOD')
+        self.assertFalse(SpendingAlert.objects.filter(user=self.user, alert_type='ANOMALY').exists())
+
+        _, alerts = IndividualExpense.record_expense_and_check_alerts(self.user, Decimal('900'), 'FOOD')
+        self.assertIn('ANOMALY', [alert.alert_type for alert in alerts])
+
+
+class CashFlowForecastTests(APITestCase):
+    """Tests for the vectorized cash-flow forecast"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='forecaster', password='testpass123', persona='INDIVIDUAL')
+
+    def test_income_schedule(self):
+        from datetime import date
+        from .forecast import ForecastCalendar, income_schedule
+
+        calendar = ForecastCalendar(date(2026, 1, 1), 120)
+        income = income_schedule(calendar, [
+            (1000.0, 'MONTHLY', date(2025, 10, 31)),
+            (100.0, 'BIWEEKLY', date(2026, 1, 5)),
+            (500.0, 'QUARTERLY', date(2025, 11, 15)),
+        ])
+        paid = {str(calendar.dates[i]): amount for i, amount in enumerate(income) if amount}
+        # Month-end salary clamps to short months
+        self.assertEqual(paid['2026-01-31'], 1000)
+        self.assertEqual(paid['2026-02-28'], 1000)
+        self.assertEqual(paid['2026-01-05'], 100)
+        self.assertEqual(paid['2026-01-19'], 100)
+        self.assertEqual(paid['2026-02-15'], 500)
+        self.assertNotIn('2026-03-15', paid)
+        self.assertEqual(income.sum(), 4 * 1000 + 9 * 100 + 500)
+
+    def test_goal_and_emergency_fund_contributions(self):
+        from datetime import date
+        import numpy as np
+        from .forecast import ForecastCalendar, capped_contributions, goal_instalments
+
+        calendar = ForecastCalendar(date(2026, 1, 10), 90)
+        goals = goal_instalments(calendar, [(900.0, date(2026, 3, 15)), (50.0, date(2025, 12, 1))])
+        # Instalments on Jan 10, Feb 1 and Mar 1; the overdue goal at once
+        self.assertEqual(goals[0], 350)
+        self.assertEqual(goals[22], 300)
+        self.assertAlmostEqual(goals.sum(), 950)
+
+        fund = capped_contributions(calendar, 400.0, 1000.0)
+        self.assertEqual(list(fund[np.flatnonzero(fund)]), [400, 400, 200])
+
+    def test_forecast_for_user(self):
+        from datetime import date, datetime, timedelta
+        from django.utils import timezone
+        from .forecast import CashFlowForecast
+        from .models import IndividualExpense
+
+        today = date(2026, 6, 30)
+        IndividualWallet.objects.create(user=self.user, balance=Decimal('1000.00'))
+        source = IncomeSource.objects.create(user=self.user, name='Salary', amount=Decimal('3000.00'), frequency='MONTHLY')
+        IncomeSource.objects.filter(pk=source.pk).update(
+            created_at=timezone.make_aware(datetime(2026, 1, 1, 10, 0))
+        )
+        IncomeSource.objects.create(user=self.user, name='Old job', amount=Decimal('9999.00'), is_active=False)
+        # 100/day on FOOD for the last 90 days
+        for offset in range(90):
+            IndividualExpense.objects.create(
+                user=self.user, amount=Decimal('100'), category='FOOD', expense_date=today - timedelta(days=offset)
+            )
+        FinancialGoal.objects.create(
+            user=self.user, name='Laptop', target_amount=Decimal('6000'), current_amount=Decimal('0'),
+            target_date=date(2026, 9, 15),
+        )
+
+        forecast = CashFlowForecast.for_user(self.user, months=3, today=today)
+        self.assertEqual(forecast['start'], '2026-07-01')
+        self.assertEqual(forecast['end'], '2026-09-30')
+        self.assertEqual(len(forecast['points']), 92)
+        self.assertEqual(forecast['totals'], {'income': 9000.0, 'spending': 9200.0, 'savings': 6000.0})
+        self.assertEqual(forecast['spending_by_category'], {'FOOD': 9200.0})
+        # Jul 1: +3000 salary, -100 food, -2000 goal instalment
+        self.assertEqual(forecast['points'][0]['balance'], 1900.0)
+        # Salary covers the food; the goal's instalments do not
+        self.assertIsNone(forecast['first_negative']['before_savings'])
+        self.assertEqual(forecast['first_negative']['balance'], '2026-07-21')
+
+    def test_forecast_endpoint(self):
+        url = reverse('individual-forecast')
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(url, {'months': 13}).status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, {'months': 12, 'max_points': 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['points']), 50)
+        self.assertIsNone(response.data['first_negative']['balance'])
+
+
+class GoalAttainmentTests(APITestCase):
+    """Tests for goal-attainment estimates on the financial goals list"""
+
+    def setUp(self):
+        from datetime import datetime, timedelta
+        from django.utils import timezone
+        from .models import IndividualExpense
+        from .models_wallet import IndividualWalletTransaction
+
+        self.user = User.objects.create_user(username='goalodds', password='testpass123', persona='INDIVIDUAL')
+        wallet = IndividualWallet.objects.create(user=self.user, balance=Decimal('0.00'))
+        self.today = timezone.localdate()
+        month = self.today.replace(day=1)
+        # Six months of 3000 in and 1000 spent
+        for _ in range(6):
+            month = (month - timedelta(days=1)).replace(day=1)
+            tx = IndividualWalletTransaction.objects.create(
+                wallet=wallet, amount=Decimal('3000.00'), transaction_type='DEPOSIT', description='Salary',
+                balance_after=Decimal('0.00'),
+            )
+            IndividualWalletTransaction.objects.filter(pk=tx.pk).update(
+                created_at=timezone.make_aware(datetime(month.year, month.month, 5, 12))
+            )
+            IndividualExpense.objects.create(
+                user=self.user, amount=Decimal('1000.00'), category='FOOD', expense_date=month.replace(day=10)
+            )
+
+    def test_goals_list_includes_attainment(self):
+        from datetime import timedelta
+        from unittest import mock
+
+        FinancialGoal.objects.create(
+            user=self.user, name='Bike', target_amount=Decimal('5000'), target_date=self.today + timedelta(days=100),
+        )
+        FinancialGoal.objects.create(
+            user=self.user, name='House', target_amount=Decimal('500000'), target_date=self.today + timedelta(days=100),
+        )
+        self.client.force_authenticate(user=self.user)
+        url = reverse('financial-goal-list')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        attainment = {goal['name']: goal['attainment'] for goal in response.data}
+        self.assertEqual(attainment['Bike']['history_months'], 6)
+        self.assertEqual(attainment['House']['status'], 'OFF_TRACK')
+        self.assertEqual(attainment['House']['probability'], 0.0)
+
+        # Cached per goal until the user's data changes
+        with mock.patch('core.goal_odds.simulate') as simulate:
+            self.client.get(url)
+            simulate.assert_not_called()
@@ -0,0 +1,8 @@
+"""Time-series metrics for individual users (see core/timeseries.py)."""
+from core.timeseries import metrics
+from .models import IndividualExpense
+
+
+@metrics.register('individual.expenses', date_field='expense_date', split_field='category')
+def individual_expenses(user):
+    return IndividualExpense.objects.filter(user=user)
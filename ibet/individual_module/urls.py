@@ -3,7 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     IncomeSourceViewSet, EmergencyFundViewSet, IndividualDashboardViewSet,
     ExpenseAlertViewSet, FinancialGoalViewSet, InvestmentSuggestionViewSet,
-    IndividualOverviewView, ExpenseTrackingView
+    IndividualOverviewView, ExpenseTrackingView, CashFlowForecastView
 )
 from .views_enhanced import (
     get_individual_dashboard,
@@ -34,6 +34,7 @@ urlpatterns = [
     path('', include(router.urls)),
     path('overview/', IndividualOverviewView.as_view(), name='individual-overview'),
     path('expenses/', ExpenseTrackingView.as_view(), name='expense-tracking'),
+    path('forecast/', CashFlowForecastView.as_view(), name='individual-forecast'),
 ]
 
 # Enhanced Individual Module URLs
@@ -17,6 +17,12 @@ from .serializers import (
     IndividualOverviewSerializer, WalletSerializer, TransactionSerializer
 )
 from .models_wallet import IndividualWallet, IndividualWalletTransaction
+from core.conditional import conditional_get
+from core.response_cache import cache_response
+from core.data_version import DataVersionService
+from core.concurrency import run_concurrently
+from core.downsample import downsample, max_points_param
+from .forecast import CashFlowForecast, months_param
 
 
 class IncomeSourceViewSet(viewsets.ModelViewSet):
@@ -86,6 +92,8 @@ class ExpenseAlertViewSet(viewsets.ModelViewSet):
         """Mark all alerts as read."""
         alerts = self.get_queryset().filter(is_read=False)
         alerts.update(is_read=True, read_at=timezone.now())
+        # Bulk update bypasses post_save
+        DataVersionService.bump('user', request.user.pk)
         return Response({'status': _(f'{alerts.count()} alerts marked as read')})
 
 
@@ -124,6 +132,14 @@ class InvestmentSuggestionViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     queryset = InvestmentSuggestion.objects.filter(is_active=True)
 
+    @cache_response('investment_suggestions', content=('investment_suggestions',))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response('investment_suggestion', content=('investment_suggestions',))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=False, methods=['get'])
     def seed_data(self, request):
         """Seed some initial investment suggestion data"""
@@ -184,68 +200,72 @@ class IndividualOverviewView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_get()
     def get(self, request, *args, **kwargs):
         user = request.user
 
-        # Get wallet balance
-        try:
-            wallet = IndividualWallet.objects.get(user=user)
-            wallet_balance = wallet.balance
-        except IndividualWallet.DoesNotExist:
-            wallet_balance = 0.00
-
         # Calculate monthly income
         current_month = timezone.now().replace(day=1)
         next_month = (current_month + timedelta(days=32)).replace(day=1)
 
-        monthly_income = IncomeSource.objects.filter(
-            user=user,
-            is_active=True
-        ).aggregate(total=Sum('amount'))['total'] or 0.00
+        def wallet_balance():
+            wallet = IndividualWallet.objects.filter(user=user).first()
+            return wallet.balance if wallet else 0.00
 
-        # Calculate monthly expenses
-        monthly_expenses = IndividualExpense.objects.filter(
-            user=user,
-            expense_date__gte=current_month,
-            expense_date__lt=next_month
-        ).aggregate(total=Sum('amount'))['total'] or 0.00
+        def emergency_fund_progress():
+            emergency_fund = EmergencyFund.objects.filter(user=user).first()
+            return emergency_fund.progress_percentage if emergency_fund else 0.00
 
-        # Emergency fund progress
-        try:
-            emergency_fund = EmergencyFund.objects.get(user=user)
-            emergency_fund_progress = emergency_fund.progress_percentage
-        except EmergencyFund.DoesNotExist:
-            emergency_fund_progress = 0.00
+        # Independent reads; run concurrently
+        response_data = run_concurrently({
+            'wallet_balance': wallet_balance,
+            'monthly_income': lambda: IncomeSource.objects.filter(
+                user=user,
+                is_active=True
+            ).aggregate(total=Sum('amount'))['total'] or 0.00,
+            'monthly_expenses': lambda: IndividualExpense.objects.filter(
+                user=user,
+                expense_date__gte=current_month,
+                expense_date__lt=next_month
+            ).aggregate(total=Sum('amount'))['total'] or 0.00,
+            'emergency_fund_progress': emergency_fund_progress,
+            'active_goals_count': lambda: FinancialGoal.objects.filter(
+                user=user,
+                status='ACTIVE'
+            ).count(),
+            'unread_alerts_count': lambda: ExpenseAlert.objects.filter(
+                user=user,
+                is_read=False
+            ).count(),
+            # Recent transactions (last 10)
+            'recent_transactions': lambda: TransactionSerializer(IndividualExpense.objects.filter(
+                user=user
+            ).order_by('-expense_date')[:10], many=True).data,
+        })
 
-        # Active goals count
-        active_goals_count = FinancialGoal.objects.filter(
-            user=user,
-            status='ACTIVE'
-        ).count()
+        return Response(response_data)
 
-        # Unread alerts count
-        unread_alerts_count = ExpenseAlert.objects.filter(
-            user=user,
-            is_read=False
-        ).count()
 
-        # Recent transactions (last 10)
-        recent_expenses = IndividualExpense.objects.filter(
-            user=user
-        ).order_by('-expense_date')[:10]
+class CashFlowForecastView(APIView):
+    """
+    Projected daily wallet balance for the next ``?months=`` (3-12, default 6).
 
-        # Create the response data
-        response_data = {
-            'wallet_balance': wallet_balance,
-            'monthly_income': monthly_income,
-            'monthly_expenses': monthly_expenses,
-            'emergency_fund_progress': emergency_fund_progress,
-            'active_goals_count': active_goals_count,
-            'unread_alerts_count': unread_alerts_count,
-            'recent_transactions': TransactionSerializer(recent_expenses, many=True).data
-        }
+    The forecast only changes with the user's data and the date, both of
+    which the ETag covers.
+    """
+    permission_classes = [permissions.IsAuthenticated]
 
-        return Response(response_data)
+    @conditional_get()
+    def get(self, request, *args, **kwargs):
+        try:
+            months = months_param(request.query_params)
+            max_points = max_points_param(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        forecast = CashFlowForecast.for_user(request.user, months)
+        forecast['points'] = downsample(forecast['points'], max_points, y_key='balance')
+        return Response(forecast)
 
 
 class WalletManagementView(APIView):
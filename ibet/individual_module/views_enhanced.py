@@ -7,6 +7,7 @@ from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
+from core.response_cache import cache_response
 from decimal import Decimal
 import random
 import string
@@ -380,6 +381,7 @@ def mark_alert_read(request, alert_id):
 
 @login_required
 @require_http_methods(["GET"])
+@cache_response('expense_categories')
 def get_expense_categories(request):
     """Get list of expense categories"""
     categories = [
@@ -11,6 +11,11 @@ from core.throttling import OTPGenerationThrottle, OTPVerificationThrottle, Wall
 from core.security import OTPSecurityService, SecurityUtils
 from core.security_monitoring_fixed import SecurityEventManager, AuditService
 from core.permissions import OTPGenerationPermission, OTPVerificationPermission
+from core.data_version import versioned_memoize
+from core.conditional import conditional_get
+from core import timeseries
+from core.timeseries import metrics
+from core.downsample import downsample, max_points_param
 from .models_wallet import IndividualWallet, IndividualWalletTransaction, IndividualWalletOTPRequest
 from .models import IndividualExpense, InvestmentSuggestion
 from .serializers_wallet import (
@@ -23,6 +28,47 @@ from django.utils import timezone
 from decimal import Decimal
 
 
+@versioned_memoize('user', key=lambda user, *args: user.pk)
+def monthly_expense_summary(user, start_of_month):
+    """Month-to-date total, category breakdown and expense points for charts."""
+    expenses = IndividualExpense.objects.filter(
+        user=user,
+        expense_date__gte=start_of_month
+    ).order_by('expense_date', 'created_at')
+
+    category_summary = list(expenses.values('category').annotate(
+        total=Sum('amount')
+    ).order_by('-total'))
+
+    total_monthly_spent = expenses.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
+
+    # Individual expenses for granular pie chart visualization
+    individual_expenses = []
+    for exp in expenses:
+        individual_expenses.append({
+            'id': exp.id,
+            'category': exp.category,
+            'amount': float(exp.amount),
+            'description': exp.description or exp.category,
+            'date': exp.expense_date.strftime('%d %b')
+        })
+    return total_monthly_spent, category_summary, individual_expenses
+
+
+@versioned_memoize('user', key=lambda user, *args: user.pk)
+def yearly_spending_totals(user, today):
+    """Monthly spending for the 12 months ending with today's month."""
+    import calendar
+    start, end = timeseries.default_range('month', today)
+    points = metrics.get('individual.expenses').series(user, 'month', start, end)
+    return [{
+        'month': calendar.month_name[point['start'].month][:3],
+        'full_month': calendar.month_name[point['start'].month],
+        'year': point['start'].year,
+        'amount': float(point['total'])
+    } for point in points]
+
+
 class IndividualWalletViewSet(viewsets.ModelViewSet):
     """
     Secure API endpoint for individual wallet management.
@@ -41,6 +87,7 @@ class IndividualWalletViewSet(viewsets.ModelViewSet):
             raise IndividualWallet.DoesNotExist("Individual wallet not found")
 
     @action(detail=False, methods=['get'])
+    @conditional_get()
     def statement(self, request):
         """Get filtered transaction statement"""
         from django.utils.timezone import localdate
@@ -418,27 +465,9 @@ class IndividualWalletViewSet(viewsets.ModelViewSet):
         today = timezone.now()
         start_of_month = today.replace(day=1)
         
-        expenses = IndividualExpense.objects.filter(
-            user=request.user, 
-            expense_date__gte=start_of_month
-        ).order_by('expense_date', 'created_at')
-        
-        category_summary = expenses.values('category').annotate(
-            total=Sum('amount')
-        ).order_by('-total')
-        
-        total_monthly_spent = expenses.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-        
-        # Individual expenses for granular pie chart visualization
-        individual_expenses = []
-        for exp in expenses:
-            individual_expenses.append({
-                'id': exp.id,
-                'category': exp.category,
-                'amount': float(exp.amount),
-                'description': exp.description or exp.category,
-                'date': exp.expense_date.strftime('%d %b')
-            })
+        total_monthly_spent, category_summary, individual_expenses = monthly_expense_summary(
+            request.user, start_of_month.date()
+        )
 
         # Investment suggestions if saving is good
         wallet = self.get_object()
@@ -453,7 +482,7 @@ class IndividualWalletViewSet(viewsets.ModelViewSet):
         return Response({
             'month': f"{month_name} {today.year}",
             'total_spent': total_monthly_spent,
-            'category_breakdown': list(category_summary),
+            'category_breakdown': category_summary,
             'individual_expenses': individual_expenses,
             'investment_suggestions': [
                 {
@@ -470,72 +499,29 @@ class IndividualWalletViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def daily_spending_summary(self, request):
-        """Get granular individual transactions for the current month for charts"""
+        """Get daily spending totals for the current month (one point per day) for charts"""
         from django.utils.timezone import localdate
+        try:
+            max_points = max_points_param(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         today = localdate()
-        year = today.year
-        month = today.month
-        
-        # Get all individual transactions up to today
-        expenses = IndividualExpense.objects.filter(
-            user=request.user,
-            expense_date__year=year,
-            expense_date__month=month,
-            expense_date__day__lte=today.day
-        ).order_by('expense_date', 'created_at')
-        
-        result = []
-        for i, exp in enumerate(expenses):
-            result.append({
-                'index': i + 1,
-                'day': exp.expense_date.day,
-                'date': exp.expense_date.strftime('%d %b'),
-                'amount': float(exp.amount),
-                'category': exp.category,
-                'description': exp.description or exp.category
-            })
-            
-        return Response(result)
+        points = metrics.get('individual.expenses').series(request.user, 'day', today.replace(day=1), today)
+
+        return Response([{
+            'index': point['start'].day,
+            'day': point['start'].day,
+            'date': point['start'].strftime('%d %b'),
+            'amount': float(point['total']),
+            'count': point['count']
+        } for point in downsample(points, max_points, y_key='total')])
 
     @action(detail=False, methods=['get'])
     def yearly_spending_summary(self, request):
         """Get monthly spending for the last 12 months for charts"""
         from django.utils.timezone import localdate
         today = localdate()
-        
-        result = []
-        import calendar
-        
-        # Calculate last 12 months manually
-        curr_month = today.month
-        curr_year = today.year
-        
-        months_to_fetch = []
-        for i in range(12):
-            months_to_fetch.append((curr_year, curr_month))
-            curr_month -= 1
-            if curr_month == 0:
-                curr_month = 12
-                curr_year -= 1
-        
-        # Reverse to get chronological order
-        months_to_fetch.reverse()
-        
-        for year, month in months_to_fetch:
-            total = IndividualExpense.objects.filter(
-                user=request.user,
-                expense_date__year=year,
-                expense_date__month=month
-            ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            
-            result.append({
-                'month': calendar.month_name[month][:3],
-                'full_month': calendar.month_name[month],
-                'year': year,
-                'amount': float(total)
-            })
-            
-        return Response(result)
+        return Response(yearly_spending_totals(request.user, today))
 
     @action(detail=False, methods=['post'])
     def set_budget(self, request):
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class InstituteModuleConfig(AppConfig):
+    name = 'institute_module'
+
+    def ready(self):
+        import institute_module.signals  # noqa
+        import institute_module.timeseries  # noqa
@@ -0,0 +1,52 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from core.data_version import DataVersionService
+from core.events import EventTypes, publish
+from .models import TeacherProfile, InstituteStudentProfile, FeePayment, SalaryPayment, InstituteNotification, StudentAttendance
+
+
+# Institute-scoped aggregates (fee status, revenue, payouts) are keyed by the
+# institute; fee and salary writes also bump the payer's/payee's user version.
+@receiver([post_save, post_delete], sender=InstituteStudentProfile)
+@receiver([post_save, post_delete], sender=TeacherProfile)
+def institute_member_changed(sender, instance, **kwargs):
+    DataVersionService.bump('institute', instance.institute_id)
+    DataVersionService.bump('user', instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=FeePayment)
+def fee_payment_changed(sender, instance, **kwargs):
+    profile = InstituteStudentProfile.objects.filter(pk=instance.student_profile_id).values_list('institute_id', 'user_id').first()
+    if profile:
+        DataVersionService.bump('institute', profile[0])
+        DataVersionService.bump('user', profile[1])
+
+
+@receiver([post_save, post_delete], sender=SalaryPayment)
+def salary_payment_changed(sender, instance, **kwargs):
+    profile = TeacherProfile.objects.filter(pk=instance.teacher_profile_id).values_list('institute_id', 'user_id').first()
+    if profile:
+        DataVersionService.bump('institute', profile[0])
+        DataVersionService.bump('user', profile[1])
+
+
+@receiver(m2m_changed, sender=TeacherProfile.assigned_students.through)
+def teacher_assignments_changed(sender, instance, **kwargs):
+    if isinstance(instance, TeacherProfile):
+        DataVersionService.bump('institute', instance.institute_id)
+        DataVersionService.bump('user', instance.user_id)
+    else:
+        DataVersionService.bump('institute', instance.institute_id)
+
+
+@receiver([post_save, post_delete], sender=InstituteNotification)
+def notification_changed(sender, instance, created=False, **kwargs):
+    DataVersionService.bump('user', instance.recipient_id)
+    if created:
+        publish([instance.recipient_id], EventTypes.NOTIFICATION, {'notification_id': instance.pk})
+
+
+@receiver([post_save, post_delete], sender=StudentAttendance)
+def student_attendance_changed(sender, instance, **kwargs):
+    institute_id = InstituteStudentProfile.objects.filter(pk=instance.student_profile_id).values_list('institute_id', flat=True).first()
+    DataVersionService.bump('institute', institute_id)
@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .models import FeePayment, Institute, InstituteStudentProfile, SalaryPayment, TeacherProfile
+
+User = get_user_model()
+
+
+class InstituteDashboardStatusTests(APITestCase):
+    """Fee and payout status sections of the owner and teacher dashboards"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='testpass123', persona='INSTITUTE_OWNER')
+        self.institute = Institute.objects.create(owner=self.owner, name='Status School')
+        self.teacher_user = User.objects.create_user(username='teacher0', password='testpass123', persona='INSTITUTE_TEACHER')
+        self.teacher = TeacherProfile.objects.create(user=self.teacher_user, institute=self.institute)
+        self.students = 0
+        self.teachers = 1
+        self.add_students(1)
+
+    def add_students(self, n):
+        for _ in range(n):
+            self.students += 1
+            user = User.objects.create_user(username=f'student{self.students}', persona='STUDENT')
+            profile = InstituteStudentProfile.objects.create(
+                user=user, institute=self.institute, student_name=f'Student {self.students:03d}',
+                parent_mobile='9000000000', monthly_fee=Decimal('1000'),
+            )
+            self.teacher.assigned_students.add(profile)
+
+    def add_teachers(self, n):
+        for _ in range(n):
+            user = User.objects.create_user(username=f'teacher{self.teachers}', persona='INSTITUTE_TEACHER')
+            TeacherProfile.objects.create(user=user, institute=self.institute)
+            self.teachers += 1
+
+    def dashboard(self, user, sections, **params):
+        self.client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('institute-dashboard'), {'sections': sections, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(queries)
+
+    def test_owner_status_keeps_id_keyed_shape(self):
+        from django.utils import timezone
+
+        now = timezone.now()
+        profile = InstituteStudentProfile.objects.get(institute=self.institute)
+        FeePayment.objects.create(
+            student_profile=profile, total_amount=Decimal('1000'), paid_amount=Decimal('400'),
+            month=now.month, year=now.year, status='PARTIAL',
+        )
+        SalaryPayment.objects.create(teacher_profile=self.teacher, amount=Decimal('500'), month=now.month, year=now.year, status='PAID')
+
+        response, _ = self.dashboard(self.owner, 'student_fee_status,teacher_payout_status')
+        self.assertEqual(response.data['student_fee_status'], {
+            profile.id: {'total': 1000.0, 'paid': 400.0, 'pending': 600.0, 'status': 'PARTIAL'},
+        })
+        self.assertEqual(response.data['teacher_payout_status'], {self.teacher.id: 'PAID'})
+        self.assertEqual(response.data['student_fee_status_page']['count'], 1)
+        self.assertEqual(response.data['teacher_payout_status_page']['num_pages'], 1)
+
+    def test_owner_status_pages(self):
+        self.add_students(4)
+        response, _ = self.dashboard(self.owner, 'student_fee_status', fee_page=2, page_size=2)
+        self.assertEqual(len(response.data['student_fee_status']), 2)
+        self.assertEqual(
+            response.data['student_fee_status_page'], {'count': 5, 'page': 2, 'page_size': 2, 'num_pages': 3}
+        )
+
+    def test_owner_status_queries_do_not_grow_with_members(self):
+        _, one = self.dashboard(self.owner, 'student_fee_status,teacher_payout_status')
+        self.add_students(20)
+        self.add_teachers(20)
+        response, many = self.dashboard(self.owner, 'student_fee_status,teacher_payout_status')
+        self.assertEqual(len(response.data['student_fee_status']), 21)
+        self.assertEqual(len(response.data['teacher_payout_status']), 21)
+        self.assertEqual(one, many)
+
+    def test_teacher_fee_status_queries_do_not_grow_with_students(self):
+        _, one = self.dashboard(self.teacher_user, 'student_fee_status')
+        self.add_students(20)
+        response, many = self.dashboard(self.teacher_user, 'student_fee_status')
+        self.assertEqual(len(response.data['student_fee_status']), 21)
+        self.assertEqual(one, many)
@@ -0,0 +1,20 @@
+"""Time-series metrics for institute owners (see core/timeseries.py)."""
+from core.timeseries import metrics
+from .models import FeePayment, Institute, SalaryPayment
+
+
+def owned_institute_ids(user):
+    return list(Institute.objects.filter(owner=user).values_list('pk', flat=True))
+
+
+@metrics.register('institute.fee_collections', date_field='payment_date', value='paid_amount', split_field='status',
+                  scope='institute', scope_ids=owned_institute_ids)
+def institute_fee_collections(user):
+    return FeePayment.objects.filter(student_profile__institute__owner=user, payment_date__isnull=False)
+
+
+@metrics.register('institute.salary_payouts', date_field='payment_date', scope='institute', scope_ids=owned_institute_ids)
+def institute_salary_payouts(user):
+    return SalaryPayment.objects.filter(
+        teacher_profile__institute__owner=user, status=SalaryPayment.Status.PAID, payment_date__isnull=False
+    )
@@ -2,11 +2,16 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import Sum, Q, Count
+from django.db.models import Sum, Q, Count, F, Value, DecimalField, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
+from core.data_version import DataVersionService, versioned_memoize
+from core.conditional import conditional_get
+from core.concurrency import run_concurrently
+from core.sections import SectionContext, SectionRegistry, UnknownSectionError
 from decimal import Decimal
 from .models import Institute, TeacherProfile, InstituteStudentProfile, FeePayment, SalaryPayment, InstituteNotification, StudentAttendance, TeacherAttendance
 from .serializers import (
@@ -506,9 +511,238 @@ class SalaryPaymentViewSet(viewsets.ModelViewSet):
         
         return Response(SalaryPaymentSerializer(payment).data)
 
+DASHBOARD_PAGE_SIZE = 50
+MAX_DASHBOARD_PAGE_SIZE = 200
+
+
+def _positive_int(value, default):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def dashboard_page_params(query_params, page_param):
+    """Page number and size for a paginated dashboard section."""
+    page = _positive_int(query_params.get(page_param), 1)
+    page_size = min(_positive_int(query_params.get('page_size'), DASHBOARD_PAGE_SIZE), MAX_DASHBOARD_PAGE_SIZE)
+    return page, page_size
+
+
+def _paginate(queryset, page, page_size, row):
+    """
+    One page of ``queryset`` in the dashboards' ``{id: status}`` shape.
+
+    Returns:
+        ``results`` mapping each row's id to ``row(item)`` and ``page``
+        with the count, page number, page size and number of pages
+    """
+    count = queryset.count()
+    offset = (page - 1) * page_size
+    return {
+        'results': {item['id']: row(item) for item in queryset[offset:offset + page_size]},
+        'page': {
+            'count': count,
+            'page': page,
+            'page_size': page_size,
+            'num_pages': max(1, -(-count // page_size)),
+        },
+    }
+
+
+def student_fee_status_queryset(institute_ids, month, year, teacher_user_id=None):
+    """
+    Active student profiles annotated with the month's fee figures.
+
+    Students without a FeePayment row for the month fall back to their
+    monthly fee, nothing paid and PENDING. Restricted to a teacher's
+    assigned students when teacher_user_id is given.
+    """
+    fees = FeePayment.objects.filter(student_profile=OuterRef('pk'), month=month, year=year)
+    profiles = InstituteStudentProfile.objects.filter(institute_id__in=institute_ids, is_active=True)
+    if teacher_user_id:
+        assigned = InstituteStudentProfile.objects.filter(assigned_teachers__user_id=teacher_user_id).values('pk')
+        profiles = profiles.filter(pk__in=Subquery(assigned))
+    money = DecimalField(max_digits=10, decimal_places=2)
+    return profiles.annotate(
+        fee_total=Coalesce(Subquery(fees.values('total_amount')[:1], output_field=money), F('monthly_fee')),
+        fee_paid=Coalesce(Subquery(fees.values('paid_amount')[:1], output_field=money), Value(Decimal('0.00')), output_field=money),
+        fee_status=Coalesce(Subquery(fees.values('status')[:1]), Value(FeePayment.Status.PENDING)),
+    )
+
+
+@versioned_memoize('institute', key=lambda institute_ids, *args, **kwargs: institute_ids)
+def student_fee_status_page(institute_ids, month, year, page, page_size, teacher_user_id=None):
+    """One page of the month's fee status per student, memoized on the institutes' data versions."""
+    queryset = student_fee_status_queryset(institute_ids, month, year, teacher_user_id).order_by('student_name', 'id').values(
+        'id', 'fee_total', 'fee_paid', 'fee_status'
+    )
+    return _paginate(queryset, page, page_size, lambda sp: {
+        'total': float(sp['fee_total']),
+        'paid': float(sp['fee_paid']),
+        'pending': float(sp['fee_total'] - sp['fee_paid']),
+        'status': sp['fee_status'],
+    })
+
+
+@versioned_memoize('institute', key=lambda institute_ids, *args, **kwargs: institute_ids)
+def teacher_payout_status_page(institute_ids, month, year, page, page_size):
+    """One page of the month's salary status per active teacher."""
+    paid = SalaryPayment.objects.filter(teacher_profile=OuterRef('pk'), month=month, year=year, status='PAID')
+    queryset = TeacherProfile.objects.filter(institute_id__in=institute_ids, is_active=True).annotate(
+        is_paid=Exists(paid)
+    ).order_by('id').values('id', 'is_paid')
+    return _paginate(queryset, page, page_size, lambda tp: 'PAID' if tp['is_paid'] else 'PENDING')
+
+
+def institute_dashboard_versions(request, *args, **kwargs):
+    """Versions of every institute the dashboard can draw on for this user."""
+    user = request.user
+    effective_user_ids = [user.id]
+    student_id = request.query_params.get('student_id')
+    if student_id and str(student_id).isdigit():
+        effective_user_ids.append(int(student_id))
+    institute_ids = set(Institute.objects.filter(owner=user).values_list('id', flat=True))
+    institute_ids.update(TeacherProfile.objects.filter(user=user).values_list('institute_id', flat=True))
+    institute_ids.update(InstituteStudentProfile.objects.filter(user_id__in=effective_user_ids).values_list('institute_id', flat=True))
+    versions = [f"user:{uid}:{DataVersionService.get('user', uid)}" for uid in effective_user_ids[1:]]
+    versions += [f"institute:{i}:{DataVersionService.get('institute', i)}" for i in sorted(institute_ids)]
+    return versions
+
+
+owner_dashboard_sections = SectionRegistry()
+teacher_dashboard_sections = SectionRegistry()
+
+
+@owner_dashboard_sections.register('owner_details', fields=('owner_details',))
+def owner_details_section(ctx):
+    return {'owner_details': {'username': ctx.user.username, 'uid': ctx.user.uid}}
+
+
+@owner_dashboard_sections.register('institutes', fields=('institutes',))
+def owner_institutes_section(ctx):
+    return {'institutes': InstituteSerializer(Institute.objects.filter(owner=ctx.user), many=True).data}
+
+
+@owner_dashboard_sections.register('teacher_payout_status', fields=('teacher_payout_status', 'teacher_payout_status_page'))
+def owner_teacher_payout_section(ctx):
+    page, page_size = dashboard_page_params(ctx.query_params, 'salary_page')
+    result = teacher_payout_status_page(ctx.institute_ids, ctx.now.month, ctx.now.year, page, page_size)
+    return {'teacher_payout_status': result['results'], 'teacher_payout_status_page': result['page']}
+
+
+@owner_dashboard_sections.register('student_fee_status', fields=('student_fee_status', 'student_fee_status_page'))
+def owner_student_fee_section(ctx):
+    page, page_size = dashboard_page_params(ctx.query_params, 'fee_page')
+    result = student_fee_status_page(ctx.institute_ids, ctx.now.month, ctx.now.year, page, page_size)
+    return {'student_fee_status': result['results'], 'student_fee_status_page': result['page']}
+
+
+@owner_dashboard_sections.register('recent_paid_fees', fields=('recent_paid_fees',))
+def owner_recent_fees_section(ctx):
+    fees = FeePayment.objects.filter(student_profile__institute__owner=ctx.user, status__in=['PAID', 'PARTIAL']).select_related('student_profile').order_by('-payment_date')[:20]
+    return {'recent_paid_fees': FeePaymentSerializer(fees, many=True).data}
+
+
+@owner_dashboard_sections.register('recent_paid_salaries', fields=('recent_paid_salaries',))
+def owner_recent_salaries_section(ctx):
+    salaries = SalaryPayment.objects.filter(teacher_profile__institute__owner=ctx.user, status='PAID').select_related('teacher_profile__user').order_by('-payment_date')[:20]
+    return {'recent_paid_salaries': SalaryPaymentSerializer(salaries, many=True).data}
+
+
+@versioned_memoize('institute', key=lambda institute_ids, *args, **kwargs: institute_ids, timeout=60 * 60)
+def institute_owner_stats(institute_ids, month, year, today):
+    """
+    Header block of counts and money totals for an owner's institutes.
+
+    Every figure is an aggregate, so the cost does not grow with the number
+    of students or teachers; memoized on the institutes' data versions.
+    Fees and salaries count towards the month they are billed for
+    (``month``/``year``), not the day money moved, so these are not
+    ``core.timeseries`` rollups over ``payment_date``; the
+    ``institute.fee_collections``/``institute.salary_payouts`` metrics chart
+    the latter.
+    """
+    # Independent aggregates; run concurrently
+    results = run_concurrently({
+        'total_students': lambda: InstituteStudentProfile.objects.filter(institute_id__in=institute_ids, is_active=True).count(),
+        'total_teachers': lambda: TeacherProfile.objects.filter(institute_id__in=institute_ids, is_active=True).count(),
+        'fees': lambda: FeePayment.objects.filter(student_profile__institute_id__in=institute_ids, month=month, year=year).aggregate(total_due=Sum('total_amount'), total_paid=Sum('paid_amount')),
+        'payout': lambda: SalaryPayment.objects.filter(teacher_profile__institute_id__in=institute_ids, month=month, year=year, status='PAID').aggregate(total=Sum('amount')),
+        'attendance': lambda: StudentAttendance.objects.filter(student_profile__institute_id__in=institute_ids, date=today).aggregate(present=Count('id', filter=Q(status='PRESENT')), absent=Count('id', filter=Q(status='ABSENT'))),
+        'fee_status_counts': lambda: dict(student_fee_status_queryset(institute_ids, month, year).order_by().values('fee_status').annotate(n=Count('id')).values_list('fee_status', 'n')),
+    })
+
+    monthly_revenue = results['fees']['total_paid'] or 0
+    monthly_payout = results['payout']['total'] or 0
+    pending_dues_total = (results['fees']['total_due'] or 0) - monthly_revenue
+
+    return {
+        'total_students': results['total_students'],
+        'total_teachers': results['total_teachers'],
+        'monthly_revenue': float(monthly_revenue),
+        'monthly_payout': float(monthly_payout),
+        'pending_fees': float(pending_dues_total),
+        'net_balance': float(monthly_revenue - monthly_payout),
+        'today_attendance': results['attendance'],
+        'fee_status_counts': results['fee_status_counts'],
+    }
+
+
+@owner_dashboard_sections.register('stats', fields=('stats',))
+def owner_stats_section(ctx):
+    return {'stats': institute_owner_stats(ctx.institute_ids, ctx.now.month, ctx.now.year, timezone.localdate())}
+
+
+@teacher_dashboard_sections.register('profile', fields=('profile',))
+def teacher_profile_section(ctx):
+    return {'profile': TeacherProfileSerializer(ctx.profile).data}
+
+
+@teacher_dashboard_sections.register('institutes', fields=('institutes',))
+def teacher_institutes_section(ctx):
+    return {'institutes': [InstituteSerializer(ctx.profile.institute).data]}
+
+
+@teacher_dashboard_sections.register('recent_salaries', fields=('recent_salaries',))
+def teacher_salaries_section(ctx):
+    recent_salaries = SalaryPayment.objects.filter(teacher_profile=ctx.profile).select_related('teacher_profile__user').order_by('-year', '-month')[:5]
+    return {'recent_salaries': SalaryPaymentSerializer(recent_salaries, many=True).data}
+
+
+@teacher_dashboard_sections.register('student_fee_status', fields=('student_fee_status', 'student_fee_status_page'))
+def teacher_student_fee_section(ctx):
+    institute_ids = list(TeacherProfile.objects.filter(user=ctx.user).values_list('institute_id', flat=True))
+    page, page_size = dashboard_page_params(ctx.query_params, 'fee_page')
+    result = student_fee_status_page(institute_ids, ctx.now.month, ctx.now.year, page, page_size, teacher_user_id=ctx.user.id)
+    return {'student_fee_status': result['results'], 'student_fee_status_page': result['page']}
+
+
+@teacher_dashboard_sections.register('notifications', fields=('notifications',))
+def teacher_notifications_section(ctx):
+    notifications = InstituteNotification.objects.filter(recipient=ctx.user).order_by('-sent_at')[:10]
+    return {'notifications': InstituteNotificationSerializer(notifications, many=True).data}
+
+
+@teacher_dashboard_sections.register('stats', fields=('stats',))
+def teacher_stats_section(ctx):
+    attendance_today = StudentAttendance.objects.filter(student_profile__assigned_teachers__user=ctx.user, date=timezone.localdate()).count()
+    return {'stats': {'students_marked_today': attendance_today}}
+
+
 class InstituteDashboardView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    def _render_sections(self, request, registry, role, **attrs):
+        try:
+            sections, fields = registry.select(request.query_params)
+        except UnknownSectionError as e:
+            return Response({'error': _('Unknown sections or fields: %(names)s') % {'names': e}}, status=400)
+        ctx = SectionContext(registry, query_params=request.query_params, **attrs)
+        return Response({'role': role, **registry.render(ctx, sections, fields)})
+
+    @conditional_get(extra=institute_dashboard_versions)
     def get(self, request):
         user = request.user
         now = timezone.now()
@@ -530,87 +764,15 @@ class InstituteDashboardView(APIView):
 
         # OWNER ROLE
         if user.persona == 'INSTITUTE_OWNER' and not target_student_user:
-            total_students = InstituteStudentProfile.objects.filter(institute__owner=user, is_active=True).count()
-            total_teachers = TeacherProfile.objects.filter(institute__owner=user, is_active=True).count()
-            
-            revenue_data = FeePayment.objects.filter(student_profile__institute__owner=user, month=now.month, year=now.year).aggregate(total=Sum('paid_amount'))
-            monthly_revenue = revenue_data['total'] or 0
-            
-            payout_data = SalaryPayment.objects.filter(teacher_profile__institute__owner=user, month=now.month, year=now.year, status='PAID').aggregate(total=Sum('amount'))
-            monthly_payout = payout_data['total'] or 0
-            
-            dues_data = FeePayment.objects.filter(student_profile__institute__owner=user, month=now.month, year=now.year).aggregate(total_due=Sum('total_amount'), total_paid=Sum('paid_amount'))
-            pending_dues_total = (dues_data['total_due'] or 0) - (dues_data['total_paid'] or 0)
-
-            today = timezone.localdate()
-            attendance_stats = StudentAttendance.objects.filter(student_profile__institute__owner=user, date=today).aggregate(present=Count('id', filter=Q(status='PRESENT')), absent=Count('id', filter=Q(status='ABSENT')))
-
-            teacher_profiles = TeacherProfile.objects.filter(institute__owner=user, is_active=True)
-            teacher_payout_status = {}
-            for tp in teacher_profiles:
-                is_paid = SalaryPayment.objects.filter(teacher_profile=tp, month=now.month, year=now.year, status='PAID').exists()
-                teacher_payout_status[tp.id] = 'PAID' if is_paid else 'PENDING'
-
-            paid_fees = FeePayment.objects.filter(student_profile__institute__owner=user, status__in=['PAID', 'PARTIAL']).order_by('-payment_date')[:20]
-            paid_salaries = SalaryPayment.objects.filter(teacher_profile__institute__owner=user, status='PAID').order_by('-payment_date')[:20]
-            
-            student_profiles = InstituteStudentProfile.objects.filter(institute__owner=user, is_active=True)
-            student_fee_status = {}
-            for sp in student_profiles:
-                fee_record = FeePayment.objects.filter(student_profile=sp, month=now.month, year=now.year).first()
-                if fee_record:
-                    student_fee_status[sp.id] = {'total': float(fee_record.total_amount), 'paid': float(fee_record.paid_amount), 'pending': float(fee_record.pending_amount), 'status': fee_record.status}
-                else:
-                    student_fee_status[sp.id] = {'total': float(sp.monthly_fee), 'paid': 0.0, 'pending': float(sp.monthly_fee), 'status': 'PENDING'}
-
-            return Response({
-                'role': 'OWNER',
-                'owner_details': {'username': user.username, 'uid': user.uid},
-                'institutes': InstituteSerializer(Institute.objects.filter(owner=user), many=True).data,
-                'teacher_payout_status': teacher_payout_status,
-                'student_fee_status': student_fee_status,
-                'recent_paid_fees': FeePaymentSerializer(paid_fees, many=True).data,
-                'recent_paid_salaries': SalaryPaymentSerializer(paid_salaries, many=True).data,
-                'stats': {
-                    'total_students': total_students,
-                    'total_teachers': total_teachers,
-                    'monthly_revenue': float(monthly_revenue),
-                    'monthly_payout': float(monthly_payout),
-                    'pending_fees': float(pending_dues_total),
-                    'net_balance': float(monthly_revenue - monthly_payout),
-                    'today_attendance': attendance_stats
-                }
-            })
+            institute_ids = list(Institute.objects.filter(owner=user).values_list('id', flat=True))
+            return self._render_sections(request, owner_dashboard_sections, 'OWNER', user=user, now=now, institute_ids=institute_ids)
 
         # TEACHER ROLE
         elif user.persona == 'INSTITUTE_TEACHER' and not target_student_user:
-            profile = TeacherProfile.objects.filter(user=user).first()
+            profile = TeacherProfile.objects.filter(user=user).select_related('user', 'institute').prefetch_related('assigned_students__user').first()
             if not profile:
                 return Response({'role': 'TEACHER', 'message': 'No teacher profile found.'})
-                
-            recent_salaries = SalaryPayment.objects.filter(teacher_profile=profile).order_by('-year', '-month')[:5]
-            today = timezone.localdate()
-            attendance_today = StudentAttendance.objects.filter(student_profile__assigned_teachers__user=user, date=today).count()
-            notifications = InstituteNotification.objects.filter(recipient=user).order_by('-sent_at')[:10]
-
-            assigned_students = InstituteStudentProfile.objects.filter(assigned_teachers__user=user, is_active=True)
-            student_fee_status = {}
-            for sp in assigned_students:
-                fee_record = FeePayment.objects.filter(student_profile=sp, month=now.month, year=now.year).first()
-                if fee_record:
-                    student_fee_status[sp.id] = {'total': float(fee_record.total_amount), 'paid': float(fee_record.paid_amount), 'pending': float(fee_record.pending_amount), 'status': fee_record.status}
-                else:
-                    student_fee_status[sp.id] = {'total': float(sp.monthly_fee), 'paid': 0.0, 'pending': float(sp.monthly_fee), 'status': 'PENDING'}
-            
-            return Response({
-                'role': 'TEACHER',
-                'profile': TeacherProfileSerializer(profile).data,
-                'institutes': [InstituteSerializer(profile.institute).data],
-                'recent_salaries': SalaryPaymentSerializer(recent_salaries, many=True).data,
-                'student_fee_status': student_fee_status,
-                'notifications': InstituteNotificationSerializer(notifications, many=True).data,
-                'stats': {'students_marked_today': attendance_today}
-            })
+            return self._render_sections(request, teacher_dashboard_sections, 'TEACHER', user=user, now=now, profile=profile)
 
         # STUDENT role OR PARENT requesting for a student
         if user.persona in ['STUDENT', 'STUDENT_ACADEMIC'] or target_student_user:
@@ -0,0 +1,65 @@
+"""Parent alert settings as rules on a student's expenses (see core/alert_rules.py)."""
+from django.utils.translation import gettext as _
+
+from core.alert_rules import Rule, rules
+from student_module.alert_rules import active_allowance
+from .models import AlertSettings, ParentAlert
+
+BUDGET_PERCENTS = {
+    AlertSettings.AlertType.BUDGET_50: 50,
+    AlertSettings.AlertType.BUDGET_70: 70,
+    AlertSettings.AlertType.BUDGET_100: 100,
+}
+
+
+def alert_message(rule, total):
+    values = {'student': rule.data['student'], 'spent': total, 'limit': rule.threshold}
+    alert_type = rule.data['alert_type']
+    if alert_type == AlertSettings.AlertType.DAILY_LIMIT_EXCEEDED:
+        return _('%(student)s has spent ₹%(spent)s today, reaching the daily limit (₹%(limit)s).') % values
+    if alert_type == AlertSettings.AlertType.WEEKLY_SPENDING_HIGH:
+        return _('%(student)s has spent ₹%(spent)s this week, a full week of allowance (₹%(limit)s).') % values
+    values['percent'] = BUDGET_PERCENTS[alert_type]
+    return _('%(student)s has spent ₹%(spent)s, %(percent)s%% of the monthly allowance.') % values
+
+
+def create_parent_alert(rule, total):
+    return ParentAlert.objects.create(
+        parent_id=rule.data['parent_id'],
+        student_id=rule.data['student_id'],
+        alert_type=rule.data['alert_type'],
+        message=alert_message(rule, total),
+    )
+
+
+@rules.provider('student.expenses')
+def parent_alert_rules(owner_id):
+    """
+    Parents' enabled alert settings for the student, against the student's
+    active allowance: 50/70/100% of the monthly allowance per month, the
+    daily allowance per day and a week's worth of it per week.
+    """
+    settings = list(AlertSettings.objects.filter(student_id=owner_id, is_enabled=True).select_related('student'))
+    allowance = active_allowance(owner_id) if settings else None
+    if allowance is None:
+        return
+    daily = allowance.get_daily_allowance()
+
+    for setting in settings:
+        if setting.alert_type in BUDGET_PERCENTS:
+            limit, period = allowance.monthly_amount * BUDGET_PERCENTS[setting.alert_type] / 100, 'month'
+        elif setting.alert_type == AlertSettings.AlertType.DAILY_LIMIT_EXCEEDED:
+            limit, period = daily, 'day'
+        elif setting.alert_type == AlertSettings.AlertType.WEEKLY_SPENDING_HIGH:
+            limit, period = daily * 7, 'week'
+        else:
+            continue
+        if limit <= 0:
+            continue
+        yield Rule(
+            f'parent_{setting.parent_id}_{setting.alert_type}', limit, create_parent_alert, period=period,
+            data={
+                'parent_id': setting.parent_id, 'student_id': owner_id, 'student': setting.student.username,
+                'alert_type': setting.alert_type,
+            },
+        )
@@ -7,3 +7,5 @@ class ParentModuleConfig(AppConfig):
 
     def ready(self):
         import parent_module.translation  # noqa
+        import parent_module.signals  # noqa
+        import parent_module.alert_rules  # noqa
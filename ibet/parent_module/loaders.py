@@ -0,0 +1,36 @@
+"""
+Batch loaders for parent-level aggregates.
+
+See ``core.loaders`` for how serializers use them.
+"""
+from django.db.models import Count, Sum
+
+from core.loaders import BatchLoader
+from student_module.models import ParentStudentLink, Transaction
+
+
+class LinkedStudentCountLoader(BatchLoader):
+    """parent_id -> number of linked students."""
+
+    default = 0
+
+    def batch_load(self, keys):
+        rows = ParentStudentLink.objects.filter(parent_id__in=keys).values('parent_id').annotate(count=Count('id'))
+        return {row['parent_id']: row['count'] for row in rows}
+
+
+class StudentSpendingByParentLoader(BatchLoader):
+    """parent_id -> total EXP transactions across all linked students."""
+
+    default = 0.00
+
+    def batch_load(self, keys):
+        links = dict(ParentStudentLink.objects.filter(parent_id__in=keys).values_list('student_id', 'parent_id'))
+        if not links:
+            return {}
+        totals = {}
+        rows = Transaction.objects.filter(user_id__in=links, transaction_type='EXP').values('user_id').annotate(total=Sum('amount'))
+        for row in rows:
+            parent_id = links[row['user_id']]
+            totals[parent_id] = totals.get(parent_id, 0) + row['total']
+        return totals
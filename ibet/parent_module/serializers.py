@@ -1,17 +1,21 @@
 from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
 from .models import ParentDashboard, AlertSettings, StudentMonitoring, ParentAlert, ParentOTPRequest
-from student_module.models import ParentStudentLink, Transaction, Wallet, DailyAllowance
-from django.db.models import Sum
+from student_module.models import ParentStudentLink, Transaction
+from core.loaders import BatchListSerializer, BatchMethodField
+from student_module.loaders import (
+    WalletByUserLoader, TodaySpentLoader, DailyAllowanceSummaryLoader, RecentAllowanceContributionsLoader
+)
+from .loaders import LinkedStudentCountLoader, StudentSpendingByParentLoader
 
 
 class ParentDashboardSerializer(serializers.ModelSerializer):
     """Serializer for the ParentDashboard model."""
-    total_student_spending = serializers.SerializerMethodField()
-    linked_students_count = serializers.SerializerMethodField()
-    wallet_balance = serializers.SerializerMethodField()
-    today_spent = serializers.SerializerMethodField()
-    total_funds = serializers.SerializerMethodField()
+    total_student_spending = BatchMethodField(StudentSpendingByParentLoader, key='parent_id')
+    linked_students_count = BatchMethodField(LinkedStudentCountLoader, key='parent_id')
+    wallet_balance = BatchMethodField(WalletByUserLoader, key='parent_id')
+    today_spent = BatchMethodField(TodaySpentLoader, key='parent_id')
+    total_funds = BatchMethodField(WalletByUserLoader, key='parent_id')
 
     class Meta:
         model = ParentDashboard
@@ -21,38 +25,24 @@ class ParentDashboardSerializer(serializers.ModelSerializer):
             'wallet_balance', 'today_spent', 'total_funds'
         ]
         read_only_fields = ['id', 'last_accessed']
+        list_serializer_class = BatchListSerializer
 
-    def get_total_student_spending(self, obj):
-        return obj.get_total_student_spending()
+    def get_total_student_spending(self, obj, total):
+        return total
 
-    def get_linked_students_count(self, obj):
-        return ParentStudentLink.objects.filter(parent=obj.parent).count()
+    def get_linked_students_count(self, obj, count):
+        return count
 
-    def get_wallet_balance(self, obj):
-        try:
-            wallet = Wallet.objects.get(user=obj.parent)
-            return float(wallet.balance)
-        except Wallet.DoesNotExist:
-            return 0.0
+    def get_wallet_balance(self, obj, wallet):
+        return float(wallet.balance) if wallet else 0.0
 
-    def get_today_spent(self, obj):
-        from django.utils import timezone
-        today = timezone.localdate()
+    def get_today_spent(self, obj, spent):
         # Count all parent's EXPENSE transactions (Personal Expenses + Transfers to Children)
-        spent = Transaction.objects.filter(
-            user=obj.parent,
-            transaction_type='EXP',
-            transaction_date=today
-        ).aggregate(total=Sum('amount'))['total'] or 0.00
-        return float(spent)
-
-    def get_total_funds(self, obj):
+        return float(spent or 0.00)
+
+    def get_total_funds(self, obj, wallet):
         # Total funds available to the parent (their wallet balance)
-        try:
-            wallet = Wallet.objects.get(user=obj.parent)
-            return float(wallet.balance)
-        except Wallet.DoesNotExist:
-            return 0.0
+        return float(wallet.balance) if wallet else 0.0
 
 
 class AlertSettingsSerializer(serializers.ModelSerializer):
@@ -113,61 +103,39 @@ class StudentWalletAccessSerializer(serializers.Serializer):
 class StudentOverviewSerializer(serializers.Serializer):
     """Serializer for parent viewing student's overview."""
     student_id = serializers.IntegerField()
-    wallet_balance = serializers.SerializerMethodField()
-    daily_limit = serializers.SerializerMethodField()
-    current_daily_spent = serializers.SerializerMethodField()
+    wallet_balance = BatchMethodField(WalletByUserLoader, key='student_id')
+    daily_limit = BatchMethodField(DailyAllowanceSummaryLoader, key='student_id')
+    current_daily_spent = BatchMethodField(TodaySpentLoader, key='student_id')
     recent_transactions = serializers.SerializerMethodField()
-    allowance_history = serializers.SerializerMethodField()
+    allowance_history = BatchMethodField(RecentAllowanceContributionsLoader, key='student_id')
     has_pin = serializers.SerializerMethodField()
 
-    def get_wallet_balance(self, obj):
-        try:
-            wallet = Wallet.objects.get(user_id=obj['student_id'])
-            return wallet.balance
-        except Wallet.DoesNotExist:
-            return 0.00
+    class Meta:
+        list_serializer_class = BatchListSerializer
 
-    def get_daily_limit(self, obj):
-        from django.utils import timezone
-        today = timezone.now().date()
-        
-        # Get all available daily allowances for the student
-        daily_allowances = DailyAllowance.objects.filter(
-            student_id=obj['student_id'],
-            is_available=True
-        ).order_by('date')
-        
-        if not daily_allowances.exists():
+    def get_wallet_balance(self, obj, wallet):
+        return wallet.balance if wallet else 0.00
+
+    def get_daily_limit(self, obj, summary):
+        # Totals over the available days plus today's allowance
+        if not summary or not summary['available_days']:
             return None
-        
-        # Calculate totals from available days
-        total_monthly = sum(float(da.daily_amount) for da in daily_allowances)
-        total_spent = sum(float(da.amount_spent) for da in daily_allowances)
-        
-        # Get today's allowance specifically
-        try:
-            today_allowance = DailyAllowance.objects.get(student_id=obj['student_id'], date=today)
-            today_limit = float(today_allowance.daily_amount)
-            today_spent = float(today_allowance.amount_spent)
-        except DailyAllowance.DoesNotExist:
+        if summary['today_days']:
+            today_limit = float(summary['today_amount'])
+            today_spent = float(summary['today_spent'])
+        else:
             today_limit = 0
             today_spent = 0
-        
+
         return {
-            'monthly_budget': total_monthly,
+            'monthly_budget': float(summary['total_amount']),
             'daily_limit_amount': today_limit,
             'current_daily_spent': today_spent
         }
 
-    def get_current_daily_spent(self, obj):
+    def get_current_daily_spent(self, obj, spent):
         # Calculate current day's spending
-        from django.utils import timezone
-        today = timezone.localdate()
-        return Transaction.objects.filter(
-            user_id=obj['student_id'],
-            transaction_date=today,
-            transaction_type='EXP'
-        ).aggregate(total=Sum('amount'))['total'] or 0.00
+        return spent or 0.00
 
     def get_recent_transactions(self, obj):
         from django.utils import timezone
@@ -224,11 +192,7 @@ class StudentOverviewSerializer(serializers.Serializer):
         combined.sort(key=lambda x: x['date'], reverse=True)
         return combined[:10]
 
-    def get_allowance_history(self, obj):
-        from student_module.models import AllowanceContribution
-        history = AllowanceContribution.objects.filter(
-            student_id=obj['student_id']
-        ).order_by('-created_at')[:10]
+    def get_allowance_history(self, obj, history):
         return [{
             'id': h.id,
             'amount': float(h.amount),
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.alert_rules import rules as alert_rules
+from core.data_version import DataVersionService
+from core.events import EventTypes, publish
+from .models import ParentDashboard, AlertSettings, StudentMonitoring, ParentAlert, ParentOTPRequest
+
+
+# Parent dashboards and overviews read these alongside the children's
+# ledgers (which bump the parent from student_module.signals).
+@receiver([post_save, post_delete], sender=ParentDashboard)
+@receiver([post_save, post_delete], sender=AlertSettings)
+@receiver([post_save, post_delete], sender=StudentMonitoring)
+@receiver([post_save, post_delete], sender=ParentAlert)
+@receiver([post_save, post_delete], sender=ParentOTPRequest)
+def parent_data_changed(sender, instance, **kwargs):
+    DataVersionService.bump('user', instance.parent_id)
+
+
+# Alert settings are compiled into rules on the student's expenses
+# (parent_module/alert_rules.py).
+@receiver([post_save, post_delete], sender=AlertSettings)
+def alert_rules_settings_changed(sender, instance, **kwargs):
+    alert_rules.invalidate('student.expenses', instance.student_id)
+
+
+@receiver(post_save, sender=ParentAlert)
+def publish_parent_alert(sender, instance, created, **kwargs):
+    if created:
+        publish([instance.parent_id], EventTypes.NOTIFICATION, {'alert_id': instance.pk, 'student_id': instance.student_id})
+
+
+@receiver(post_save, sender=ParentOTPRequest)
+def publish_parent_otp_request(sender, instance, **kwargs):
+    publish([instance.parent_id, instance.student_id], EventTypes.OTP_REQUEST, {'student_id': instance.student_id})
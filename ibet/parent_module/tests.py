@@ -75,6 +75,74 @@ class ParentModuleTestCase(APITestCase):
         self.assertIn('wallet_balance', response.data)
 
 
+    def test_family_overview_uses_fixed_number_of_queries(self):
+        """Family overview query count does not grow with the number of children"""
+        from datetime import date
+        from decimal import Decimal
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from student_module.models import Transaction, Wallet
+        from .views import family_overview
+
+        def add_child(name):
+            child = User.objects.create_user(username=name, password='testpass123', persona='STUDENT')
+            ParentStudentLink.objects.create(parent=self.parent, student=child)
+            Wallet.objects.create(user=child, balance=Decimal('100.00'))
+            for i in range(12):
+                Transaction.objects.create(user=child, amount=Decimal('5.00'), transaction_type='EXP', transaction_date=date.today(), description=f'Snack {i}')
+            return child
+
+        add_child('family_child_1')
+        with CaptureQueriesContext(connection) as one_child:
+            family_overview.uncached(self.parent, date.today())
+        add_child('family_child_2')
+        add_child('family_child_3')
+        with CaptureQueriesContext(connection) as three_children:
+            overview = family_overview.uncached(self.parent, date.today())
+
+        self.assertEqual(len(one_child), len(three_children))
+        self.assertEqual(len(overview), 4)
+        child = next(s for s in overview if s['username'] == 'family_child_3')
+        self.assertEqual(child['today_spent'], Decimal('60.00'))
+        self.assertEqual(len(child['recent_transactions']), 10)
+
+    def test_family_overview_view(self):
+        """Test the family overview endpoint"""
+        self.client.force_authenticate(user=self.parent)
+        response = self.client.get(reverse('family-overview'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_students'], 1)
+        self.assertEqual(response.data['students'][0]['id'], self.student.id)
+
+
+class ParentDashboardSerializerTest(TestCase):
+    def test_list_uses_fixed_number_of_queries(self):
+        """Serializing more dashboards does not add queries"""
+        from decimal import Decimal
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from student_module.models import Wallet
+        from .models import ParentDashboard
+        from .serializers import ParentDashboardSerializer
+
+        def add_parent(name):
+            parent = User.objects.create_user(username=name, password='testpass123', persona='PARENT')
+            Wallet.objects.create(user=parent, balance=Decimal('75.00'))
+            ParentDashboard.objects.create(parent=parent)
+
+        add_parent('batch_parent_1')
+        with CaptureQueriesContext(connection) as one:
+            ParentDashboardSerializer(ParentDashboard.objects.all(), many=True).data
+        add_parent('batch_parent_2')
+        add_parent('batch_parent_3')
+        with CaptureQueriesContext(connection) as three:
+            data = ParentDashboardSerializer(ParentDashboard.objects.all(), many=True).data
+
+        self.assertEqual(len(one), len(three))
+        self.assertEqual([row['wallet_balance'] for row in data], [75.0, 75.0, 75.0])
+        self.assertEqual(data[0]['total_funds'], 75.0)
+
+
 class ParentOTPRequestModelTest(TestCase):
     def setUp(self):
         self.parent = User.objects.create_user(
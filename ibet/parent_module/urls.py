@@ -3,7 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     ParentDashboardViewSet, AlertSettingsViewSet, StudentMonitoringViewSet,
     ParentAlertViewSet, StudentWalletAccessView, StudentOverviewView, LinkedStudentsView,
-    ParentOTPRequestViewSet, GenerateOTPView, LinkStudentView
+    ParentOTPRequestViewSet, GenerateOTPView, LinkStudentView, FamilyOverviewView
 )
 
 router = DefaultRouter()
@@ -18,6 +18,7 @@ urlpatterns = [
     path('', include(router.urls)),
     path('wallet-access/', StudentWalletAccessView.as_view(), name='student-wallet-access'),
     path('students/', LinkedStudentsView.as_view(), name='linked-students'),
+    path('family-overview/', FamilyOverviewView.as_view(), name='family-overview'),
     path('students/<int:student_id>/overview/', StudentOverviewView.as_view(), name='student-overview'),
     path('generate-otp/', GenerateOTPView.as_view(), name='generate-otp'),
     path('link-student/', LinkStudentView.as_view(), name='link-student'),
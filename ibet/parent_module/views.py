@@ -6,13 +6,18 @@ from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext_lazy as _
 from core.throttling import OTPGenerationThrottle, WalletAccessThrottle, SensitiveOperationsThrottle
 from core.security import OTPSecurityService
+from core.data_version import versioned_memoize
+from core.conditional import conditional_get
 from .models import ParentDashboard, AlertSettings, StudentMonitoring, ParentAlert, ParentOTPRequest
 from .serializers import (
     ParentDashboardSerializer, AlertSettingsSerializer, StudentMonitoringSerializer,
     ParentAlertSerializer, StudentWalletAccessSerializer, StudentOverviewSerializer,
     ParentOTPRequestSerializer, GenerateOTPSerializer
 )
-from student_module.models import ParentStudentLink, Wallet, Transaction
+from student_module.models import ParentStudentLink, Wallet, Transaction, DailySpending, SpendingLock
+from student_module.serializers import TransactionSerializer
+from django.db.models import Count, Prefetch, Sum
+from decimal import Decimal
 from django.utils import timezone
 import random
 import string
@@ -28,6 +33,10 @@ class ParentDashboardViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return ParentDashboard.objects.filter(parent=self.request.user)
 
+    @conditional_get()
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         parent_dashboard, created = ParentDashboard.objects.get_or_create(parent=self.request.user)
         serializer.instance = parent_dashboard
@@ -133,6 +142,7 @@ class StudentOverviewView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     throttle_classes = [WalletAccessThrottle]
 
+    @conditional_get()
     def get(self, request, student_id, *args, **kwargs):
         # Check if parent is linked to this student
         if not ParentStudentLink.objects.filter(parent=request.user, student_id=student_id).exists():
@@ -159,32 +169,118 @@ class LinkedStudentsView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_get()
     def get(self, request, *args, **kwargs):
-        linked_students = ParentStudentLink.objects.filter(parent=request.user).select_related('student')
-        students_data = []
+        students_data = linked_students_summary(request.user)
+        return Response({
+            'linked_students': students_data,
+            'total_students': len(students_data)
+        })
 
-        for link in linked_students:
-            student = link.student
-            try:
-                wallet = Wallet.objects.get(user=student)
-                wallet_balance = wallet.balance
-            except Wallet.DoesNotExist:
-                wallet_balance = 0.00
-
-            students_data.append({
-                'id': student.id,
-                'username': student.username,
-                'email': student.email,
-                'wallet_balance': wallet_balance,
-                'linked_since': link.id  # Using id as proxy for creation date
-            })
 
+@versioned_memoize('user', key=lambda parent: parent.pk)
+def linked_students_summary(parent):
+    """Linked students with wallet balances, memoized on the parent's data version."""
+    linked_students = ParentStudentLink.objects.filter(parent=parent).select_related('student', 'student__wallet')
+    students_data = []
+
+    for link in linked_students:
+        student = link.student
+        try:
+            wallet_balance = student.wallet.balance
+        except Wallet.DoesNotExist:
+            wallet_balance = 0.00
+
+        students_data.append({
+            'id': student.id,
+            'username': student.username,
+            'email': student.email,
+            'wallet_balance': wallet_balance,
+            'linked_since': link.id  # Using id as proxy for creation date
+        })
+    return students_data
+
+
+class FamilyOverviewView(APIView):
+    """
+    API endpoint returning every linked child's balances, today's spend,
+    daily limit, lock state and recent transactions in one response.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [WalletAccessThrottle]
+
+    @conditional_get()
+    def get(self, request, *args, **kwargs):
+        students_data = family_overview(request.user, timezone.localdate())
         return Response({
-            'linked_students': students_data,
+            'students': students_data,
             'total_students': len(students_data)
         })
 
 
+@versioned_memoize('user', key=lambda parent, *args: parent.pk)
+def family_overview(parent, today):
+    """
+    Per-child overview for a parent using a fixed number of queries.
+
+    Links, wallets and the last 10 transactions per child come from one
+    select_related query plus one windowed prefetch; spend, daily limits and
+    locks are grouped aggregates over all children at once.
+    """
+    recent = Prefetch(
+        'student__transaction_set',
+        queryset=Transaction.objects.select_related('category').order_by('-transaction_date', '-id')[:10],
+        to_attr='recent_transactions'
+    )
+    links = list(
+        ParentStudentLink.objects.filter(parent=parent)
+        .select_related('student', 'student__wallet')
+        .prefetch_related(recent)
+        .order_by('id')
+    )
+    student_ids = [link.student_id for link in links]
+    if not student_ids:
+        return []
+
+    spent_today = dict(
+        Transaction.objects.filter(user_id__in=student_ids, transaction_type='EXP', transaction_date=today)
+        .exclude(description__icontains='[Pocket Money]')
+        .values('user_id').annotate(total=Sum('amount')).values_list('user_id', 'total')
+    )
+    daily_limits = dict(
+        DailySpending.objects.filter(student_id__in=student_ids, date=today).values_list('student_id', 'daily_limit')
+    )
+    active_locks = dict(
+        SpendingLock.objects.filter(student_id__in=student_ids, is_active=True)
+        .values('student_id').annotate(count=Count('id')).values_list('student_id', 'count')
+    )
+
+    students_data = []
+    for link in links:
+        student = link.student
+        try:
+            wallet = student.wallet
+        except Wallet.DoesNotExist:
+            wallet = None
+        today_spent = spent_today.get(student.id) or Decimal('0.00')
+        daily_limit = daily_limits.get(student.id)
+        locks = active_locks.get(student.id, 0)
+
+        students_data.append({
+            'id': student.id,
+            'username': student.username,
+            'wallet_balance': wallet.balance if wallet else Decimal('0.00'),
+            'special_wallet_balance': wallet.special_balance if wallet else Decimal('0.00'),
+            'today_spent': today_spent,
+            'daily_limit': daily_limit,
+            'today_remaining': max(Decimal('0.00'), daily_limit - today_spent) if daily_limit is not None else None,
+            'is_locked': locks > 0 or bool(wallet and wallet.is_locked),
+            'active_locks': locks,
+            'recent_transactions': TransactionSerializer(student.recent_transactions, many=True).data,
+        })
+    return students_data
+
+
 class ParentOTPRequestViewSet(viewsets.ModelViewSet):
     """
     API endpoint that allows OTP requests to be viewed.
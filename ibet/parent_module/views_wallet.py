@@ -10,6 +10,7 @@ from rest_framework.views import APIView
 from django.utils.translation import gettext_lazy as _
 from core.throttling import OTPGenerationThrottle, OTPVerificationThrottle, WalletAccessThrottle, SensitiveOperationsThrottle
 from core.security import OTPSecurityService, SecurityUtils
+from core.conditional import conditional_get
 from .models import ParentOTPRequest, StudentMonitoring, ParentAlert
 from .serializers_wallet import ParentWalletSerializer, ParentWalletTransactionSerializer
 from student_module.models import Wallet, ParentStudentLink, OTPRequest, WalletTransaction, WalletTransaction as StudentTransaction
@@ -48,6 +49,7 @@ class ParentWalletViewSet(viewsets.ModelViewSet):
         return wallet
 
     @action(detail=False, methods=['get'])
+    @conditional_get()
     def statement(self, request):
         """Get parent's own filtered transaction statement (Wallet + Expenses + General Transactions)"""
         from django.utils.timezone import localdate
@@ -128,6 +130,7 @@ class ParentWalletViewSet(viewsets.ModelViewSet):
         })
 
     @action(detail=False, methods=['get'])
+    @conditional_get()
     def student_statement(self, request):
         """Get a linked student's filtered transaction statement (Wallet + Expenses + General Transactions)"""
         from django.utils.timezone import localdate
@@ -460,22 +463,21 @@ class ParentWalletViewSet(viewsets.ModelViewSet):
     def linked_students_wallets(self, request):
         """Get wallet information for all linked students"""
         try:
-            linked_students = ParentStudentLink.objects.filter(parent=request.user)
+            # One query; students without a wallet yet read as zero instead of
+            # creating one on a GET
+            linked_students = ParentStudentLink.objects.filter(parent=request.user).select_related('student', 'student__wallet')
             students_wallets = []
 
             for link in linked_students:
                 student = link.student
-                wallet, _ = Wallet.objects.get_or_create(
-                    user=student,
-                    defaults={
-                        'balance': Decimal('0.00'),
-                        'last_transaction_at': None
-                    }
-                )
+                try:
+                    balance = student.wallet.balance
+                except Wallet.DoesNotExist:
+                    balance = Decimal('0.00')
                 students_wallets.append({
                     'student_id': student.id,
                     'student_username': student.username,
-                    'wallet_balance': str(wallet.balance)
+                    'wallet_balance': str(balance)
                 })
 
             return Response({
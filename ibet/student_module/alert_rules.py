@@ -0,0 +1,81 @@
+"""Spending alert rules for students and budget reminders (see core/alert_rules.py)."""
+from django.utils.translation import gettext as _
+
+from core.alert_rules import Rule, rules
+from .models import MonthlyAllowance, Reminder, StudentNotification, Transaction
+
+DAILY_WARNING_PERCENT = 80
+
+
+@rules.ledger('student.expenses', date_field='transaction_date', category_field='category_id')
+def student_expenses(owner_id):
+    # Pocket money is tracked separately from the daily allowance
+    return Transaction.objects.filter(
+        user_id=owner_id, transaction_type=Transaction.TransactionType.EXPENSE
+    ).exclude(description__icontains='[Pocket Money]')
+
+
+def counts_towards_expenses(transaction):
+    """Whether a Transaction row belongs to the 'student.expenses' ledger."""
+    return (
+        transaction.transaction_type == Transaction.TransactionType.EXPENSE
+        and '[pocket money]' not in (transaction.description or '').lower()
+    )
+
+
+def active_allowance(student_id):
+    return MonthlyAllowance.objects.filter(student_id=student_id, is_active=True).first()
+
+
+def notify_daily_warning(rule, total):
+    percent = total / rule.data['daily_limit'] * 100
+    return StudentNotification.objects.create(
+        student_id=rule.data['student_id'],
+        notification_type=StudentNotification.NotificationType.DAILY_80_PERCENT,
+        title=_('Daily Limit Warning'),
+        message=_('You have used %(percent).0f%% of your daily allowance.') % {'percent': percent},
+    )
+
+
+def notify_budget_reminder(rule, total):
+    return StudentNotification.objects.create(
+        student_id=rule.data['user_id'],
+        notification_type=StudentNotification.NotificationType.BUDGET_REMINDER,
+        title=_('Budget Reminder'),
+        message=_('You have used %(percent)s%% of your %(category)s budget (₹%(spent)s of ₹%(budget)s).') % {
+            'percent': rule.data['percent'], 'category': rule.data['category'],
+            'spent': total, 'budget': rule.data['budget'],
+        },
+        data={'budget_id': rule.data['budget_id'], 'reminder_id': rule.data['reminder_id']},
+    )
+
+
+@rules.provider('student.expenses')
+def daily_warning_rules(owner_id):
+    allowance = active_allowance(owner_id)
+    daily = allowance.get_daily_allowance() if allowance else 0
+    if daily <= 0:
+        return
+    yield Rule(
+        'daily_80', daily * DAILY_WARNING_PERCENT / 100, notify_daily_warning, period='day',
+        data={'student_id': owner_id, 'daily_limit': daily},
+    )
+
+
+@rules.provider('student.expenses')
+def budget_reminder_rules(owner_id):
+    reminders = Reminder.objects.filter(
+        user_id=owner_id, is_active=True, budget__isnull=False
+    ).select_related('budget__category')
+    for reminder in reminders:
+        budget = reminder.budget
+        if budget.amount <= 0:
+            continue
+        yield Rule(
+            f'reminder_{reminder.pk}', budget.amount * reminder.alert_percentage / 100, notify_budget_reminder,
+            window=(budget.start_date, budget.end_date), category=budget.category_id,
+            data={
+                'user_id': owner_id, 'reminder_id': reminder.pk, 'budget_id': budget.pk,
+                'percent': reminder.alert_percentage, 'category': budget.category.name, 'budget': budget.amount,
+            },
+        )
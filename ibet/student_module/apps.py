@@ -8,3 +8,6 @@ class StudentModuleConfig(AppConfig):
     def ready(self):
         import student_module.translation  # noqa
         import student_module.signals  # noqa
+        import student_module.timeseries  # noqa
+        import student_module.alert_rules  # noqa
+        import student_module.cohorts  # noqa
@@ -0,0 +1,94 @@
+"""
+Budget consumption for many budgets at once.
+
+A user's budgets may overlap in time and share categories, so one expense
+can count towards several of them. ``budget_consumption`` answers every
+budget of a list from one query: expenses of the budgets' (user, category)
+pairs summed per day, in date order. For each pair an ``IntervalSweep``
+keeps the budgets whose date range contains the current day (entered by
+start date, retired by end date) and each day's total is added to them.
+"""
+import heapq
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+from django.db.models import Sum
+
+from .models import Transaction
+
+
+class IntervalSweep:
+    """
+    Closed intervals containing each of an ascending sequence of points.
+
+    Intervals are entered in start order and kept in a heap by end, so a
+    sweep over P points and I intervals costs O((P + I) log I) plus the
+    size of the answers.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[date, date, Hashable]]):
+        self._pending = sorted(intervals, key=lambda interval: interval[0])
+        self._next = 0
+        self._active = []
+
+    def advance(self, point: date) -> List[Hashable]:
+        """Keys of the intervals containing ``point``; points must not decrease."""
+        while self._next < len(self._pending) and self._pending[self._next][0] <= point:
+            start, end, key = self._pending[self._next]
+            heapq.heappush(self._active, (end, self._next, key))
+            self._next += 1
+        while self._active and self._active[0][0] < point:
+            heapq.heappop(self._active)
+        return [key for _, _, key in self._active]
+
+
+def budget_consumption(budgets: Iterable) -> Dict[int, Decimal]:
+    """
+    Total expenses counted towards each budget.
+
+    Args:
+        budgets: Budget instances, of one or several users
+
+    Returns:
+        Budget id -> sum of the user's EXP transactions in the budget's
+        category dated from its start to its end date (inclusive)
+    """
+    budgets = list(budgets)
+    spent = {budget.pk: Decimal('0.00') for budget in budgets}
+    budgets = [budget for budget in budgets if budget.start_date <= budget.end_date]
+    if not budgets:
+        return spent
+
+    groups = defaultdict(list)
+    for budget in budgets:
+        groups[(budget.user_id, budget.category_id)].append((budget.start_date, budget.end_date, budget.pk))
+    sweeps = {key: IntervalSweep(intervals) for key, intervals in groups.items()}
+
+    rows = Transaction.objects.filter(
+        user_id__in={budget.user_id for budget in budgets},
+        category_id__in={budget.category_id for budget in budgets},
+        transaction_type=Transaction.TransactionType.EXPENSE,
+        transaction_date__gte=min(budget.start_date for budget in budgets),
+        transaction_date__lte=max(budget.end_date for budget in budgets),
+    ).values('user_id', 'category_id', 'transaction_date').annotate(
+        total=Sum('amount')
+    ).order_by('user_id', 'category_id', 'transaction_date')
+
+    for row in rows:
+        sweep = sweeps.get((row['user_id'], row['category_id']))
+        if sweep is None:
+            continue
+        for budget_id in sweep.advance(row['transaction_date']):
+            spent[budget_id] += row['total']
+    return spent
+
+
+def budget_summary(budget, total_spent: Decimal) -> Dict:
+    remaining = budget.amount - total_spent
+    return {
+        'total_spent': total_spent,
+        'remaining': remaining,
+        'percent_used': float(total_spent / budget.amount * 100) if budget.amount > 0 else 0.0,
+    }
@@ -0,0 +1,13 @@
+"""Cohort spending ledger for students (see core/cohorts.py)."""
+from core.cohorts import cohorts
+from .models import Transaction, UserPersona
+
+
+@cohorts.register('STUDENT', date_field='transaction_date', category_field='category__name',
+                  aliases=(UserPersona.STUDENT_ACADEMIC,))
+def student_expenses():
+    # Categories are per user; cohorts match them by normalized name
+    return Transaction.objects.filter(
+        transaction_type=Transaction.TransactionType.EXPENSE,
+        user__persona__in=[UserPersona.STUDENT, UserPersona.STUDENT_ACADEMIC],
+    )
@@ -0,0 +1,254 @@
+"""
+Cached snapshot of the student dashboard payload.
+
+The dashboard is polled by every open tab, so the expensive part of the
+payload (wallet, allowance, spend aggregates, locks, daily breakdown) is
+computed once per student and cached under the student's data version
+(``core.data_version``). Ledger, lock and allowance writes bump that version
+(see ``signals.py``), so a snapshot built from rows read before a write is
+stored under a key no later request looks up. Clock-dependent fields are
+filled in on every request.
+
+Each part of the payload is a section (``core.sections``); clients polling
+with ``?sections=wallet,locks`` only compute and receive those.
+"""
+import logging
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from core import singleflight
+from core.data_version import DataVersionService
+from core.sections import SectionContext, SectionRegistry
+from .models import (
+    Wallet, Transaction, MonthlyAllowance, DailySpending, SpendingLock,
+    MonthlySpendingSummary, DailyAllowance, CumulativeSpendingTracker
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = 'student_dashboard_{user_id}:{version}'
+SNAPSHOT_TTL = getattr(settings, 'STUDENT_DASHBOARD_SNAPSHOT_TTL', 60 * 60)
+
+
+def snapshot_key(user_id):
+    """Snapshot key for the student's current data version; read it before any row."""
+    return SNAPSHOT_KEY.format(user_id=user_id, version=DataVersionService.get('user', user_id))
+
+
+def _release_stale_locks(user, today):
+    """Auto-unlock expired daily locks and clear stuck wallet locks."""
+    expired_locks = SpendingLock.objects.filter(student=user, is_active=True, lock_type='DAILY_LIMIT', created_at__date__lt=today)
+    if expired_locks.exists():
+        expired_locks.update(is_active=False, unlocked_at=timezone.now())
+        DailySpending.objects.filter(student=user, date__lt=today, is_locked=True).update(is_locked=False)
+        wallet_obj = Wallet.objects.filter(user=user).first()
+        if wallet_obj:
+            wallet_obj.is_locked = False
+            wallet_obj.save()
+
+    # Unlock wallet if no ACTIVE spending locks exist. This handles "stuck"
+    # locks where is_locked is True but no SpendingLock record exists.
+    has_active_locks = SpendingLock.objects.filter(student=user, is_active=True).exists()
+    if not has_active_locks:
+        wallet_obj = Wallet.objects.filter(user=user).first()
+        if wallet_obj and wallet_obj.is_locked:
+            wallet_obj.is_locked = False
+            wallet_obj.save()
+            DailySpending.objects.filter(student=user, date=today, is_locked=True).update(is_locked=False)
+
+
+dashboard_sections = SectionRegistry()
+
+
+@dashboard_sections.register('profile', fields=('user_name', 'user_persona'))
+def profile_section(ctx):
+    return {'user_name': ctx.user.username, 'user_persona': ctx.user.persona}
+
+
+@dashboard_sections.register('wallet', fields=('wallet_balance', 'special_wallet_balance'), writes=True)
+def wallet_section(ctx):
+    wallet, created = Wallet.objects.get_or_create(user=ctx.user, defaults={'balance': Decimal('0.00')})
+    return {'wallet_balance': wallet.balance, 'special_wallet_balance': wallet.special_balance}
+
+
+@dashboard_sections.register('allowance', fields=('monthly_allowance', 'daily_limit', 'has_allowance'), writes=True)
+def allowance_section(ctx):
+    user, today = ctx.user, ctx.today
+    allowance = MonthlyAllowance.objects.filter(student=user, is_active=True).first()
+
+    if allowance:
+        ds, created = DailySpending.objects.get_or_create(
+            student=user,
+            date=today,
+            defaults={
+                'daily_limit': allowance.get_daily_allowance(),
+                'remaining_amount': allowance.get_daily_allowance(),
+                'amount_spent': Decimal('0.00')
+            }
+        )
+        daily_limit = ds.daily_limit
+
+        try:
+            MonthlySpendingSummary.objects.get_or_create(
+                student=user,
+                month=today.month,
+                year=today.year,
+                defaults={
+                    'total_allowance': allowance.monthly_amount,
+                    'remaining_amount': allowance.monthly_amount,
+                    'total_spent': Decimal('0.00'),
+                    'days_elapsed': 1
+                }
+            )
+            CumulativeSpendingTracker.objects.get_or_create(
+                student=user,
+                month=today.month,
+                year=today.year,
+                defaults={
+                    'total_allocated': allowance.monthly_amount,
+                    'total_available': allowance.monthly_amount,
+                    'total_spent': Decimal('0.00'),
+                    'days_available': 30
+                }
+            )
+        except Exception as e:
+            logger.error(f"Error creating dashboard trackers: {e}")
+    else:
+        daily_limit = Decimal('0.00')
+
+    monthly_amount = allowance.monthly_amount if allowance else Decimal('0.00')
+    return {
+        'monthly_allowance': float(monthly_amount),
+        'daily_limit': float(daily_limit),
+        'has_allowance': allowance is not None,
+    }
+
+
+@dashboard_sections.register(
+    'spending', fields=('today_spent', 'today_remaining', 'monthly_spent', 'monthly_remaining'), depends=('allowance',)
+)
+def spending_section(ctx):
+    user, today = ctx.user, ctx.today
+    allowance = ctx.get('allowance')
+    daily_limit = Decimal(str(allowance['daily_limit']))
+    monthly_amount = Decimal(str(allowance['monthly_allowance']))
+
+    # Today's spend is a subset of the month's, so one conditional aggregate covers both
+    totals = Transaction.objects.filter(
+        user=user, transaction_type='EXP', transaction_date__month=today.month, transaction_date__year=today.year
+    ).exclude(description__icontains='[Pocket Money]').aggregate(
+        today=Sum('amount', filter=Q(transaction_date=today)),
+        month=Sum('amount'),
+    )
+    today_spent = totals['today'] or Decimal('0.00')
+    monthly_spent = totals['month'] or Decimal('0.00')
+
+    return {
+        'today_spent': float(today_spent),
+        'today_remaining': float(max(Decimal('0.00'), daily_limit - today_spent)),
+        'monthly_spent': float(monthly_spent),
+        'monthly_remaining': float(max(Decimal('0.00'), monthly_amount - monthly_spent)),
+    }
+
+
+@dashboard_sections.register('locks', fields=('is_locked', 'active_locks', 'active_lock_id'))
+def locks_section(ctx):
+    lock_ids = list(SpendingLock.objects.filter(student=ctx.user, is_active=True).order_by('pk').values_list('id', flat=True))
+    return {
+        'is_locked': len(lock_ids) > 0,
+        'active_locks': len(lock_ids),
+        'active_lock_id': lock_ids[0] if lock_ids else None,
+    }
+
+
+@dashboard_sections.register('daily_breakdown', fields=('daily_breakdown',))
+def daily_breakdown_section(ctx):
+    # Not a core.timeseries rollup: allowances are unique per student and day,
+    # so there is nothing to group, and each day's own limit is charted next
+    # to its spending. Days without an allowance are left out, not shown as 0.
+    month_allowances = DailyAllowance.objects.filter(student=ctx.user, date__month=ctx.today.month, date__year=ctx.today.year).order_by('date')
+    return {
+        'daily_breakdown': [
+            {'date': da.date.strftime('%Y-%m-%d'), 'day': da.date.day, 'spent': float(da.amount_spent), 'limit': float(da.daily_amount)}
+            for da in month_allowances
+        ]
+    }
+
+
+@dashboard_sections.register('clock', fields=('server_time', 'server_date', 'resets_in'), cache=False)
+def clock_section(ctx):
+    return reset_clock_fields(ctx.today)
+
+
+def reset_clock_fields(today=None):
+    """Fields that depend on the wall clock and are never cached."""
+    today = today or timezone.localdate()
+    tomorrow = datetime.combine(today + timedelta(days=1), time.min)
+    now_dt = timezone.now()
+
+    if timezone.is_naive(now_dt):
+        seconds_until_reset = int((tomorrow - now_dt).total_seconds())
+    else:
+        tomorrow_aware = timezone.make_aware(tomorrow, timezone.get_current_timezone())
+        seconds_until_reset = int((tomorrow_aware - now_dt).total_seconds())
+
+    hours, remainder = divmod(seconds_until_reset, 3600)
+    minutes, _ = divmod(remainder, 60)
+
+    return {
+        'server_time': now_dt.strftime('%I:%M %p'),
+        'server_date': today.strftime('%d/%m/%Y'),
+        'resets_in': f"{hours}h {minutes}m",
+    }
+
+
+def get_dashboard_payload(user, sections=None, fields=None):
+    """
+    Dashboard payload for a student, limited to the requested sections.
+
+    Sections already in the cached snapshot are reused; missing ones are
+    computed and added to it. The snapshot is started afresh on a miss or
+    once the local date has rolled over since it was built.
+
+    Args:
+        user: Student user instance
+        sections: Section names to include (all when None)
+        fields: Optional subset of fields to return
+
+    Returns:
+        Payload dict in the response shape
+    """
+    today = timezone.localdate()
+    key = snapshot_key(user.pk)
+
+    def is_current(value):
+        return value is not None and value.get('date') == today.isoformat()
+
+    snapshot = cache.get(key)
+    leader = False
+    if not is_current(snapshot):
+        # Only one request per student rebuilds after a miss or the midnight
+        # rollover; concurrent polls wait briefly and reuse its snapshot.
+        leader = singleflight.acquire(key)
+        if not leader:
+            snapshot = singleflight.wait_for(key, is_current)
+        if not is_current(snapshot):
+            _release_stale_locks(user, today)
+            snapshot = {'date': today.isoformat(), 'sections': {}}
+
+    try:
+        ctx = SectionContext(dashboard_sections, computed=snapshot['sections'], user=user, today=today)
+        names = list(dashboard_sections.sections) if sections is None else sections
+        payload = dashboard_sections.render(ctx, names, fields)
+
+        if any(dashboard_sections.sections[name].cache for name in ctx.fresh):
+            cache.set(key, snapshot, SNAPSHOT_TTL)
+    finally:
+        if leader:
+            singleflight.release(key)
+    return payload
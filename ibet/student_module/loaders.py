@@ -0,0 +1,82 @@
+"""
+Batch loaders for per-student data rendered in list serializers.
+
+See ``core.loaders`` for how serializers use them.
+"""
+from decimal import Decimal
+
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from core.loaders import BatchLoader
+from .budgets import budget_consumption
+from .models import Wallet, Transaction, DailyAllowance, AllowanceContribution
+
+
+class WalletByUserLoader(BatchLoader):
+    """user_id -> Wallet (or None)."""
+
+    def batch_load(self, keys):
+        return {wallet.user_id: wallet for wallet in Wallet.objects.filter(user_id__in=keys)}
+
+
+class TodaySpentLoader(BatchLoader):
+    """user_id -> total EXP transactions dated today."""
+
+    def __init__(self):
+        super().__init__()
+        self.today = timezone.localdate()
+
+    def batch_load(self, keys):
+        rows = Transaction.objects.filter(
+            user_id__in=keys, transaction_type='EXP', transaction_date=self.today
+        ).values('user_id').annotate(total=Sum('amount'))
+        return {row['user_id']: row['total'] for row in rows}
+
+
+class DailyAllowanceSummaryLoader(BatchLoader):
+    """student_id -> totals over available days plus today's allowance row."""
+
+    def __init__(self):
+        super().__init__()
+        self.today = timezone.localdate()
+
+    def batch_load(self, keys):
+        available = Q(is_available=True)
+        today = Q(date=self.today)
+        rows = DailyAllowance.objects.filter(student_id__in=keys).values('student_id').annotate(
+            available_days=Count('id', filter=available),
+            total_amount=Sum('daily_amount', filter=available),
+            total_spent=Sum('amount_spent', filter=available),
+            today_days=Count('id', filter=today),
+            today_amount=Sum('daily_amount', filter=today),
+            today_spent=Sum('amount_spent', filter=today),
+        )
+        return {row['student_id']: row for row in rows}
+
+
+class RecentAllowanceContributionsLoader(BatchLoader):
+    """student_id -> the 10 most recent AllowanceContribution rows."""
+
+    LIMIT = 10
+    default = ()
+
+    def batch_load(self, keys):
+        rows = AllowanceContribution.objects.filter(student_id__in=keys).annotate(
+            row_number=Window(RowNumber(), partition_by=F('student_id'), order_by=F('created_at').desc())
+        ).filter(row_number__lte=self.LIMIT).order_by('student_id', '-created_at')
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row.student_id, []).append(row)
+        return grouped
+
+
+class BudgetConsumptionLoader(BatchLoader):
+    """Budget -> expenses counted towards it, for all loaded budgets in one query."""
+
+    default = Decimal('0.00')
+
+    def batch_load(self, keys):
+        spent = budget_consumption(keys)
+        return {budget: spent[budget.pk] for budget in keys}
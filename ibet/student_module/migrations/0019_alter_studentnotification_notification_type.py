@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student_module', '0018_user_phone_alter_user_persona'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentnotification',
+            name='notification_type',
+            field=models.CharField(choices=[('DAILY_80%', 'Daily 80% Used'), ('MONTHLY_80%', 'Monthly 80% Used'), ('WALLET_LOCKED', 'Wallet Locked'), ('WALLET_UNLOCKED', 'Wallet Unlocked'), ('PARENT_APPROVAL', 'Parent Approval'), ('NEW_ALLOWANCE', 'New Allowance Set'), ('BUDGET_REMINDER', 'Budget Reminder')], max_length=20),
+        ),
+    ]
@@ -560,6 +560,7 @@ class StudentNotification(models.Model):
         WALLET_UNLOCKED = 'WALLET_UNLOCKED', 'Wallet Unlocked'
         PARENT_APPROVAL = 'PARENT_APPROVAL', 'Parent Approval'
         NEW_ALLOWANCE = 'NEW_ALLOWANCE', 'New Allowance Set'
+        BUDGET_REMINDER = 'BUDGET_REMINDER', 'Budget Reminder'
 
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
     notification_type = models.CharField(max_length=20, choices=NotificationType.choices)
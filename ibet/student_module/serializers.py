@@ -4,6 +4,9 @@ from .models import (
     User, UserPersona, Category, Budget, Transaction, Reminder, ChatMessage, DailyLimit, OTPRequest,
     ParentStudentRequest, MonthlyAllowance, DailySpending, SpendingLock, StudentNotification, MonthlySpendingSummary
 )
+from core.loaders import BatchListSerializer, BatchMethodField
+from .budgets import budget_summary
+from .loaders import BudgetConsumptionLoader
 
 # --- User and Persona Serializers ---
 
@@ -48,15 +51,21 @@ class BudgetSerializer(serializers.ModelSerializer):
     """Serializer for the Budget model."""
     # Display the category name in the response for better readability.
     category_name = serializers.CharField(source='category.name', read_only=True)
+    # Consumption of every budget in a list comes from one query
+    consumption = BatchMethodField(BudgetConsumptionLoader, key=lambda budget: budget)
 
     class Meta:
         model = Budget
-        fields = ['id', 'category', 'category_name', 'amount', 'start_date', 'end_date']
+        fields = ['id', 'category', 'category_name', 'amount', 'start_date', 'end_date', 'consumption']
         # 'category' is the ID used for creating/updating, but we show 'category_name'
         # in the output. 'write_only=True' prevents it from appearing in the response.
         extra_kwargs = {
             'category': {'write_only': True}
         }
+        list_serializer_class = BatchListSerializer
+
+    def get_consumption(self, obj, total_spent):
+        return budget_summary(obj, total_spent)
 
 class OTPRequestSerializer(serializers.ModelSerializer):
     """Serializer for the OTPRequest model."""
@@ -1,9 +1,18 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from django.db.models import Sum
 from decimal import Decimal
-from .models import Transaction, DailySpending, DailyAllowance, CumulativeSpendingTracker
+from .models import (
+    Transaction, DailySpending, DailyAllowance, CumulativeSpendingTracker,
+    Wallet, WalletTransaction, SpendingLock, MonthlyAllowance,
+    AllowanceContribution, ParentStudentLink, User, StudentNotification,
+    OTPRequest, StudentWalletOTPRequest, PendingSpendingRequest, Reminder, Budget
+)
+from .alert_rules import counts_towards_expenses
+from core.alert_rules import rules as alert_rules
+from core.data_version import DataVersionService
+from core.events import EventTypes, publish
 
 @receiver(post_save, sender=Transaction)
 def update_spending_trackers(sender, instance, created, **kwargs):
@@ -104,3 +113,115 @@ def update_spending_trackers(sender, instance, created, **kwargs):
         tracker.save()
     except CumulativeSpendingTracker.DoesNotExist:
         pass
+
+
+# Data versions: any ledger, lock or allowance write for a student bumps the
+# data version of the student (which also retires their dashboard snapshot)
+# and of their linked parent.
+def student_data_changed(student_id):
+    if not student_id:
+        return
+    DataVersionService.bump('user', student_id)
+    DataVersionService.bump_many(
+        'user', ParentStudentLink.objects.filter(student_id=student_id).values_list('parent_id', flat=True)
+    )
+
+
+@receiver([post_save, post_delete], sender=Wallet)
+@receiver([post_save, post_delete], sender=Transaction)
+def wallet_data_changed(sender, instance, **kwargs):
+    student_data_changed(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=WalletTransaction)
+def wallet_transaction_changed(sender, instance, **kwargs):
+    student_data_changed(Wallet.objects.filter(pk=instance.wallet_id).values_list('user_id', flat=True).first())
+
+
+@receiver([post_save, post_delete], sender=SpendingLock)
+@receiver([post_save, post_delete], sender=MonthlyAllowance)
+@receiver([post_save, post_delete], sender=DailyAllowance)
+@receiver([post_save, post_delete], sender=DailySpending)
+@receiver([post_save, post_delete], sender=AllowanceContribution)
+def student_ledger_changed(sender, instance, **kwargs):
+    student_data_changed(instance.student_id)
+
+
+@receiver(post_save, sender=User)
+def user_profile_changed(sender, instance, update_fields=None, **kwargs):
+    # Username/persona appear in cached payloads; login timestamps do not.
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    student_data_changed(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ParentStudentLink)
+def parent_link_changed(sender, instance, **kwargs):
+    DataVersionService.bump('user', instance.parent_id)
+    DataVersionService.bump('user', instance.student_id)
+
+
+# Spending alert rules (student_module/alert_rules.py and the parents'
+# AlertSettings) run off expense writes; allowances, reminders and budgets
+# are what they are compiled from.
+@receiver(post_save, sender=Transaction)
+def alert_rules_transaction_saved(sender, instance, created, **kwargs):
+    if not created:
+        alert_rules.resync('student.expenses', instance.user_id)
+    elif counts_towards_expenses(instance):
+        alert_rules.record(
+            'student.expenses', instance.user_id, instance.amount, instance.transaction_date, instance.category_id
+        )
+
+
+@receiver(post_delete, sender=Transaction)
+def alert_rules_transaction_deleted(sender, instance, **kwargs):
+    alert_rules.resync('student.expenses', instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=MonthlyAllowance)
+def alert_rules_allowance_changed(sender, instance, **kwargs):
+    alert_rules.invalidate('student.expenses', instance.student_id)
+
+
+@receiver([post_save, post_delete], sender=Reminder)
+@receiver([post_save, post_delete], sender=Budget)
+def alert_rules_reminder_changed(sender, instance, **kwargs):
+    alert_rules.invalidate('student.expenses', instance.user_id)
+
+
+# Push events for the SSE stream (core.views_events): the student and their
+# linked parent refetch only when something they display has changed.
+def student_and_parents(student_id):
+    return [student_id] + list(ParentStudentLink.objects.filter(student_id=student_id).values_list('parent_id', flat=True))
+
+
+@receiver(post_save, sender=Wallet)
+def publish_balance_changed(sender, instance, **kwargs):
+    publish(student_and_parents(instance.user_id), EventTypes.BALANCE, {'student_id': instance.user_id})
+
+
+@receiver([post_save, post_delete], sender=SpendingLock)
+def publish_lock_changed(sender, instance, **kwargs):
+    publish(student_and_parents(instance.student_id), EventTypes.LOCK, {'student_id': instance.student_id, 'lock_id': instance.pk, 'is_active': instance.is_active})
+
+
+@receiver(post_save, sender=StudentNotification)
+def publish_student_notification(sender, instance, created, **kwargs):
+    if created:
+        publish([instance.student_id], EventTypes.NOTIFICATION, {'notification_id': instance.pk})
+
+
+@receiver(post_save, sender=OTPRequest)
+def publish_otp_request(sender, instance, **kwargs):
+    publish([instance.student_id, instance.parent_id], EventTypes.OTP_REQUEST, {'student_id': instance.student_id})
+
+
+@receiver(post_save, sender=StudentWalletOTPRequest)
+def publish_student_wallet_otp_request(sender, instance, **kwargs):
+    publish(student_and_parents(instance.user_id), EventTypes.OTP_REQUEST, {'student_id': instance.user_id})
+
+
+@receiver(post_save, sender=PendingSpendingRequest)
+def publish_spending_request(sender, instance, **kwargs):
+    publish([instance.student_id, instance.parent_id], EventTypes.SPENDING_REQUEST, {'request_id': instance.pk})
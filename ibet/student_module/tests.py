@@ -76,6 +76,56 @@ class BudgetModelTest(TestCase):
         )
         self.assertEqual(str(budget), "budgetuser's budget for Food")
 
+class BudgetConsumptionTest(APITestCase):
+    """Budgets with overlapping ranges are annotated from one pass over expenses"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='budgetsweep', password='password123')
+        self.food = Category.objects.create(name='Food', user=self.user)
+        self.travel = Category.objects.create(name='Travel', user=self.user)
+        self.month = Budget.objects.create(user=self.user, category=self.food, amount=Decimal('1000.00'),
+                                           start_date=date(2026, 1, 1), end_date=date(2026, 1, 31))
+        self.week = Budget.objects.create(user=self.user, category=self.food, amount=Decimal('200.00'),
+                                          start_date=date(2026, 1, 10), end_date=date(2026, 1, 16))
+        self.quarter = Budget.objects.create(user=self.user, category=self.travel, amount=Decimal('500.00'),
+                                             start_date=date(2026, 1, 1), end_date=date(2026, 3, 31))
+        for day, category, amount, kind in (
+            (date(2025, 12, 31), self.food, '99', 'EXP'),
+            (date(2026, 1, 5), self.food, '100', 'EXP'),
+            (date(2026, 1, 10), self.food, '50', 'EXP'),
+            (date(2026, 1, 16), self.food, '25', 'EXP'),
+            (date(2026, 1, 16), self.food, '500', 'INC'),
+            (date(2026, 1, 20), self.travel, '300', 'EXP'),
+            (date(2026, 2, 1), self.food, '40', 'EXP'),
+        ):
+            Transaction.objects.create(user=self.user, category=category, amount=Decimal(amount),
+                                       transaction_type=kind, transaction_date=day)
+
+    def test_budget_consumption(self):
+        from .budgets import budget_consumption
+        spent = budget_consumption(Budget.objects.filter(user=self.user))
+        self.assertEqual(spent, {
+            self.month.pk: Decimal('175.00'),
+            self.week.pk: Decimal('75.00'),
+            self.quarter.pk: Decimal('300.00'),
+        })
+
+    def test_list_is_annotated_in_constant_queries(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('budget-list')
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = response.data['results'] if isinstance(response.data, dict) else response.data
+        consumption = {row['id']: row['consumption'] for row in rows}
+        self.assertEqual(consumption[self.week.pk]['total_spent'], Decimal('75.00'))
+        self.assertEqual(consumption[self.week.pk]['remaining'], Decimal('125.00'))
+        self.assertEqual(consumption[self.week.pk]['percent_used'], 37.5)
+
+        response = self.client.get(reverse('budget-summary', args=[self.month.pk]))
+        self.assertEqual(response.data['total_spent'], Decimal('175.00'))
+
+
 class CategoryModelTest(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='catuser', password='password123')
@@ -177,3 +227,84 @@ class ReminderModelTest(TestCase):
             is_active=True
         )
         self.assertEqual(str(reminder), f"Reminder for {self.user.username} at 50%")
+
+
+class StudentDashboardSnapshotTest(APITestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.student = User.objects.create_user(username='snapstudent', password='password123', persona=UserPersona.STUDENT)
+        self.client.force_authenticate(user=self.student)
+        self.url = '/api/student/dashboard/'
+
+    def test_snapshot_is_reused_between_polls(self):
+        # The first poll creates the wallet, a write that retires its snapshot
+        self.client.get(self.url)
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('resets_in', response.data)
+        self.assertNotIn('date', response.data)
+
+    def test_transaction_invalidates_snapshot(self):
+        self.client.get(self.url)
+        Transaction.objects.create(
+            user=self.student,
+            amount=Decimal('40.00'),
+            transaction_type='EXP',
+            transaction_date=date.today(),
+            description='Lunch'
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['today_spent'], 40.0)
+        self.assertEqual(response.data['monthly_spent'], 40.0)
+
+    def test_wallet_deposit_invalidates_snapshot(self):
+        from .models import Wallet
+        self.client.get(self.url)
+        wallet = Wallet.objects.get(user=self.student)
+        wallet.deposit_main(Decimal('250.00'))
+        response = self.client.get(self.url)
+        self.assertEqual(Decimal(str(response.data['wallet_balance'])), Decimal('250.00'))
+
+    def test_write_during_build_does_not_leave_stale_snapshot(self):
+        from unittest import mock
+        from .dashboard import dashboard_sections, get_dashboard_payload
+        render = dashboard_sections.render
+
+        def render_then_write(*args, **kwargs):
+            # The snapshot is built from rows read before this write commits
+            payload = render(*args, **kwargs)
+            Transaction.objects.create(
+                user=self.student, amount=Decimal('15.00'), transaction_type='EXP',
+                transaction_date=date.today(), description='Snack'
+            )
+            return payload
+
+        with mock.patch.object(dashboard_sections, 'render', side_effect=render_then_write):
+            stale = get_dashboard_payload(self.student)
+        self.assertEqual(stale['today_spent'], 0.0)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['today_spent'], 15.0)
+
+    def test_sections_limit_payload(self):
+        response = self.client.get(self.url, {'sections': 'wallet,locks'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {'wallet_balance', 'special_wallet_balance', 'is_locked', 'active_locks', 'active_lock_id'})
+
+    def test_fields_limit_payload(self):
+        response = self.client.get(self.url, {'fields': 'today_remaining,is_locked'})
+        self.assertEqual(response.data, {'today_remaining': 0.0, 'is_locked': False})
+
+    def test_missing_sections_are_added_to_snapshot(self):
+        self.client.get(self.url, {'sections': 'wallet'})
+        self.client.get(self.url, {'sections': 'wallet'})
+        response = self.client.get(self.url)
+        self.assertIn('daily_breakdown', response.data)
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {'sections': 'daily_breakdown'})
+
+    def test_unknown_section_is_rejected(self):
+        response = self.client.get(self.url, {'sections': 'nope'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
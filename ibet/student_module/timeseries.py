@@ -0,0 +1,13 @@
+"""Time-series metrics for students (see core/timeseries.py)."""
+from core.timeseries import metrics
+from .models import DailyAllowance, WalletTransaction
+
+
+@metrics.register('student.spending', date_field='created_at', split_field='wallet_type')
+def student_spending(user):
+    return WalletTransaction.objects.filter(wallet__user=user, transaction_type=WalletTransaction.TransactionType.WITHDRAWAL)
+
+
+@metrics.register('student.allowance_spent', date_field='date', value='amount_spent')
+def student_allowance_spent(user):
+    return DailyAllowance.objects.filter(student=user)
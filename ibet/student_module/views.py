@@ -5,13 +5,14 @@ from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils.translation import gettext_lazy as _
 from core.throttling import OTPGenerationThrottle, OTPVerificationThrottle, WalletAccessThrottle, SensitiveOperationsThrottle
+from core.conditional import conditional_get, minute_bucket
 from .models import (
     Budget, Category, Transaction, User, UserPersona, Reminder, ChatMessage, 
     DailyLimit, OTPRequest, Wallet, ParentStudentRequest, ParentStudentLink, MonthlyAllowance, 
     DailySpending, SpendingLock, StudentNotification, MonthlySpendingSummary,
     DailyAllowance, CumulativeSpendingTracker, PendingSpendingRequest, AllowanceContribution
 )
-from django.db.models import Sum, Q
+from django.db.models import Q
 from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
@@ -21,6 +22,7 @@ from .serializers import (
     ParentStudentRequestSerializer, MonthlyAllowanceSerializer, DailySpendingSerializer, 
     SpendingLockSerializer, StudentNotificationSerializer, MonthlySpendingSummarySerializer
 )
+from .budgets import budget_consumption, budget_summary
 
 import logging
 logger = logging.getLogger(__name__)
@@ -148,7 +150,7 @@ class BudgetViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Budget.objects.filter(user=self.request.user).order_by('-start_date')
+        return Budget.objects.filter(user=self.request.user).select_related('category').order_by('-start_date')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -159,19 +161,13 @@ class BudgetViewSet(viewsets.ModelViewSet):
         Returns a summary of the budget, including total spent and remaining amount.
         """
         budget = self.get_object()
-        total_spent = Transaction.objects.filter(
-            user=request.user,
-            category=budget.category,
-            transaction_date__range=[budget.start_date, budget.end_date],
-            transaction_type='EXP'
-        ).aggregate(total=Sum('amount'))['total'] or 0.00
-
-        remaining = budget.amount - total_spent
+        summary = budget_summary(budget, budget_consumption([budget])[budget.pk])
 
         return Response({
             'budget_amount': budget.amount,
-            'total_spent': total_spent,
-            'remaining': remaining,
+            'total_spent': summary['total_spent'],
+            'remaining': summary['remaining'],
+            'percent_used': summary['percent_used'],
             'category': budget.category.name,
         })
 
@@ -218,29 +214,9 @@ class TransactionViewSet(viewsets.ModelViewSet):
                 defaults={'daily_limit': 0, 'remaining_amount': 0}
             )
             
-            # Get monthly allowance
-            try:
-                allowance = MonthlyAllowance.objects.get(student=self.request.user, is_active=True)
-                daily_limit = allowance.get_daily_allowance()
-                
-                # Check 80% daily limit
-                if daily_limit > 0:
-                    spent_percent = (daily_spending.amount_spent / daily_limit) * 100
-                    if spent_percent >= 80 and spent_percent < 100:
-                        # Check if alert already sent today
-                        today_alerts = StudentNotification.objects.filter(
-                            student=self.request.user,
-                            notification_type='DAILY_80%',
-                            created_at__date=today
-                        )
-                        if not today_alerts.exists():
-                            StudentNotification.objects.create(
-                                student=self.request.user,
-                                notification_type='DAILY_80%',
-                                title=_('Daily Limit Warning'),
-                                message=_(f'You have used {spent_percent:.0f}% of your daily allowance.')
-                            )
-                
+            # Lock on overspending only under an active monthly allowance (the
+            # 80% daily warning is an alert rule, see student_module/alert_rules.py)
+            if MonthlyAllowance.objects.filter(student=self.request.user, is_active=True).exists():
                 # Check if daily limit exceeded
                 if daily_spending.remaining_amount < 0:
                     daily_spending.is_locked = True
@@ -285,9 +261,6 @@ class TransactionViewSet(viewsets.ModelViewSet):
                             )
                     except:
                         pass
-                            
-            except MonthlyAllowance.DoesNotExist:
-                pass
 
 
 class SelectPersonaView(APIView):
@@ -426,9 +399,11 @@ class MonthlyAllowanceViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
+        # student_username/parent_username are read for every row
+        queryset = MonthlyAllowance.objects.select_related('student', 'parent')
         if hasattr(user, 'persona') and user.persona == 'PARENT':
-            return MonthlyAllowance.objects.filter(parent=user).order_by('-created_at')
-        return MonthlyAllowance.objects.filter(student=user)
+            return queryset.filter(parent=user).order_by('-created_at')
+        return queryset.filter(student=user)
 
     @transaction.atomic
     def create(self, request, *args, **kwargs):
@@ -680,129 +655,22 @@ class MonthlySpendingSummaryViewSet(viewsets.ModelViewSet):
 class StudentDashboardView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_get(extra=minute_bucket)
     def get(self, request):
         try:
-            from decimal import Decimal
-            from datetime import date
-            from calendar import monthrange
+            from core.sections import UnknownSectionError
+            from .dashboard import dashboard_sections, get_dashboard_payload
             user = request.user
             if not hasattr(user, 'persona') or user.persona != 'STUDENT':
                 return Response({'error': _('Only students can access this.')}, status=403)
 
-            today = timezone.localdate()
-            
-            # Auto-unlock expired locks
-            expired_locks = SpendingLock.objects.filter(student=user, is_active=True, lock_type='DAILY_LIMIT', created_at__date__lt=today)
-            if expired_locks.exists():
-                expired_locks.update(is_active=False, unlocked_at=timezone.now())
-                DailySpending.objects.filter(student=user, date__lt=today, is_locked=True).update(is_locked=False)
-                wallet_obj = Wallet.objects.filter(user=user).first()
-                if wallet_obj:
-                    wallet_obj.is_locked = False
-                    wallet_obj.save()
-
-            # --- CRITICAL FIX: Unlock wallet if no ACTIVE spending locks exist ---
-            # This handles "stuck" locks where is_locked is True but no SpendingLock record exists
-            has_active_locks = SpendingLock.objects.filter(student=user, is_active=True).exists()
-            if not has_active_locks:
-                wallet_obj = Wallet.objects.filter(user=user).first()
-                if wallet_obj and wallet_obj.is_locked:
-                    wallet_obj.is_locked = False
-                    wallet_obj.save()
-                    # Also ensure today's record isn't locked if no active lock exists
-                    DailySpending.objects.filter(student=user, date=today, is_locked=True).update(is_locked=False)
-
-            allowance = MonthlyAllowance.objects.filter(student=user, is_active=True).first()
-            wallet, created = Wallet.objects.get_or_create(user=user, defaults={'balance': Decimal('0.00')})
-            
-            if allowance:
-                ds, created = DailySpending.objects.get_or_create(
-                    student=user, 
-                    date=today, 
-                    defaults={
-                        'daily_limit': allowance.get_daily_allowance(), 
-                        'remaining_amount': allowance.get_daily_allowance(),
-                        'amount_spent': Decimal('0.00')
-                    }
-                )
-                daily_limit = ds.daily_limit
-                
-                # Robustly handle Monthly Summary and Tracker
-                try:
-                    MonthlySpendingSummary.objects.get_or_create(
-                        student=user, 
-                        month=today.month, 
-                        year=today.year, 
-                        defaults={
-                            'total_allowance': allowance.monthly_amount, 
-                            'remaining_amount': allowance.monthly_amount,
-                            'total_spent': Decimal('0.00'),
-                            'days_elapsed': 1
-                        }
-                    )
-                    CumulativeSpendingTracker.objects.get_or_create(
-                        student=user, 
-                        month=today.month, 
-                        year=today.year, 
-                        defaults={
-                            'total_allocated': allowance.monthly_amount, 
-                            'total_available': allowance.monthly_amount,
-                            'total_spent': Decimal('0.00'),
-                            'days_available': 30
-                        }
-                    )
-                except Exception as e:
-                    logger.error(f"Error creating dashboard trackers: {e}")
-            else:
-                daily_limit = Decimal('0.00')
-
-            today_spent = Transaction.objects.filter(user=user, transaction_type='EXP', transaction_date=today).exclude(description__icontains='[Pocket Money]').aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            monthly_spent = Transaction.objects.filter(user=user, transaction_type='EXP', transaction_date__month=today.month, transaction_date__year=today.year).exclude(description__icontains='[Pocket Money]').aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-
-            daily_breakdown = []
-            month_allowances = DailyAllowance.objects.filter(student=user, date__month=today.month, date__year=today.year).order_by('date')
-            for da in month_allowances:
-                daily_breakdown.append({'date': da.date.strftime('%Y-%m-%d'), 'day': da.date.day, 'spent': float(da.amount_spent), 'limit': float(da.daily_amount)})
-
-            active_locks_qs = SpendingLock.objects.filter(student=user, is_active=True)
-            active_locks_count = active_locks_qs.count()
-            active_lock_id = active_locks_qs.first().id if active_locks_count > 0 else None
-            
-            from datetime import datetime, time, timedelta
-            tomorrow = datetime.combine(today + timedelta(days=1), time.min)
-            now_dt = timezone.now()
-            
-            if timezone.is_naive(now_dt):
-                seconds_until_reset = int((tomorrow - now_dt).total_seconds())
-            else:
-                # Make tomorrow aware to match now_dt
-                tomorrow_aware = timezone.make_aware(tomorrow, timezone.get_current_timezone())
-                seconds_until_reset = int((tomorrow_aware - now_dt).total_seconds())
-            
-            hours, remainder = divmod(seconds_until_reset, 3600)
-            minutes, _ = divmod(remainder, 60)
-            reset_time_str = f"{hours}h {minutes}m"
+            try:
+                sections, fields = dashboard_sections.select(request.query_params)
+            except UnknownSectionError as e:
+                return Response({'error': _('Unknown sections or fields: %(names)s') % {'names': e}}, status=400)
 
-            return Response({
-                'user_name': user.username,
-                'user_persona': user.persona,
-                'server_time': timezone.now().strftime('%I:%M %p'),
-                'server_date': today.strftime('%d/%m/%Y'),
-                'resets_in': reset_time_str,
-                'wallet_balance': wallet.balance,
-                'special_wallet_balance': wallet.special_balance,
-                'monthly_allowance': float(allowance.monthly_amount) if allowance else 0,
-                'daily_limit': float(daily_limit),
-                'today_spent': float(today_spent),
-                'today_remaining': float(max(Decimal('0.00'), daily_limit - today_spent)),
-                'is_locked': active_locks_count > 0,
-                'active_locks': active_locks_count,
-                'active_lock_id': active_lock_id,
-                'monthly_spent': float(monthly_spent),
-                'monthly_remaining': float(max(Decimal('0.00'), (allowance.monthly_amount if allowance else 0) - monthly_spent)),
-                'daily_breakdown': daily_breakdown,
-                'has_allowance': allowance is not None
-            })
+            # Served from the per-student snapshot; see student_module/dashboard.py
+            return Response(get_dashboard_payload(user, sections, fields))
         except Exception as e:
             import traceback
             return Response({'error': 'Dashboard Logic Error', 'details': str(e), 'traceback': traceback.format_exc()}, status=500)
@@ -20,6 +20,7 @@ from core.throttling import OTPGenerationThrottle, OTPVerificationThrottle, Wall
 from core.security import OTPSecurityService
 from core.security_monitoring_fixed import SecurityEventManager, AuditService
 from core.permissions import OTPGenerationPermission, OTPVerificationPermission, WalletAccessPermission
+from core.conditional import conditional_get
 from .models import (
     Wallet, 
     OTPRequest, 
@@ -493,6 +494,7 @@ class StudentWalletViewSet(viewsets.ModelViewSet):
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=False, methods=['get'])
+    @conditional_get()
     def statement(self, request):
         """Get the student's own filtered transaction statement (Unified History)"""
         from .models import WalletTransaction, Transaction